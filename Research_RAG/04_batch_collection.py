@@ -25,6 +25,9 @@ load_dotenv()
 # ==========================================
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(BASE_DIR)
+sys.path.append(PROJECT_ROOT)  # 공용 모듈(sheet_write_buffer_module 등)
+from sheet_write_buffer_module import SheetWriteBuffer
+from sheet_stream_module import ROW_COLUMN, WorksheetStream
 
 CLIENT_SECRET_PATH = os.path.join(PROJECT_ROOT, "mail_auto", "client_secret.json")
 TOKEN_PATH = os.path.join(PROJECT_ROOT, "mail_auto", "token.json")
@@ -221,19 +224,24 @@ def main():
         print(f"❌ 시트 연결 실패: {e}")
         return
 
+    # 셀 쓰기는 모아서 values_batch_update 한 번으로 (논문 10건 또는 60초마다, 종료/Ctrl-C 시에도 전송)
+    sheet_buffer = SheetWriteBuffer(doc, flush_size=40, flush_interval=60)
+
     headers = worksheet.row_values(1)
     new_cols = ["논문ID", "RISS_링크", "초록", "주제어"]
     for col_name in new_cols:
         if col_name not in headers:
-            worksheet.update_cell(1, len(headers) + 1, col_name)
+            sheet_buffer.update_cell(worksheet, 1, len(headers) + 1, col_name)
             headers.append(col_name)
+    sheet_buffer.flush()  # 아래 리더가 새 헤더를 읽도록 먼저 반영
 
     idx_id = headers.index("논문ID") + 1
     idx_link = headers.index("RISS_링크") + 1
     idx_abs = headers.index("초록") + 1
     idx_kw = headers.index("주제어") + 1
 
-    rows = worksheet.get_all_records()
+    # 검색에 쓰는 세 열만 행 단위로 나눠 읽음 (이미 채운 초록 열은 받지 않음)
+    rows = WorksheetStream(client, SHEET_ID, "논문", columns=["논문명", "이름", "RISS_링크"]).read().to_dict("records")
     print(f"📊 총 {len(rows)}건 작업 시작 (전수 조사 모드)...\n")
 
     chrome_options = Options()
@@ -247,7 +255,7 @@ def main():
     consecutive_failures = 0
 
     for i, row in enumerate(rows):
-        row_num = i + 2
+        row_num = int(row[ROW_COLUMN])
         
         title = str(row.get("논문명", "")).strip()
         author = str(row.get("이름", "")).strip()
@@ -268,17 +276,17 @@ def main():
             print(f"   ✅ 수집: ID({details['id']}) / 주제어({details['keywords'][:10]}...)")
             
             try:
-                worksheet.update_cell(row_num, idx_id, details['id'])
-                worksheet.update_cell(row_num, idx_link, link)
-                worksheet.update_cell(row_num, idx_abs, details['abstract'][:4000])
-                worksheet.update_cell(row_num, idx_kw, details['keywords'])
+                sheet_buffer.update_cell(worksheet, row_num, idx_id, details['id'])
+                sheet_buffer.update_cell(worksheet, row_num, idx_link, link)
+                sheet_buffer.update_cell(worksheet, row_num, idx_abs, details['abstract'][:4000])
+                sheet_buffer.update_cell(worksheet, row_num, idx_kw, details['keywords'])
             except Exception as e:
                 print(f"   ❌ 저장 실패: {e}")
         else:
             consecutive_failures += 1
             print(f"   ⚠️ 검색 실패 (연속 {consecutive_failures}회)")
             if not existing_link:
-                try: worksheet.update_cell(row_num, idx_link, "검색실패")
+                try: sheet_buffer.update_cell(worksheet, row_num, idx_link, "검색실패")
                 except: pass
         
         if consecutive_failures >= 3: # 3회로 완화
@@ -290,6 +298,8 @@ def main():
         time.sleep(2)
 
     driver.quit()
+    sheet_buffer.flush()
+    print(f"💾 시트 기록: {sheet_buffer.stats()}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
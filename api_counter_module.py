@@ -0,0 +1,49 @@
+import threading
+
+
+class ApiCallCounter:
+    """
+    gspread 클라이언트와 googleapiclient 서비스가 보내는 HTTP 요청 수를 셉니다.
+
+    gspread는 http_client.request, googleapiclient는 서비스 객체의 http.request를 감싸서
+    요청이 나갈 때마다 종류별로 1씩 더합니다. snapshot()/diff()로 구간별 호출 수를 볼 수 있습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def _wrap(self, owner, kind):
+        original = owner.request
+
+        def counted(*args, **kwargs):
+            with self._lock:
+                self._counts[kind] = self._counts.get(kind, 0) + 1
+            return original(*args, **kwargs)
+
+        owner.request = counted
+
+    def attach_gspread(self, gc, kind="sheets"):
+        """gspread Client의 모든 요청(시트 + gspread가 부르는 드라이브 API)을 셉니다."""
+        self._wrap(gc.http_client, kind)
+        return gc
+
+    def attach_google_service(self, service, kind="drive"):
+        """googleapiclient.discovery.build()로 만든 서비스의 요청을 셉니다."""
+        self._wrap(service._http, kind)
+        return service
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def diff(self, before):
+        """before(snapshot) 이후 늘어난 호출 수를 종류별로 돌려줍니다."""
+        now = self.snapshot()
+        return {kind: count - before.get(kind, 0) for kind, count in now.items() if count - before.get(kind, 0)}
+
+    @staticmethod
+    def describe(counts):
+        """{"sheets": 3, "drive": 2} -> '5회 (sheets 3 / drive 2)'"""
+        detail = " / ".join(f"{kind} {count}" for kind, count in sorted(counts.items()))
+        return f"{sum(counts.values())}회 ({detail})" if counts else "0회"
@@ -1,8 +1,14 @@
 import streamlit as st
-import gspread
 from google.oauth2.service_account import Credentials
+from item_editor_module import new_item, render_item_editor
+from research_import_module import render_bulk_import
+from quota_governor_module import QuotaGovernor
+from sheet_connection_module import SheetConnection
+from submission_journal_module import SubmissionJournal, make_submission_id
+from submission_queue_module import SubmissionQueue
+from submission_validation_module import validate_tabs
+import os
 import datetime
-import time  # 쿨다운 및 딜레이 처리를 위한 모듈
 
 # ---------------------------------------------------------
 # 1. Google Sheets 인증 설정
@@ -12,19 +18,77 @@ SCOPES = [
     "https://www.googleapis.com/auth/drive",
 ]
 
-def get_connection():
+# 본인의 구글 시트 URL
+SHEET_URL = "https://docs.google.com/spreadsheets/d/1nfE8lcFRsUfYkdV-tjpsZfFPWER0YeNR2TaxYLH32JY/edit?usp=sharing"
+
+# 제출 저널 (시트 기록 전에 먼저 저장되는 로컬 파일)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOURNAL_PATH = os.getenv("SUBMISSION_JOURNAL_PATH", os.path.join(BASE_DIR, "submission_journal.db"))
+
+# 백그라운드 플러셔 스레드에서도 호출되므로 st.error/st.stop 대신 예외를 냄
+# (SheetConnection이 SheetConnectionError로 바꾸고, 화면 표시는 render_connection_status에서)
+def load_credentials():
     if "gcp_service_account" in st.secrets:
         creds_dict = st.secrets["gcp_service_account"]
-        creds = Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
+        return Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
+    try:
+        return Credentials.from_service_account_file("service_account.json", scopes=SCOPES)
+    except FileNotFoundError:
+        raise FileNotFoundError("로컬 인증 파일(service_account.json)을 찾을 수 없습니다.") from None
+
+# [변경] 모든 세션이 하나의 연결을 공유 (클릭마다 인증/시트 조회 반복 X)
+@st.cache_resource
+def get_connection():
+    # [부하 테스트] SHEETS_BACKEND=memory 이면 메모리 대역 사용 (benchmarks/submit_load_test.py)
+    if os.getenv("SHEETS_BACKEND") == "memory":
+        import sheet_standin_module
+        return sheet_standin_module.from_env()
+    return SheetConnection(load_credentials, SHEET_URL)
+
+# [추가] 저널에 먼저 저장하고, 백그라운드에서 시트로 재전송하는 큐 (프로세스당 1개)
+# 시트 쓰기는 프로세스 공용 할당량 관리자(분당 한도 토큰 버킷 + 429 백오프)를 거쳐서만 나감
+@st.cache_resource
+def get_submission_queue():
+    return SubmissionQueue(get_connection(), SubmissionJournal(JOURNAL_PATH), governor=QuotaGovernor())
+
+# [추가] 접수 후 시트 반영까지 대기 순번 표시
+# 반영이 끝난(완료/실패) 접수번호는 session_state에 남기고 주기 실행 없이 그림 (끝난 뒤에는 폴링/DB 조회 X)
+def render_submission_status(ticket):
+    final = st.session_state.get("final_status")
+    if not final or final[0] != ticket:
+        status = get_submission_queue().status(ticket)
+        if status == "pending":
+            poll_submission_status(ticket)
+            return
+        st.session_state.final_status = final = (ticket, status)
+    if final[1] == "failed":
+        st.error(f"❌ 접수번호 {ticket}: 시트 반영 실패 (제출 내용은 저장되어 있습니다. 접수번호와 함께 관리자에게 문의해 주세요)")
     else:
-        try:
-            creds = Credentials.from_service_account_file("service_account.json", scopes=SCOPES)
-        except FileNotFoundError:
-            st.error("로컬 인증 파일(service_account.json)을 찾을 수 없습니다.")
-            st.stop()
-    
-    client = gspread.authorize(creds)
-    return client
+        st.caption(f"📄 접수번호 {ticket}: 시트 반영 완료")
+    render_connection_status()
+
+# 반영 대기 중일 때만 이 부분을 3초마다 다시 그림
+@st.fragment(run_every=3)
+def poll_submission_status(ticket):
+    queue = get_submission_queue()
+    status = queue.status(ticket)
+    if status != "pending":
+        st.session_state.final_status = (ticket, status)
+        st.rerun()  # 앱 전체를 다시 그려 주기 실행 프래그먼트를 멈춤
+    position = queue.position(ticket)
+    wait = queue.retry_wait()
+    message = f"⏳ 접수번호 {ticket}: 시트 반영 대기 중 (대기 순번 {position})"
+    if wait > 0:
+        message += f" · 사용량 한도로 약 {wait:.0f}초 후 자동 전송"
+    st.caption(message + " — 다시 제출하지 않아도 됩니다.")
+    render_connection_status()
+
+def render_connection_status():
+    connection = get_connection().stats()
+    if connection.get("last_error"):
+        st.error(f"❌ 시트 연결 오류: {connection['last_error']} (접수된 제출은 저장되어 있으며 연결이 복구되면 자동 전송됩니다)")
+    # 연결 재사용 현황 (제출마다 새로 연결하지 않는지 확인용)
+    st.caption(f"🔌 시트 연결 재사용 {connection['reused']}회 · 재생성 {connection['rebuilt']}회")
 
 # ---------------------------------------------------------
 # 2. 화면 구성 및 스타일
@@ -37,10 +101,6 @@ st.markdown("연구 성과를 입력하는 페이지입니다. 모든 항목은
 if 'research_items' not in st.session_state:
     st.session_state.research_items = []
 
-# [추가] 중복 제출 방지를 위한 상태 변수
-if 'submitted' not in st.session_state:
-    st.session_state.submitted = False
-
 # --- [A] 기본 정보 및 BK 참여 학기 ---
 with st.container():
     st.subheader("1. 기본 정보")
@@ -79,133 +139,25 @@ has_result_selection = st.radio(
 # --- [C] 성과 입력 로직 (있음 선택 시에만 표시) ---
 if "있음" in has_result_selection:
     def add_item():
-        st.session_state.research_items.append({
-            "type": "논문",
-            "class_name": "", "prof_name": "", "note": "",
-            # 논문 필드 (초록 제외됨)
-            "p_type_code": "국외전문학술지(01)", "p_sci": "SCI/SSCI/A&HCI(01)", 
-            "p_journal": "", "p_title": "", "p_issn": "", "p_doi": "", 
-            "p_first_auth": "", "p_contrib": 0, "p_co_auth": "", 
-            "p_vol": "", "p_page_start": "", "p_page_end": "", 
-            "p_impact": 0.0, "p_date": datetime.date.today(),
-            # 저서/학술대회 필드
-            "o_role": "", "o_authors_all": "", "o_author_count": 1,
-            "o_title": "", "o_journal": "", "o_details": "", "o_date": datetime.date.today()
-        })
-
-    def remove_item(index):
-        st.session_state.research_items.pop(index)
-
-    if len(st.session_state.research_items) == 0:
+        st.session_state.research_items.append(new_item())
+
+    # [추가] 성과가 많은 경우 파일로 한 번에 가져오기 (표 하나로 편집)
+    render_bulk_import()
+
+    if len(st.session_state.research_items) == 0 and not st.session_state.imported_items:
         add_item()
 
     if st.button("➕ 성과 추가하기"):
         add_item()
 
-    for i, item in enumerate(st.session_state.research_items):
-        with st.expander(f"📝 성과 #{i+1} 입력 (클릭하여 열기/접기)", expanded=True):
-            if st.button("🗑️ 이 항목 삭제", key=f"del_{i}"):
-                remove_item(i)
-                st.rerun()
-
-            # 구분 선택
-            type_options = ["논문", "저서", "학술대회 발표"]
-            selected_type = st.selectbox("성과 구분", type_options, key=f"type_{i}", 
-                                       index=type_options.index(item["type"]) if item["type"] in type_options else 0)
-            st.session_state.research_items[i]["type"] = selected_type
-
-            # ================= [논문 입력 양식] =================
-            if selected_type == "논문":
-                st.markdown("##### 📄 논문 상세 정보")
-                
-                c1, c2 = st.columns(2)
-                with c1:
-                    p_type_code = st.selectbox("논문구분 *", ["국외전문학술지(01)", "국내전문학술지(03)"], key=f"p_type_{i}")
-                with c2:
-                    p_sci = st.selectbox("SCI(E)구분 *", ["SCI/SSCI/A&HCI(01)", "비SCI(02)"], key=f"p_sci_{i}")
-
-                p_journal = st.text_input("학술지명 *", placeholder="Full Name 기재", key=f"p_jour_{i}")
-                p_title = st.text_input("논문명 *", placeholder="Full Name 기재", key=f"p_tit_{i}")
-
-                c1, c2 = st.columns(2)
-                with c1:
-                    p_issn = st.text_input("ISSN *", placeholder="1234-5678", key=f"p_issn_{i}")
-                with c2:
-                    p_doi = st.text_input("DOI *", placeholder="10.xxx/xxx", key=f"p_doi_{i}")
-
-                c1, c2 = st.columns([2, 1])
-                with c1:
-                    p_first_auth = st.text_input("주저자명(제1저자) *", placeholder="예: Hong Gil Dong", key=f"p_fa_{i}")
-                with c2:
-                    p_contrib = st.number_input("기여율(%)", min_value=0, max_value=100, value=item.get("p_contrib", 0), key=f"p_con_{i}")
-                
-                p_co_auth = st.text_input("공동저자명", placeholder="예: Kim Cheol Su; Lee Young Hee", key=f"p_co_{i}")
-
-                c1, c2 = st.columns(2)
-                with c1:
-                    p_vol = st.text_input("볼륨번호, 권(호) *", placeholder="예: 12(3)", key=f"p_vol_{i}")
-                with c2:
-                    p_impact = st.number_input("임팩트팩터(IF)", format="%.5f", step=0.01, value=float(item.get("p_impact", 0.0)), key=f"p_if_{i}")
-
-                c1, c2 = st.columns(2)
-                with c1:
-                    p_page_start = st.text_input("시작 페이지 *", placeholder="예: 151", key=f"p_ps_{i}")
-                with c2:
-                    p_page_end = st.text_input("끝 페이지", placeholder="예: 157", key=f"p_pe_{i}")
-
-                p_date_pick = st.date_input("학술지 출판일자 *", value=item.get("p_date", datetime.date.today()), key=f"p_d_{i}")
-                
-                # [삭제됨] 초록 입력창 제거
-
-                st.session_state.research_items[i].update({
-                    "p_type_code": p_type_code, "p_sci": p_sci, "p_journal": p_journal,
-                    "p_title": p_title, "p_issn": p_issn, "p_doi": p_doi,
-                    "p_first_auth": p_first_auth, "p_contrib": int(p_contrib), "p_co_auth": p_co_auth,
-                    "p_vol": p_vol, "p_page_start": p_page_start, "p_page_end": p_page_end,
-                    "p_date": p_date_pick, "p_impact": p_impact
-                })
-
-            # ================= [저서/학술대회 입력 양식] =================
-            else:
-                st.markdown(f"##### 📘 {selected_type} 상세 정보")
-                role_options = ["단독저자", "공동저자(챕터)", "공동저자(전체)", "대표저자"] if selected_type == "저서" else ["발표자", "공동연구자(발표안함)"]
-                o_role = st.selectbox("참여 역할 *", role_options, key=f"o_r_{i}")
-
-                o_authors_all = st.text_input("저자/발표자 명단 *", placeholder="예: 홍길동, 김철수", key=f"o_aa_{i}")
-                o_author_count = st.number_input("전체 인원 수", min_value=1, value=item.get("o_author_count", 1), key=f"o_ac_{i}")
-
-                lbl_title = "저서명 *" if selected_type == "저서" else "발표 제목 *"
-                lbl_journal = "출판사 *" if selected_type == "저서" else "학술대회명 *"
-                lbl_detail = "ISBN / 개정판 정보" if selected_type == "저서" else "개최 장소"
-
-                o_title = st.text_input(lbl_title, key=f"o_t_{i}")
-                o_journal = st.text_input(lbl_journal, key=f"o_j_{i}")
-                o_details = st.text_input(lbl_detail, key=f"o_dt_{i}")
-                o_date_pick = st.date_input("출판/발표 일자 *", value=item.get("o_date", datetime.date.today()), key=f"o_d_{i}")
-
-                st.session_state.research_items[i].update({
-                    "o_role": o_role, "o_authors_all": o_authors_all, "o_author_count": o_author_count,
-                    "o_title": o_title, "o_journal": o_journal, "o_details": o_details, "o_date": o_date_pick
-                })
-
-            # ================= [공통: 연계 교과 및 비고] =================
-            st.markdown("---")
-            st.caption("💡 연구성과물과 연계된 교과명 및 담당 교수자 정보를 입력해주세요.")
-            c1, c2 = st.columns(2)
-            with c1:
-                class_name = st.text_input("연계 교과목명", placeholder="예: 디지털인문학", key=f"cl_{i}")
-            with c2:
-                prof_name = st.text_input("담당 교수", placeholder="예: 김철수 교수", key=f"pr_{i}")
-            
-            note = st.text_input("비고", placeholder="예: 게재예정, 발간예정", key=f"nt_{i}")
-
-            st.session_state.research_items[i].update({
-                "class_name": class_name, "prof_name": prof_name, "note": note
-            })
+    for i in range(len(st.session_state.research_items)):
+        render_item_editor(i)
 
 else:
     # "없음" 선택 시
     st.session_state.research_items = []
+    st.session_state.imported_items = []
+    st.session_state.imported_base = []
     st.warning("연구 성과가 없는 경우에도 '기본 정보' 제출을 위해 아래 [제출하기] 버튼을 꼭 눌러주세요.")
 
 
@@ -213,111 +165,98 @@ st.divider()
 
 # --- [D] 제출 로직 ---
 if st.button("📤 제출하기", type="primary"):
-    
-    # [중복 방지] 이미 제출했으면 차단
-    if st.session_state.submitted:
-        st.warning("⏳ 처리 중입니다. 잠시만 기다려주세요.")
-        st.stop()
 
     # 1. 기본정보 검사
     if not student_name or not student_id:
         st.error("❌ [이름]과 [학번]을 반드시 입력해주세요.")
     else:
         validation_error = False
+        all_items = st.session_state.research_items + st.session_state.get("imported_items", [])
+        n_manual = len(st.session_state.research_items)
         
         # 성과 있음인데 항목 비어있으면 차단
-        if "있음" in has_result_selection and len(st.session_state.research_items) == 0:
+        if "있음" in has_result_selection and len(all_items) == 0:
             st.error("❌ '성과 있음'을 선택하셨습니다. [성과 추가하기]를 눌러 내용을 입력해주세요.")
             validation_error = True
+
+        # 2. 시트에 기록할 행 만들기 (탭별 행 -> 원래 항목 번호도 함께 기록)
+        rows_paper = []
+        rows_book = []
+        rows_conf = []
+        origins = {"논문": [], "저서": [], "학술대회": []}
+        now_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        bk_val_1 = "O" if bk_2025_1 else ""
+        bk_val_2 = "O" if bk_2025_2 else ""
         
-        # 성과 있는 경우 필수값 체크
-        if "있음" in has_result_selection:
-            for idx, item in enumerate(st.session_state.research_items):
-                missing = []
+        if "없음" in has_result_selection:
+            # 빈 데이터: 성과유무(X) + 빈칸 17개 (초록 빠져서 1개 줄어듦)
+            empty_row = [now_str, student_name, student_id, bk_val_1, bk_val_2, "X"] + [""] * 17
+            rows_paper.append(empty_row)
+        else:
+            for idx, item in enumerate(all_items):
+                common_front = [now_str, student_name, student_id, bk_val_1, bk_val_2, "O"]
+                common_back = [item["class_name"], item["prof_name"], item["note"]]
+
                 if item["type"] == "논문":
-                    if not item["p_journal"]: missing.append("학술지명")
-                    if not item["p_title"]: missing.append("논문명")
-                    if not item["p_issn"]: missing.append("ISSN")
-                    if not item["p_doi"]: missing.append("DOI")
-                    if not item["p_first_auth"]: missing.append("주저자명")
-                    if not item["p_vol"]: missing.append("볼륨번호")
-                    if not item["p_page_start"]: missing.append("시작페이지")
-                    # 초록 체크 삭제됨
+                    # 구분을 고르지 않은 항목(가져온 논문)은 빈칸 -> 아래 검사에서 누락으로 걸림
+                    t_code = "01" if "01" in item["p_type_code"] else ("03" if "03" in item["p_type_code"] else "")
+                    s_code = "01" if "01" in item["p_sci"] else ("02" if "02" in item["p_sci"] else "")
+                    date_str = item["p_date"].strftime("%Y%m%d")
+
+                    # 논문 시트 헤더 매핑 (초록 제외됨)
+                    row = common_front + [
+                        t_code, item["p_journal"], item["p_title"], item["p_issn"], item["p_doi"],
+                        item["p_contrib"], item["p_first_auth"], item["p_co_auth"], item["p_vol"],
+                        s_code, item["p_page_start"], item["p_page_end"], item["p_impact"],
+                        date_str
+                    ] + common_back
+                    rows_paper.append(row)
+                    origins["논문"].append(idx)
                 else:
-                    if not item["o_title"]: missing.append("제목")
-                    if not item["o_journal"]: missing.append("출판사/학술대회명")
-                    if not item["o_authors_all"]: missing.append("명단")
+                    date_std = item["o_date"].strftime("%Y-%m-%d")
+                    row = common_front + [
+                        item["type"], item["o_role"], item["o_authors_all"], item["o_author_count"],
+                        item["o_title"], item["o_journal"], item["o_details"], date_std
+                    ] + common_back
+                    
+                    if item["type"] == "저서":
+                        rows_book.append(row)
+                        origins["저서"].append(idx)
+                    else:
+                        rows_conf.append(row)
+                        origins["학술대회"].append(idx)
+
+        rows_by_tab = {"논문": rows_paper, "저서": rows_book, "학술대회": rows_conf}
 
-                if missing:
-                    st.error(f"❌ [성과 #{idx+1}] 필수 항목 누락: {', '.join(missing)}")
-                    validation_error = True
+        # 3. 필수값 / ISSN / DOI / 페이지 / 날짜 / 기여율 일괄 검사
+        item_errors = {}
+        for tab, errors in validate_tabs(rows_by_tab).items():
+            for row_idx, messages in errors.items():
+                item_errors.setdefault(origins[tab][row_idx], []).extend(messages)
+
+        for idx in sorted(item_errors):
+            label = f"성과 #{idx+1}" if idx < n_manual else f"가져온 성과 #{idx - n_manual + 1}"
+            st.error(f"❌ [{label}] {', '.join(item_errors[idx])}")
+            validation_error = True
 
         if not validation_error:
-            # 제출 시작 (중복 방지 플래그 ON)
-            st.session_state.submitted = True
-            
             try:
-                with st.spinner("제출 중입니다..."):
-                    client = get_connection()
-                    # 본인의 구글 시트 URL
-                    SHEET_URL = "https://docs.google.com/spreadsheets/d/1nfE8lcFRsUfYkdV-tjpsZfFPWER0YeNR2TaxYLH32JY/edit?usp=sharing"
-                    doc = client.open_by_url(SHEET_URL)
-
-                    rows_paper = []
-                    rows_book = []
-                    rows_conf = []
-                    now_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-                    bk_val_1 = "O" if bk_2025_1 else ""
-                    bk_val_2 = "O" if bk_2025_2 else ""
-                    
-                    if "없음" in has_result_selection:
-                        # 빈 데이터: 성과유무(X) + 빈칸 17개 (초록 빠져서 1개 줄어듦)
-                        empty_row = [now_str, student_name, student_id, bk_val_1, bk_val_2, "X"] + [""] * 17
-                        rows_paper.append(empty_row)
-                    else:
-                        for item in st.session_state.research_items:
-                            common_front = [now_str, student_name, student_id, bk_val_1, bk_val_2, "O"]
-                            common_back = [item["class_name"], item["prof_name"], item["note"]]
-
-                            if item["type"] == "논문":
-                                t_code = "01" if "01" in item["p_type_code"] else "03"
-                                s_code = "01" if "01" in item["p_sci"] else "02"
-                                date_str = item["p_date"].strftime("%Y%m%d")
-
-                                # 논문 시트 헤더 매핑 (초록 제외됨)
-                                row = common_front + [
-                                    t_code, item["p_journal"], item["p_title"], item["p_issn"], item["p_doi"],
-                                    item["p_contrib"], item["p_first_auth"], item["p_co_auth"], item["p_vol"],
-                                    s_code, item["p_page_start"], item["p_page_end"], item["p_impact"],
-                                    date_str
-                                ] + common_back
-                                rows_paper.append(row)
-                            else:
-                                date_std = item["o_date"].strftime("%Y-%m-%d")
-                                row = common_front + [
-                                    item["type"], item["o_role"], item["o_authors_all"], item["o_author_count"],
-                                    item["o_title"], item["o_journal"], item["o_details"], date_std
-                                ] + common_back
-                                
-                                if item["type"] == "저서":
-                                    rows_book.append(row)
-                                else:
-                                    rows_conf.append(row)
-
-                    if rows_paper: doc.worksheet("논문").append_rows(rows_paper)
-                    if rows_book: doc.worksheet("저서").append_rows(rows_book)
-                    if rows_conf: doc.worksheet("학술대회").append_rows(rows_conf)
-
-                st.success("✅ 제출이 완료되었습니다!")
-                
-                # [중요] 3초 대기 후 새로고침 (중복 제출 원천 봉쇄)
-                time.sleep(3)
-                st.session_state.submitted = False # 상태 복구 (사실 rerun 때문에 의미는 없지만 안전장치)
-                st.rerun()
-
-            except gspread.WorksheetNotFound:
-                st.error("오류: 구글 시트 탭 이름('논문', '저서', '학술대회')을 확인해주세요.")
-                st.session_state.submitted = False
+                # [중복 방지] 제출 내용으로 만든 제출 ID -> 같은 내용을 다시 눌러도(다른 탭/재시도 포함) 한 번만 기록
+                submission_id = make_submission_id(rows_by_tab)
+
+                # [변경] 로컬 저널에 먼저 저장 -> 시트 기록은 백그라운드에서 (시트 장애 시에도 유실 X)
+                ticket, is_new = get_submission_queue().submit(rows_by_tab, submission_id)
+                st.session_state.last_ticket = ticket
+
+                if is_new:
+                    st.success(f"✅ 제출이 접수되었습니다! (접수번호 {ticket})")
+                else:
+                    st.info(f"ℹ️ 이미 접수된 내용입니다. 다시 제출할 필요가 없습니다. (접수번호 {ticket})")
+
             except Exception as e:
-                st.error
\ No newline at end of file
+                st.error(f"❌ 제출 중 오류가 발생했습니다: {e}")
+
+# 마지막 접수 건의 시트 반영 상태
+if "last_ticket" in st.session_state:
+    render_submission_status(st.session_state.last_ticket)
@@ -0,0 +1,51 @@
+# 성과 항목 수에 따른 app.py 재실행 시간 측정 스크립트
+# - 전체 재실행: 앱 전체 스크립트를 다시 실행하는 시간 (제출 버튼 등 앱 단위 rerun)
+# - 항목 재실행: 한 항목을 수정했을 때 프래그먼트(render_item_editor) 하나만 다시 실행되는 시간
+# 실행: python benchmarks/item_editor_rerun.py [항목수 ...]
+import os
+import sys
+import statistics
+import time
+from streamlit.testing.v1 import AppTest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+sys.path.append(PROJECT_ROOT)
+
+from item_editor_module import new_item
+
+APP_PATH = os.path.join(PROJECT_ROOT, "app.py")
+ITEM_COUNTS = [1, 5, 10, 20, 40, 80]
+REPEAT = 5
+
+
+def single_item_script():
+    # 프래그먼트 재실행과 같은 범위: 항목 하나의 편집기만 실행
+    from item_editor_module import render_item_editor
+    render_item_editor(0)
+
+
+def measure(at, n_items):
+    at.session_state["research_items"] = [new_item() for _ in range(n_items)]
+    at.run()  # 워밍업 (위젯 등록)
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        at.run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or ITEM_COUNTS
+
+    print(f"{'항목 수':>8} | {'전체 재실행(ms)':>16} | {'항목 재실행(ms)':>16}")
+    print("-" * 48)
+    for n_items in counts:
+        full_ms = measure(AppTest.from_file(APP_PATH, default_timeout=60), n_items)
+        fragment_ms = measure(AppTest.from_function(single_item_script, default_timeout=60), n_items)
+        print(f"{n_items:>8} | {full_ms:>16.1f} | {fragment_ms:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# 마감 직전 동시 제출 부하 테스트
+# - app.py를 AppTest로 헤드리스 실행하고, 여러 학생 세션을 스레드로 동시에 돌립니다.
+# - 시트 계층은 메모리 대역(sheet_standin_module)으로 바꾸고, 지연/429를 주입합니다.
+# - 제출 응답 지연 p50/p95/p99, 처리량, 오류율, 시트 반영 완료 시간을 출력/저장합니다.
+# 실행 예: python benchmarks/submit_load_test.py --students 300 --concurrency 16 --out report.json
+import argparse
+import datetime
+import json
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+APP_PATH = os.path.join(PROJECT_ROOT, "app.py")
+sys.path.append(PROJECT_ROOT)
+
+VALID_ISSNS = ["0378-5955", "2049-3630", "1476-4687", "0028-0836", "1225-0759"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="app.py 제출 경로 부하 테스트")
+    parser.add_argument("--students", type=int, default=300, help="총 제출 학생 수")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시에 실행되는 세션(스크립트 스레드) 수")
+    parser.add_argument("--arrival-window", type=float, default=30.0, help="학생 도착을 흩뿌리는 구간(초)")
+    parser.add_argument("--no-result-ratio", type=float, default=0.3, help="'성과 없음' 제출 비율")
+    parser.add_argument("--retry-ratio", type=float, default=0.1, help="같은 내용을 한 번 더 제출하는 비율")
+    parser.add_argument("--latency-ms", type=float, default=300, help="시트 쓰기 기본 지연")
+    parser.add_argument("--jitter-ms", type=float, default=200, help="시트 쓰기 추가 무작위 지연 최댓값")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="무작위 429 비율")
+    parser.add_argument("--quota", type=int, default=60, help="분당 쓰기 한도 (0=무제한)")
+    parser.add_argument("--drain-timeout", type=float, default=180.0, help="시트 반영 대기 최대 시간(초)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", help="결과 JSON 저장 경로")
+    return parser.parse_args()
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def make_plan(args):
+    """시드로 학생별 도착 시각/제출 내용을 미리 정해 둡니다. (같은 시드 = 같은 부하)"""
+    rng = random.Random(args.seed)
+    plan = []
+    for n in range(args.students):
+        plan.append({
+            "name": f"학생{n:03d}",
+            "student_id": f"2025{n:04d}",
+            "arrival": rng.uniform(0, args.arrival_window),
+            "no_result": rng.random() < args.no_result_ratio,
+            "retry": rng.random() < args.retry_ratio,
+            "issn": rng.choice(VALID_ISSNS),
+            "page_start": rng.randint(1, 200),
+            "date": datetime.date(2025, 4, 1) + datetime.timedelta(days=rng.randint(0, 300)),
+        })
+    plan.sort(key=lambda p: p["arrival"])
+    return plan
+
+
+def share_apptest_runtime():
+    """
+    AppTest는 실행할 때마다 전역 Runtime을 만들고 끝나면 지웁니다.
+    여러 세션을 동시에 돌리면 다른 스레드가 지운 뒤에 접근하게 되므로,
+    Runtime이 비어 있으면 마지막으로 만들어진 것을 계속 쓰도록 바꿉니다. (이 테스트 전용)
+    """
+    from streamlit.runtime import Runtime
+
+    state = {"last": None}
+
+    def instance(cls):
+        if cls._instance is not None:
+            state["last"] = cls._instance
+        if state["last"] is None:
+            raise RuntimeError("Runtime hasn't been created!")
+        return state["last"]
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or state["last"] is not None)
+
+
+def run_session(student, started_at):
+    from streamlit.testing.v1 import AppTest
+
+    delay = student["arrival"] - (time.perf_counter() - started_at)
+    if delay > 0:
+        time.sleep(delay)
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    load_start = time.perf_counter()
+    at.run()
+    load_ms = (time.perf_counter() - load_start) * 1000
+
+    at.text_input[0].input(student["name"])
+    at.text_input[1].input(student["student_id"])
+    if student["no_result"]:
+        at.radio[0].set_value("❌ 없음 (제출만 수행)")
+    else:
+        at.text_input(key="p_jour_0").input("한국문학연구")
+        at.text_input(key="p_tit_0").input(f"{student['name']}의 연구")
+        at.text_input(key="p_issn_0").input(student["issn"])
+        at.text_input(key="p_doi_0").input(f"10.1234/load.{student['student_id']}")
+        at.text_input(key="p_fa_0").input(student["name"])
+        at.text_input(key="p_vol_0").input("12(3)")
+        at.text_input(key="p_ps_0").input(str(student["page_start"]))
+        at.date_input(key="p_d_0").set_value(student["date"])
+
+    results = []
+    for _ in range(2 if student["retry"] else 1):
+        submit_start = time.perf_counter()
+        at.button[-1].click().run()
+        submit_ms = (time.perf_counter() - submit_start) * 1000
+        ok = bool(at.success) or any("이미 접수" in str(m.value) for m in at.info)
+        errors = [str(e.value) for e in at.error] + [str(e.value) for e in at.exception]
+        results.append({"submit_ms": submit_ms, "ok": ok and not errors, "errors": errors})
+    return {"load_ms": load_ms, "submits": results}
+
+
+def main():
+    args = parse_args()
+
+    # 시트 계층 -> 메모리 대역, 저널 -> 임시 파일
+    journal_path = os.path.join(tempfile.mkdtemp(prefix="load_test_"), "journal.db")
+    os.environ.update({
+        "SHEETS_BACKEND": "memory",
+        "SUBMISSION_JOURNAL_PATH": journal_path,
+        "SHEETS_STANDIN_LATENCY_MS": str(args.latency_ms),
+        "SHEETS_STANDIN_JITTER_MS": str(args.jitter_ms),
+        "SHEETS_STANDIN_ERROR_RATE": str(args.error_rate),
+        "SHEETS_STANDIN_QUOTA_PER_MINUTE": str(args.quota),
+        "SHEETS_STANDIN_SEED": str(args.seed),
+    })
+    import sheet_standin_module
+    share_apptest_runtime()
+
+    plan = make_plan(args)
+    print(f"🚀 부하 테스트: 학생 {args.students}명 / 동시 {args.concurrency}세션 / 도착 구간 {args.arrival_window}s")
+
+    progress_lock = threading.Lock()
+    done = [0]
+
+    def job(student):
+        try:
+            result = run_session(student, started_at)
+        except Exception as e:
+            result = {"load_ms": 0.0, "submits": [{"submit_ms": 0.0, "ok": False, "errors": [repr(e)]}]}
+        with progress_lock:
+            done[0] += 1
+            if done[0] % 25 == 0:
+                print(f"   ... {done[0]}/{len(plan)} 세션 완료")
+        return result
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        sessions = list(pool.map(job, plan))
+    submit_elapsed = time.perf_counter() - started_at
+
+    # 백그라운드 플러셔가 저널을 모두 시트에 반영할 때까지 대기
+    drain_start = time.perf_counter()
+    pending = None
+    while time.perf_counter() - drain_start < args.drain_timeout:
+        with sqlite3.connect(journal_path) as conn:
+            pending = conn.execute("SELECT COUNT(*) FROM journal WHERE status = 'pending'").fetchone()[0]
+        if pending == 0:
+            break
+        time.sleep(0.5)
+    drain_s = time.perf_counter() - drain_start
+
+    submits = [s for session in sessions for s in session["submits"]]
+    latencies = [s["submit_ms"] for s in submits if s["ok"]]
+    failures = [s for s in submits if not s["ok"]]
+    standin = sheet_standin_module.ACTIVE
+    sheet_stats = standin.stats() if standin else {}
+
+    report = {
+        "config": vars(args),
+        "submits": len(submits),
+        "errors": len(failures),
+        "error_rate": round(len(failures) / len(submits), 4) if submits else 0.0,
+        "throughput_per_s": round(len(submits) / submit_elapsed, 2),
+        "submit_ms": {
+            "p50": round(percentile(latencies, 50), 1),
+            "p95": round(percentile(latencies, 95), 1),
+            "p99": round(percentile(latencies, 99), 1),
+            "mean": round(statistics.fmean(latencies), 1) if latencies else 0.0,
+        },
+        "page_load_ms_p50": round(percentile([s["load_ms"] for s in sessions], 50), 1),
+        "wall_time_s": round(submit_elapsed, 2),
+        "drain_time_s": round(drain_s, 2),
+        "pending_after_drain": pending,
+        "sheet": {**sheet_stats, "rows": standin.row_count() if standin else {}},
+        "sample_errors": [f["errors"][:1] for f in failures[:5]],
+    }
+
+    print(f"\n📊 제출 {report['submits']}건 / 오류 {report['errors']}건 ({report['error_rate']*100:.1f}%)")
+    print(f"   응답 지연 p50 {report['submit_ms']['p50']}ms / p95 {report['submit_ms']['p95']}ms / p99 {report['submit_ms']['p99']}ms")
+    print(f"   처리량 {report['throughput_per_s']}건/s / 시트 반영 완료까지 +{report['drain_time_s']}s (남은 행 {pending})")
+    print(f"   시트 쓰기 호출 {sheet_stats.get('write_calls')}회 / 429 {sheet_stats.get('quota_errors')}회")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
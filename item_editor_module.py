@@ -0,0 +1,197 @@
+import datetime
+import os
+import streamlit as st
+from journal_index_module import JournalIndex, to_form_values
+
+TYPE_OPTIONS = ["논문", "저서", "학술대회 발표"]
+PAPER_TYPE_CODES = ["국외전문학술지(01)", "국내전문학술지(03)"]
+SCI_OPTIONS = ["SCI/SSCI/A&HCI(01)", "비SCI(02)"]
+ROLE_OPTIONS = {
+    "저서": ["단독저자", "공동저자(챕터)", "공동저자(전체)", "대표저자"],
+    "학술대회 발표": ["발표자", "공동연구자(발표안함)"],
+}
+
+# 학술지 마스터 목록 (CSV 또는 Parquet, 없으면 검색창을 표시하지 않음)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOURNAL_MASTER_PATHS = [os.path.join(BASE_DIR, "journal_master.parquet"),
+                        os.path.join(BASE_DIR, "journal_master.csv")]
+
+
+@st.cache_resource
+def get_journal_index():
+    """학술지 색인을 프로세스당 한 번만 만듭니다."""
+    for path in JOURNAL_MASTER_PATHS:
+        if os.path.exists(path):
+            return JournalIndex.from_file(path)
+    return None
+
+
+def apply_journal(i, matches):
+    """학술지 검색 결과를 선택하면 학술지명/ISSN/구분/IF 입력칸을 채웁니다. (on_change 콜백)"""
+    selected = st.session_state.get(f"p_jsel_{i}")
+    if selected is None:
+        return
+    values = to_form_values(matches[selected])
+    st.session_state[f"p_jour_{i}"] = values["p_journal"]
+    st.session_state[f"p_issn_{i}"] = values["p_issn"]
+    st.session_state[f"p_sci_{i}"] = values["p_sci"]
+    if "p_type_code" in values:
+        st.session_state[f"p_type_{i}"] = values["p_type_code"]
+    # number_input은 기본값(value)으로 다시 그려야 하므로 위젯 상태를 지우고 항목 값을 바꿈
+    st.session_state.research_items[i]["p_impact"] = values["p_impact"]
+    st.session_state.pop(f"p_if_{i}", None)
+
+
+def new_item():
+    """빈 성과 항목(딕셔너리)을 만듭니다."""
+    return {
+        "type": "논문",
+        "class_name": "", "prof_name": "", "note": "",
+        # 논문 필드 (초록 제외됨)
+        "p_type_code": "국외전문학술지(01)", "p_sci": "SCI/SSCI/A&HCI(01)", 
+        "p_journal": "", "p_title": "", "p_issn": "", "p_doi": "", 
+        "p_first_auth": "", "p_contrib": 0, "p_co_auth": "", 
+        "p_vol": "", "p_page_start": "", "p_page_end": "", 
+        "p_impact": 0.0, "p_date": datetime.date.today(),
+        # 저서/학술대회 필드
+        "o_role": "", "o_authors_all": "", "o_author_count": 1,
+        "o_title": "", "o_journal": "", "o_details": "", "o_date": datetime.date.today()
+    }
+
+
+def is_blank_item(item):
+    """아직 아무것도 입력하지 않은 항목인지 확인합니다. (날짜 필드는 비교에서 제외)"""
+    blank = new_item()
+    return all(item.get(key) == value for key, value in blank.items() if key not in ("p_date", "o_date"))
+
+
+def remove_item(index):
+    st.session_state.research_items.pop(index)
+
+
+# [성능] 항목별 프래그먼트: 한 항목의 입력을 바꾸면 그 항목의 위젯만 다시 실행됩니다.
+@st.fragment
+def render_item_editor(i):
+    """
+    성과 항목 하나의 입력 양식을 그리고, 입력값을 st.session_state.research_items[i]에 반영합니다.
+
+    Args:
+        i (int): research_items 내 항목 번호
+    """
+    # 다른 항목 삭제 직후 남아 있던 프래그먼트가 다시 실행되는 경우 대비
+    if i >= len(st.session_state.research_items):
+        return
+    item = st.session_state.research_items[i]
+
+    with st.expander(f"📝 성과 #{i+1} 입력 (클릭하여 열기/접기)", expanded=True):
+        if st.button("🗑️ 이 항목 삭제", key=f"del_{i}"):
+            remove_item(i)
+            st.rerun()  # 항목 번호가 바뀌므로 프래그먼트가 아닌 앱 전체를 다시 실행
+
+        # 구분 선택
+        selected_type = st.selectbox("성과 구분", TYPE_OPTIONS, key=f"type_{i}", 
+                                   index=TYPE_OPTIONS.index(item["type"]) if item["type"] in TYPE_OPTIONS else 0)
+        st.session_state.research_items[i]["type"] = selected_type
+
+        # ================= [논문 입력 양식] =================
+        if selected_type == "논문":
+            st.markdown("##### 📄 논문 상세 정보")
+
+            # [추가] 학술지 검색: 선택하면 ISSN / SCI구분 / 임팩트팩터 자동 입력
+            journal_index = get_journal_index()
+            if journal_index is not None:
+                query = st.text_input("🔎 학술지 검색 (학술지명 또는 ISSN)", placeholder="예: 한국문학, 1234-5678", key=f"p_jq_{i}")
+                matches = journal_index.search(query) if query else []
+                if matches:
+                    st.selectbox(
+                        "검색 결과", range(len(matches)), index=None, key=f"p_jsel_{i}",
+                        placeholder="선택하면 학술지 정보가 자동으로 입력됩니다",
+                        format_func=lambda k: f"{matches[k]['title_ko'] or matches[k]['title_en']} ({matches[k]['issn']})",
+                        on_change=apply_journal, args=(i, matches),
+                    )
+                elif query:
+                    st.caption("검색 결과가 없습니다. 아래에 직접 입력해주세요.")
+            
+            c1, c2 = st.columns(2)
+            with c1:
+                p_type_code = st.selectbox("논문구분 *", PAPER_TYPE_CODES, key=f"p_type_{i}")
+            with c2:
+                p_sci = st.selectbox("SCI(E)구분 *", SCI_OPTIONS, key=f"p_sci_{i}")
+
+            p_journal = st.text_input("학술지명 *", placeholder="Full Name 기재", key=f"p_jour_{i}")
+            p_title = st.text_input("논문명 *", placeholder="Full Name 기재", key=f"p_tit_{i}")
+
+            c1, c2 = st.columns(2)
+            with c1:
+                p_issn = st.text_input("ISSN *", placeholder="1234-5678", key=f"p_issn_{i}")
+            with c2:
+                p_doi = st.text_input("DOI *", placeholder="10.xxx/xxx", key=f"p_doi_{i}")
+
+            c1, c2 = st.columns([2, 1])
+            with c1:
+                p_first_auth = st.text_input("주저자명(제1저자) *", placeholder="예: Hong Gil Dong", key=f"p_fa_{i}")
+            with c2:
+                p_contrib = st.number_input("기여율(%)", min_value=0, max_value=100, value=item.get("p_contrib", 0), key=f"p_con_{i}")
+            
+            p_co_auth = st.text_input("공동저자명", placeholder="예: Kim Cheol Su; Lee Young Hee", key=f"p_co_{i}")
+
+            c1, c2 = st.columns(2)
+            with c1:
+                p_vol = st.text_input("볼륨번호, 권(호) *", placeholder="예: 12(3)", key=f"p_vol_{i}")
+            with c2:
+                p_impact = st.number_input("임팩트팩터(IF)", format="%.5f", step=0.01, value=float(item.get("p_impact", 0.0)), key=f"p_if_{i}")
+
+            c1, c2 = st.columns(2)
+            with c1:
+                p_page_start = st.text_input("시작 페이지 *", placeholder="예: 151", key=f"p_ps_{i}")
+            with c2:
+                p_page_end = st.text_input("끝 페이지", placeholder="예: 157", key=f"p_pe_{i}")
+
+            p_date_pick = st.date_input("학술지 출판일자 *", value=item.get("p_date", datetime.date.today()), key=f"p_d_{i}")
+            
+            # [삭제됨] 초록 입력창 제거
+
+            st.session_state.research_items[i].update({
+                "p_type_code": p_type_code, "p_sci": p_sci, "p_journal": p_journal,
+                "p_title": p_title, "p_issn": p_issn, "p_doi": p_doi,
+                "p_first_auth": p_first_auth, "p_contrib": int(p_contrib), "p_co_auth": p_co_auth,
+                "p_vol": p_vol, "p_page_start": p_page_start, "p_page_end": p_page_end,
+                "p_date": p_date_pick, "p_impact": p_impact
+            })
+
+        # ================= [저서/학술대회 입력 양식] =================
+        else:
+            st.markdown(f"##### 📘 {selected_type} 상세 정보")
+            o_role = st.selectbox("참여 역할 *", ROLE_OPTIONS[selected_type], key=f"o_r_{i}")
+
+            o_authors_all = st.text_input("저자/발표자 명단 *", placeholder="예: 홍길동, 김철수", key=f"o_aa_{i}")
+            o_author_count = st.number_input("전체 인원 수", min_value=1, value=item.get("o_author_count", 1), key=f"o_ac_{i}")
+
+            lbl_title = "저서명 *" if selected_type == "저서" else "발표 제목 *"
+            lbl_journal = "출판사 *" if selected_type == "저서" else "학술대회명 *"
+            lbl_detail = "ISBN / 개정판 정보" if selected_type == "저서" else "개최 장소"
+
+            o_title = st.text_input(lbl_title, key=f"o_t_{i}")
+            o_journal = st.text_input(lbl_journal, key=f"o_j_{i}")
+            o_details = st.text_input(lbl_detail, key=f"o_dt_{i}")
+            o_date_pick = st.date_input("출판/발표 일자 *", value=item.get("o_date", datetime.date.today()), key=f"o_d_{i}")
+
+            st.session_state.research_items[i].update({
+                "o_role": o_role, "o_authors_all": o_authors_all, "o_author_count": o_author_count,
+                "o_title": o_title, "o_journal": o_journal, "o_details": o_details, "o_date": o_date_pick
+            })
+
+        # ================= [공통: 연계 교과 및 비고] =================
+        st.markdown("---")
+        st.caption("💡 연구성과물과 연계된 교과명 및 담당 교수자 정보를 입력해주세요.")
+        c1, c2 = st.columns(2)
+        with c1:
+            class_name = st.text_input("연계 교과목명", placeholder="예: 디지털인문학", key=f"cl_{i}")
+        with c2:
+            prof_name = st.text_input("담당 교수", placeholder="예: 김철수 교수", key=f"pr_{i}")
+        
+        note = st.text_input("비고", placeholder="예: 게재예정, 발간예정", key=f"nt_{i}")
+
+        st.session_state.research_items[i].update({
+            "class_name": class_name, "prof_name": prof_name, "note": note
+        })
@@ -0,0 +1,177 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+
+# 마스터 파일 헤더 -> 내부 필드명 (한글/영문 헤더 모두 허용)
+COLUMN_ALIASES = {
+    "학술지명": "title_ko", "국문학술지명": "title_ko", "title_ko": "title_ko",
+    "영문학술지명": "title_en", "title_en": "title_en", "title": "title_en", "journal": "title_en",
+    "issn": "issn", "p-issn": "issn", "eissn": "eissn", "e-issn": "eissn",
+    "sci구분": "sci", "sci": "sci", "index": "sci", "등재구분": "sci",
+    "국내외": "domestic", "국내외구분": "domestic", "country": "domestic",
+    "임팩트팩터": "impact", "if": "impact", "impact": "impact", "impact_factor": "impact",
+}
+SCI_INDEXES = {"SCI", "SCIE", "SSCI", "A&HCI", "AHCI"}
+# 영문 국가 열(country) 값 중 국내로 볼 값 (대소문자/공백/문장부호 무시)
+KOREA_NAMES = {"korea", "southkorea", "korearepublicof", "republicofkorea", "kr", "kor", "대한민국", "한국"}
+ARRAY_NAMES = ("title_ko", "title_en", "issn", "eissn", "sci", "domestic", "impact",
+               "title_keys", "title_rows", "issn_keys", "issn_rows")
+
+
+def normalize_title(text):
+    """자동완성용 키: 대소문자/공백/문장부호를 무시합니다."""
+    return re.sub(r"[\W_]+", "", str(text).casefold())
+
+
+def normalize_domestic(text):
+    """국내외 값을 "국내" / "국외" / ""로 맞춥니다. (영문 국가명 "Korea", "KR" 등도 국내)"""
+    text = str(text).strip()
+    if not text:
+        return ""
+    if "국내" in text or normalize_title(text) in KOREA_NAMES:
+        return "국내"
+    return "국외"
+
+
+def normalize_issn(text):
+    return re.sub(r"[^0-9X]", "", str(text).upper())
+
+
+class JournalIndex:
+    """
+    학술지 마스터 목록의 배열 기반 색인입니다.
+
+    학술지 정보는 열별 numpy 배열로 보관하고, 한글/영문 제목 키와 ISSN 키는 정렬된 배열로 두어
+    np.searchsorted 이진 탐색으로 접두어 검색/정확 일치 검색을 합니다.
+    수만 종의 학술지에서도 키 입력당 조회가 수십 마이크로초 수준입니다.
+    """
+
+    def __init__(self, arrays):
+        for name in ARRAY_NAMES:
+            setattr(self, name, arrays[name])
+
+    # --- [생성 / 저장 / 로드] ---
+    @classmethod
+    def from_file(cls, path):
+        """CSV 또는 Parquet 마스터 목록으로 색인을 만듭니다."""
+        if path.lower().endswith(".parquet"):
+            df = pd.read_parquet(path)
+        else:
+            df = pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+        return cls.from_dataframe(df)
+
+    @classmethod
+    def from_dataframe(cls, df):
+        df = df.rename(columns=lambda c: COLUMN_ALIASES.get(str(c).strip().lower(), COLUMN_ALIASES.get(str(c).strip(), c)))
+        n = len(df)
+
+        def text_column(name):
+            if name not in df.columns:
+                return np.full(n, "", dtype=str)
+            return df[name].fillna("").astype(str).str.strip().to_numpy(dtype=str)
+
+        arrays = {
+            "title_ko": text_column("title_ko"),
+            "title_en": text_column("title_en"),
+            "issn": np.array([normalize_issn(v) for v in text_column("issn")], dtype="<U8"),
+            "eissn": np.array([normalize_issn(v) for v in text_column("eissn")], dtype="<U8"),
+            "sci": text_column("sci"),
+            "domestic": np.array([normalize_domestic(v) for v in text_column("domestic")], dtype=str),
+            "impact": pd.to_numeric(df["impact"], errors="coerce").fillna(0.0).to_numpy(dtype=np.float32)
+            if "impact" in df.columns else np.zeros(n, dtype=np.float32),
+        }
+
+        # 제목 키 (한글 + 영문) -> 행 번호, 키 기준 정렬
+        rows = np.arange(n, dtype=np.int32)
+        keys = np.concatenate([
+            np.array([normalize_title(t) for t in arrays["title_ko"]], dtype=str),
+            np.array([normalize_title(t) for t in arrays["title_en"]], dtype=str),
+        ])
+        key_rows = np.concatenate([rows, rows])
+        keep = keys != ""
+        order = np.argsort(keys[keep], kind="stable")
+        arrays["title_keys"] = keys[keep][order]
+        arrays["title_rows"] = key_rows[keep][order]
+
+        # ISSN 키 (print + electronic) -> 행 번호
+        issn_keys = np.concatenate([arrays["issn"], arrays["eissn"]])
+        keep = issn_keys != ""
+        order = np.argsort(issn_keys[keep], kind="stable")
+        arrays["issn_keys"] = issn_keys[keep][order]
+        arrays["issn_rows"] = key_rows[keep][order]
+        return cls(arrays)
+
+    def save(self, directory):
+        """색인을 .npy 파일들로 저장합니다. (load(mmap=True)로 메모리 매핑해서 열 수 있음)"""
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAY_NAMES:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        mode = "r" if mmap else None
+        return cls({name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode)
+                    for name in ARRAY_NAMES})
+
+    # --- [조회] ---
+    def __len__(self):
+        return len(self.title_ko)
+
+    def record(self, row):
+        """행 번호의 학술지 정보를 dict로 돌려줍니다."""
+        issn = str(self.issn[row]) or str(self.eissn[row])
+        return {
+            "title_ko": str(self.title_ko[row]),
+            "title_en": str(self.title_en[row]),
+            "issn": f"{issn[:4]}-{issn[4:]}" if len(issn) == 8 else issn,
+            "sci": str(self.sci[row]),
+            "domestic": str(self.domestic[row]),
+            "impact": round(float(self.impact[row]), 5),  # float32 저장 오차 정리
+        }
+
+    def search_prefix(self, text, limit=10):
+        """한글/영문 제목 접두어로 학술지를 찾습니다. (중복 제거, 키 순서)"""
+        prefix = normalize_title(text)
+        if not prefix:
+            return []
+        lo = np.searchsorted(self.title_keys, prefix, side="left")
+        hi = np.searchsorted(self.title_keys, prefix + "\U0010ffff", side="left")
+        results, seen = [], set()
+        for row in self.title_rows[lo:hi]:
+            if row in seen:
+                continue
+            seen.add(row)
+            results.append(self.record(row))
+            if len(results) >= limit:
+                break
+        return results
+
+    def lookup_issn(self, issn):
+        """ISSN(인쇄본/전자본) 정확 일치 조회. 없으면 None."""
+        key = normalize_issn(issn)
+        pos = np.searchsorted(self.issn_keys, key, side="left")
+        if pos < len(self.issn_keys) and self.issn_keys[pos] == key:
+            return self.record(self.issn_rows[pos])
+        return None
+
+    def search(self, text, limit=10):
+        """입력이 ISSN 형식이면 ISSN 조회, 아니면 제목 접두어 검색을 합니다."""
+        if re.fullmatch(r"\s*\d{4}-?\d{3}[\dXx]\s*", str(text)):
+            found = self.lookup_issn(text)
+            return [found] if found else []
+        return self.search_prefix(text, limit)
+
+
+def to_form_values(record):
+    """조회 결과를 논문 입력 양식의 선택지 값으로 바꿉니다."""
+    values = {
+        "p_journal": record["title_ko"] or record["title_en"],
+        "p_issn": record["issn"],
+        "p_impact": record["impact"],
+        "p_sci": "SCI/SSCI/A&HCI(01)" if SCI_INDEXES & set(re.split(r"[,/\s]+", record["sci"].upper())) else "비SCI(02)",
+    }
+    domestic = normalize_domestic(record["domestic"])  # 예전에 저장한 색인(.npy)은 원래 값일 수 있음
+    if domestic:
+        values["p_type_code"] = "국내전문학술지(03)" if domestic == "국내" else "국외전문학술지(01)"
+    return values
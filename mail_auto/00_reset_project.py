@@ -5,11 +5,14 @@ from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from drive_folder_index_module import find_folder_id
+from mail_outbox_module import MailOutbox
 
 # --- [설정 영역] ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 TOKEN_FILE = os.path.join(BASE_DIR, 'token.json')
 CLIENT_SECRET_FILE = os.path.join(BASE_DIR, 'client_secret.json')
+OUTBOX_PATH = os.path.join(BASE_DIR, 'mail_outbox.db')  # 메일 발송함/발송 장부 (02, 03, main.py가 사용)
 
 # 구글 시트 및 드라이브 설정
 SPREADSHEET_URL = "https://docs.google.com/spreadsheets/d/1nfE8lcFRsUfYkdV-tjpsZfFPWER0YeNR2TaxYLH32JY/edit?usp=sharing"
@@ -45,22 +48,14 @@ def delete_drive_folder(creds):
     print("\n🗑️  [1단계] 드라이브 폴더 삭제 중...")
     service = build('drive', 'v3', credentials=creds)
 
-    def find_folder_id(folder_name, parent_id=None):
-        query = f"mimeType='application/vnd.google-apps.folder' and name='{folder_name}' and trashed=false"
-        if parent_id:
-            query += f" and '{parent_id}' in parents"
-        results = service.files().list(q=query, fields="files(id, name)").execute()
-        files = results.get('files', [])
-        return files[0]['id'] if files else None
-
     # 상위 폴더 찾기
-    root_id = find_folder_id(TARGET_ROOT_FOLDER_NAME)
+    root_id = find_folder_id(service, TARGET_ROOT_FOLDER_NAME)
     if not root_id:
         print(f"   ❌ '{TARGET_ROOT_FOLDER_NAME}' 폴더를 찾을 수 없습니다.")
         return
 
-    # 삭제 대상 폴더 찾기
-    target_id = find_folder_id(DELETE_FOLDER_NAME, root_id)
+    # 삭제 대상 폴더 찾기 (이름 하나만 찾으므로 목록 전체 대신 조회 한 번)
+    target_id = find_folder_id(service, DELETE_FOLDER_NAME, root_id)
     
     if target_id:
         try:
@@ -102,10 +97,31 @@ def clear_sheet_links(creds):
     except Exception as e:
         print(f"   ❌ 초기화 실패: {e}")
 
+# --- [기능 3: 메일 발송 장부 초기화] ---
+# 메일 스크립트는 시트의 '발송여부'가 아니라 발송 장부를 기준으로 중복 발송을 막으므로,
+# 다시 보내려면 장부를 비워야 합니다.
+def reset_mail_outbox(campaign=None):
+    label = f"'{campaign}' 캠페인" if campaign else "모든 캠페인"
+    print(f"\n📭 [3단계] 메일 발송 장부 초기화 중... ({label})")
+    if not os.path.exists(OUTBOX_PATH):
+        print("   ✅ 발송 장부가 없습니다. (초기화할 기록 없음)")
+        return
+    outbox = MailOutbox(OUTBOX_PATH)
+    try:
+        removed = outbox.reset(campaign)
+    finally:
+        outbox.close()
+    print(f"   ✨ 발송 기록 {removed}건 삭제 완료 (다음 실행에서 다시 발송 대상이 됩니다)")
+
 # --- [메인 실행] ---
 def main():
+    # 발송 장부만 비우기: python 00_reset_project.py --outbox [캠페인(check/remind/main)]
+    if sys.argv[1:2] == ["--outbox"]:
+        reset_mail_outbox(sys.argv[2] if len(sys.argv) > 2 else None)
+        return
+
     print("🚀 [프로젝트 초기화] 작업을 시작합니다.")
-    print("   이 작업은 생성된 폴더를 삭제하고, 시트의 링크 정보를 지웁니다.")
+    print("   이 작업은 생성된 폴더를 삭제하고, 시트의 링크 정보와 메일 발송 장부를 지웁니다.")
     
     creds = get_credentials()
     
@@ -114,6 +130,9 @@ def main():
     
     # 2. 시트 링크 지우기
     clear_sheet_links(creds)
+
+    # 3. 메일 발송 장부 지우기
+    reset_mail_outbox()
     
     print("\n🎉 프로젝트 초기화 완료! 이제 '01_create_sheets.py'를 실행할 준비가 되었습니다.")
 
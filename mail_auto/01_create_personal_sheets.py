@@ -1,7 +1,8 @@
+import datetime
+import json
 import os
 import sys
-import time
-import pandas as pd
+from functools import partial
 import gspread
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -12,6 +13,18 @@ from gspread.exceptions import APIError
 
 # --- [설정 영역] ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.dirname(BASE_DIR)
+sys.path.append(PARENT_DIR)  # 공용 모듈(sheet_write_buffer_module 등)
+from sheet_write_buffer_module import SheetWriteBuffer
+from api_counter_module import ApiCallCounter
+from quota_governor_module import RateGovernor
+from student_job_module import StudentJobRunner
+from student_index_module import StudentIndex
+from sheet_snapshot_module import load_snapshot
+from drive_folder_index_module import (FOLDER_MIME, DriveFolderIndex, find_file_id, find_folder_id,
+                                       find_public_permission)
+from drive_batch_module import DriveBatch
+
 CLIENT_SECRET_FILE = os.path.join(BASE_DIR, 'client_secret.json')
 TOKEN_FILE = os.path.join(BASE_DIR, 'token.json')
 
@@ -25,6 +38,17 @@ SHEET_CONF = "학술대회"
 TARGET_ROOT_FOLDER_NAME = "05. Temporary"
 NEW_FOLDER_NAME = "[중요] 2025 연구성과 개인별 확인"
 
+# 개인 시트 생성 방식
+# - "template": 서식을 갖춘 템플릿을 실행당 한 번 만들고, 학생마다 Drive 복사 + 값 쓰기 한 번
+# - "build": 학생마다 새 스프레드시트를 만들고 탭/서식을 직접 구성
+PROVISION_MODE = "template"
+TEMPLATE_TITLE = "[성과확인] _템플릿"  # 결과 폴더 안에 만들어지는 템플릿 파일 이름
+
+# 동시 처리 / 이어하기
+WORKERS = 6
+RESUME_FILE = os.path.join(BASE_DIR, '01_create_personal_sheets.resume.jsonl')  # 중단 시 완료 학생 기록
+CALL_STATS_FILE = os.path.join(BASE_DIR, '01_create_personal_sheets.calls.json')  # 모드별 학생당 평균 API 호출 (전/후 비교용)
+
 SCOPES = [
     'https://www.googleapis.com/auth/drive',
     'https://www.googleapis.com/auth/spreadsheets'
@@ -46,14 +70,6 @@ def get_credentials():
     return creds
 
 # --- [드라이브 함수] ---
-def find_folder_id(service, folder_name, parent_id=None):
-    query = f"mimeType='application/vnd.google-apps.folder' and name='{folder_name}' and trashed=false"
-    if parent_id:
-        query += f" and '{parent_id}' in parents"
-    results = service.files().list(q=query, fields="files(id, name)").execute()
-    files = results.get('files', [])
-    return files[0]['id'] if files else None
-
 def create_folder(service, folder_name, parent_id):
     file_metadata = {
         'name': folder_name,
@@ -63,43 +79,114 @@ def create_folder(service, folder_name, parent_id):
     file = service.files().create(body=file_metadata, fields='id').execute()
     return file.get('id')
 
-def make_folder_public(service, folder_id):
-    permission = {'type': 'anyone', 'role': 'reader'}
-    try:
-        service.permissions().create(fileId=folder_id, body=permission, fields='id').execute()
-        return True
-    except HttpError as e:
-        print(f"   ⚠️ 권한 설정 실패: {e}")
-        return False
+# --- [드라이브 배치 준비] 폴더 생성 / 공개 설정 / 템플릿 복사를 100건씩 배치 요청으로 ---
+def sheet_title_of(job):
+    return f"[성과확인] {job['name']}_{job['key']}"
+
+# 배치 재시도 전 확인용: 이미 만들어진 폴더/복사본을 배치 응답과 같은 모양으로 (없으면 None)
+def existing_folder(service, folder_name, parent_id):
+    folder_id = find_folder_id(service, folder_name, parent_id)
+    return {'id': folder_id} if folder_id else None
+
+def existing_file(service, file_name, parent_id):
+    file_id = find_file_id(service, file_name, parent_id)
+    return {'id': file_id} if file_id else None
+
+def prepare_drive_batch(drive_service, drive_governor, folder_index, jobs, template_id=None):
+    """
+    학생별 드라이브 작업을 단계별 배치 요청으로 처리하고 결과를 job에 기록합니다.
+    (job["folder_id"], 템플릿 모드면 job["sheet_id"], 실패하면 job["error"])
+    생성/복사 요청은 재시도 전에 같은 이름의 폴더/파일이 이미 있는지 확인합니다. (중복 생성 방지)
+
+    Returns:
+        int: 보낸 배치 HTTP 요청 수
+    """
+    http_calls = 0
+
+    # 1. 없는 학생 폴더 생성 (응답은 폴더 이름으로 짝지음)
+    batch = DriveBatch(drive_service, drive_governor)
+    for job in jobs:
+        if job["folder"] not in folder_index:
+            body = {'name': job["folder"], 'mimeType': FOLDER_MIME, 'parents': [folder_index.parent_id]}
+            batch.add(job["folder"], drive_service.files().create(body=body, fields='id'),
+                      lookup=partial(existing_folder, drive_service, job["folder"], folder_index.parent_id))
+    results, errors = batch.execute()
+    http_calls += batch.http_calls
+    for folder_name, response in results.items():
+        folder_index.add(folder_name, response['id'])
+    for job in jobs:
+        job["folder_id"] = folder_index.get(job["folder"])
+        if not job["folder_id"]:
+            job["error"] = errors.get(job["folder"], "폴더 생성 실패")
+
+    # 2. 아직 공개되지 않은 폴더에 '링크가 있는 모든 사용자' 읽기 권한 (실패해도 경고만)
+    ready = [job for job in jobs if job["folder_id"]]
+    batch = DriveBatch(drive_service, drive_governor)
+    for job in ready:
+        if not folder_index.is_public(job["folder"]):
+            permission = {'type': 'anyone', 'role': 'reader'}
+            batch.add(job["folder"], drive_service.permissions().create(fileId=job["folder_id"], body=permission, fields='id'),
+                      lookup=partial(find_public_permission, drive_service, job["folder_id"]))
+    results, errors = batch.execute()
+    http_calls += batch.http_calls
+    for folder_name in results:
+        folder_index.mark_public(folder_name)
+    for folder_name, e in errors.items():
+        print(f"   ⚠️ 권한 설정 실패 ({folder_name}): {e}")
+
+    # 3. 템플릿 모드: 학생 폴더로 템플릿 복사 (응답은 학번으로 짝지음)
+    if template_id:
+        batch = DriveBatch(drive_service, drive_governor)
+        for job in ready:
+            body = {"name": sheet_title_of(job), "parents": [job["folder_id"]]}
+            batch.add(job["key"], drive_service.files().copy(fileId=template_id, body=body, fields='id'),
+                      lookup=partial(existing_file, drive_service, body["name"], job["folder_id"]))
+        results, errors = batch.execute()
+        http_calls += batch.http_calls
+        for job in ready:
+            if job["key"] in results:
+                job["sheet_id"] = results[job["key"]]['id']
+            else:
+                job["error"] = errors.get(job["key"], "템플릿 복사 실패")
+
+    return http_calls
+
+# --- [시트 구성 요청 빌더] 한 학생 시트의 구조/서식을 batchUpdate 한 번으로 보내기 위한 요청들 ---
+INTRO_SHEET_ID = 0  # 새 스프레드시트의 첫 탭 sheetId
+HEADER_FORMAT = {"textFormat": {"bold": True}, "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9}}
+INTRO_LINES = [
+    "이 시트는 본인이 앱을 통해 입력한 연구성과를 확인하는 페이지입니다.",
+    "각 탭(논문, 저서, 학술대회)을 눌러 입력 내용을 확인해 주세요.",
+    "⚠️ 내용이 길어 잘린 부분은 자동으로 줄바꿈 되어 표시됩니다.",
+    "수정 요청은 회신 메일로 주시면 반영하겠습니다.",
+]
 
-def move_file_to_folder(service, file_id, folder_id):
-    file = service.files().get(fileId=file_id, fields='parents').execute()
-    previous_parents = ",".join(file.get('parents'))
-    service.files().update(fileId=file_id, addParents=folder_id, removeParents=previous_parents).execute()
-
-# --- [안전한 너비 조절 함수] ---
-def set_column_width_safe(worksheet, col_index, width):
-    body = {
-        "requests": [{
-            "updateDimensionProperties": {
-                "range": {
-                    "sheetId": worksheet.id,
-                    "dimension": "COLUMNS",
-                    "startIndex": col_index,
-                    "endIndex": col_index + 1
-                },
-                "properties": {"pixelSize": width},
-                "fields": "pixelSize"
-            }
-        }]
+def column_width_request(sheet_id, col_index, width):
+    return {
+        "updateDimensionProperties": {
+            "range": {
+                "sheetId": sheet_id,
+                "dimension": "COLUMNS",
+                "startIndex": col_index,
+                "endIndex": col_index + 1
+            },
+            "properties": {"pixelSize": width},
+            "fields": "pixelSize"
+        }
     }
-    worksheet.spreadsheet.batch_update(body)
 
-# --- [스마트 너비 조절] ---
-def smart_resize_columns(worksheet, df):
-    row_count = len(df) + 1
-    worksheet.format(f"A1:Z{row_count+20}", {"wrapStrategy": "WRAP"})
+def repeat_format_request(sheet_id, end_row, end_col, cell_format):
+    return {
+        "repeatCell": {
+            "range": {"sheetId": sheet_id, "startRowIndex": 0, "endRowIndex": end_row,
+                      "startColumnIndex": 0, "endColumnIndex": end_col},
+            "cell": {"userEnteredFormat": cell_format},
+            "fields": "userEnteredFormat(" + ",".join(cell_format.keys()) + ")"
+        }
+    }
 
+# --- [스마트 너비 조절] ---
+def smart_column_width_requests(sheet_id, df):
     MAX_WIDTH = 350
     MIN_WIDTH = 50
     requests = []
@@ -115,181 +202,247 @@ def smart_resize_columns(worksheet, df):
         pixel_width = int(max_len * 12) 
         if pixel_width > MAX_WIDTH: pixel_width = MAX_WIDTH
         elif pixel_width < MIN_WIDTH: pixel_width = MIN_WIDTH
-            
-        requests.append({
-            "updateDimensionProperties": {
-                "range": {
-                    "sheetId": worksheet.id,
-                    "dimension": "COLUMNS",
-                    "startIndex": i,
-                    "endIndex": i + 1
-                },
-                "properties": {"pixelSize": pixel_width},
-                "fields": "pixelSize"
-            }
-        })
-    
-    if requests:
-        worksheet.spreadsheet.batch_update({"requests": requests})
+        requests.append(column_width_request(sheet_id, i, pixel_width))
+    return requests
+
+def tab_requests(sheet_id, title, width_df, rows, cols, wrap):
+    """성과 탭 하나를 추가하고 줄바꿈/열 너비/헤더 서식을 적용하는 요청들을 만듭니다."""
+    end_col = min(cols, 26)  # 기존 서식 범위(A~Z)를 시트 크기 안으로
+    requests = [{"addSheet": {"properties": {
+        "sheetId": sheet_id, "title": title, "gridProperties": {"rowCount": rows, "columnCount": cols}
+    }}}]
+    if wrap:
+        requests.append(repeat_format_request(sheet_id, rows, end_col, {"wrapStrategy": "WRAP"}))
+        requests.extend(smart_column_width_requests(sheet_id, width_df))
+    requests.append(repeat_format_request(sheet_id, 1, end_col, HEADER_FORMAT))
+    return requests
+
+def intro_requests():
+    return [
+        {"updateSheetProperties": {"properties": {"sheetId": INTRO_SHEET_ID, "title": "안내"}, "fields": "title"}},
+        column_width_request(INTRO_SHEET_ID, 0, 500),
+    ]
+
+def student_values(name, tabs):
+    """안내 문구와 각 탭의 헤더+데이터를 values_batch_update용 data 목록으로 만듭니다."""
+    value_data = [{"range": "'안내'!A1", "values": [[f"안녕하세요 {name}님,"]] + [[line] for line in INTRO_LINES]}]
+    for title, df_data in tabs:
+        data = [df_data.columns.tolist()] + df_data.values.tolist()
+        value_data.append({"range": f"'{title}'!A1", "values": data})
+    return value_data
+
+def build_student_sheet(name, tabs):
+    """
+    안내 탭 + 성과 탭들을 만드는 batchUpdate 요청과 값 쓰기 데이터를 만듭니다.
+
+    Args:
+        name (str): 학생 이름 (안내 문구용)
+        tabs (list): [(탭 이름, DataFrame), ...]
+
+    Returns:
+        tuple: (spreadsheets.batchUpdate 요청 목록, values_batch_update용 data 목록)
+    """
+    requests = intro_requests()
+    for sheet_id, (title, df_data) in enumerate(tabs, start=1):
+        rows, cols = len(df_data) + 1 + 20, len(df_data.columns) + 5
+        requests.extend(tab_requests(sheet_id, title, df_data, rows, cols, wrap=not df_data.empty))
+    return requests, student_values(name, tabs)
+
+def build_template_sheet(index):
+    """
+    모든 학생이 복사해 쓸 템플릿의 batchUpdate 요청과 값(안내 문구 + 헤더)을 만듭니다.
+    행 수는 한 학생이 가진 가장 많은 성과 수 + 20, 열 너비는 전체 명단 데이터로 정합니다.
+
+    Args:
+        index (StudentIndex): 학번별 성과 색인
+    """
+    requests = intro_requests()
+    value_data = [{"range": "'안내'!A1", "values": [["안녕하세요,"]] + [[line] for line in INTRO_LINES]}]
+    for sheet_id, (title, df_all) in enumerate(index.frames.items(), start=1):
+        most = index.max_rows(title)
+        rows, cols = most + 1 + 20, len(df_all.columns) + 5
+        requests.extend(tab_requests(sheet_id, title, df_all, rows, cols, wrap=True))
+        value_data.append({"range": f"'{title}'!A1", "values": [df_all.columns.tolist()]})
+    return requests, value_data
+
+# --- [템플릿 준비] 실행마다 현재 명단 열 구성으로 새로 만듦 (이전 템플릿은 휴지통으로) ---
+def prepare_template(gc, drive_service, target_folder_id, index):
+    query = (f"name='{TEMPLATE_TITLE}' and '{target_folder_id}' in parents and trashed=false "
+             "and mimeType='application/vnd.google-apps.spreadsheet'")
+    for old in drive_service.files().list(q=query, fields="files(id)").execute().get('files', []):
+        drive_service.files().update(fileId=old['id'], body={"trashed": True}).execute()
+
+    template = gc.create(TEMPLATE_TITLE, folder_id=target_folder_id)
+    requests, value_data = build_template_sheet(index)
+    template.batch_update({"requests": requests})
+    template.values_batch_update({"valueInputOption": "RAW", "data": value_data})
+    return template.id
+
+# --- [API 호출 비교] 모드별 학생당 평균 호출 수를 기록해 두고 build(이전 방식) / template을 같이 출력 ---
+def record_call_stats(mode, per_student, students):
+    """
+    이번 실행 모드의 학생당 평균 API 호출 수를 기록하고, 모드별 최근 측정값을 돌려줍니다.
+
+    Returns:
+        dict: {모드: {"per_student", "students", "measured_at"}}
+    """
+    stats = {}
+    if os.path.exists(CALL_STATS_FILE):
+        try:
+            with open(CALL_STATS_FILE, 'r', encoding='utf-8') as f:
+                stats = json.load(f)
+        except (OSError, ValueError):
+            stats = {}
+    stats[mode] = {"per_student": round(per_student, 1), "students": students,
+                   "measured_at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M")}
+    with open(CALL_STATS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(stats, f, ensure_ascii=False, indent=2)
+    return stats
+
+def print_call_stats(stats, current_mode):
+    print("📊 학생당 평균 API 호출 (드라이브 배치 포함):")
+    for mode in ("build", "template"):
+        entry = stats.get(mode)
+        if not entry:
+            print(f"   - {mode}: 측정 기록 없음 (PROVISION_MODE = \"{mode}\"로 한 번 실행하면 기록됩니다)")
+            continue
+        when = "이번 실행" if mode == current_mode else f"{entry['measured_at']} 측정"
+        print(f"   - {mode}: {entry['per_student']:.1f}회 ({when}, {entry['students']}명)")
 
-# --- [핵심: 작업 재시도 처리 함수] ---
-def process_student_with_retry(drive_service, gc, target_folder_id, master_doc, row, idx, df_paper, df_book, df_conf):
-    name = str(row.get('Name_2', '')).strip()
-    student_id = str(row.get('Student_No', '')).strip()
-    
-    retry_count = 0
-    max_retries = 10 
-    
-    while retry_count < max_retries:
+# --- [핵심: 학생 한 명 처리 함수] ---
+# 드라이브 작업(폴더/권한/복사)은 prepare_drive_batch에서 끝났고, 여기서는 시트 내용만 씁니다.
+# 429 대기/재시도는 RateGovernor가 요청 단위로 처리하므로 여기서는 성공/실패만 판단합니다.
+def process_student(gc, link_writer, job, index):
+    name, student_id = job["name"], job["key"]
+
+    try:
+        # 데이터 매칭: 이름 무시, 오직 '학번'으로만 (학번별로 미리 나눠 둔 색인에서 조회)
+        tabs = index.tabs(student_id)
+
+        if job.get("sheet_id"):
+            # A. 템플릿 복사본 (탭/서식은 이미 갖춰져 있음) -> 값 쓰기 한 번
+            sheet_id = job["sheet_id"]
+            gc.http_client.values_batch_update(sheet_id, {"valueInputOption": "RAW", "data": student_values(name, tabs)})
+            sheet_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}"
+        else:
+            # B. 시트 생성 (학생 폴더 안에 바로 생성 -> 파일 이동 호출 불필요)
+            new_sh = gc.create(sheet_title_of(job), folder_id=job["folder_id"])
+
+            # 안내 탭 + 성과 탭: 탭 추가/너비/서식은 batchUpdate 한 번, 값은 values_batch_update 한 번
+            #    (실패 시 여기서 에러 발생 -> catch 블록으로 이동)
+            requests, value_data = build_student_sheet(name, tabs)
+            new_sh.batch_update({"requests": requests})
+            new_sh.values_batch_update({"valueInputOption": "RAW", "data": value_data})
+            sheet_url = new_sh.url
+
+        # 링크 기록 (쓰기 버퍼에 모았다가 한 번에 전송)
         try:
-            # 1. 폴더 생성 (이름은 보기 좋게 Name_2 사용)
-            folder_name = f"{name}_{student_id}"
-            student_folder_id = find_folder_id(drive_service, folder_name, target_folder_id)
-            if not student_folder_id:
-                student_folder_id = create_folder(drive_service, folder_name, target_folder_id)
-            
-            make_folder_public(drive_service, student_folder_id)
-
-            # 2. 시트 생성
-            sheet_title = f"[성과확인] {name}_{student_id}"
-            new_sh = gc.create(sheet_title)
-            move_file_to_folder(drive_service, new_sh.id, student_folder_id)
-
-            # 3. 데이터 기입 함수
-            def write_tab(sh, title, df_data):
-                if df_data.empty:
-                    data = [df_data.columns.tolist()]
-                else:
-                    data = [df_data.columns.tolist()] + df_data.values.tolist()
-                
-                # 워크시트 추가
-                ws = sh.add_worksheet(title=title, rows=len(data)+20, cols=len(data[0])+5)
-                # 에러 발생 시 즉시 멈추도록 try-except 제거
-                ws.update(range_name='A1', values=data)
-                
-                if not df_data.empty:
-                    smart_resize_columns(ws, df_data)
-                    
-                ws.format("A1:Z1", {
-                    "textFormat": {"bold": True},
-                    "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9}
-                })
-
-            # -----------------------------------------------------------------
-            # [변경됨] 데이터 매칭 로직: 이름 무시, 오직 '학번'으로만 필터링
-            # -----------------------------------------------------------------
-            my_paper = df_paper[df_paper['학번'] == student_id]
-            my_book = df_book[df_book['학번'] == student_id]
-            my_conf = df_conf[df_conf['학번'] == student_id]
-            # -----------------------------------------------------------------
-
-            # 안내 시트
-            intro = new_sh.sheet1
-            intro.update_title("안내")
-            intro.update(range_name='A1', values=[[f"안녕하세요 {name}님,"],
-                                ["이 시트는 본인이 앱을 통해 입력한 연구성과를 확인하는 페이지입니다."],
-                                ["각 탭(논문, 저서, 학술대회)을 눌러 입력 내용을 확인해 주세요."],
-                                ["⚠️ 내용이 길어 잘린 부분은 자동으로 줄바꿈 되어 표시됩니다."],
-                                ["수정 요청은 회신 메일로 주시면 반영하겠습니다."]])
-            set_column_width_safe(intro, 0, 500)
-
-            # 탭 작성 (실패 시 여기서 에러 발생 -> catch 블록으로 이동)
-            write_tab(new_sh, "논문", my_paper)
-            write_tab(new_sh, "저서", my_book)
-            write_tab(new_sh, "학술대회", my_conf)
-
-            # 4. 링크 기록
-            try:
-                col_idx = pd.DataFrame(master_doc.worksheet(SHEET_STUDENT_LIST).get_all_records()).columns.get_loc('개별시트링크') + 1
-                master_doc.worksheet(SHEET_STUDENT_LIST).update_cell(idx + 2, col_idx, new_sh.url)
-            except: pass
-
-            return True # 성공
-
-        except (APIError, HttpError) as e:
-            # 에러 감지 (429 Quota Exceeded 등)
-            is_quota_error = False
-            if isinstance(e, APIError) and '429' in str(e): is_quota_error = True
-            if isinstance(e, HttpError) and e.resp.status == 429: is_quota_error = True
-
-            if is_quota_error:
-                wait_time = 70 * (retry_count + 1)
-                print(f"\n   ⏳ 과부하 감지 (Quota Exceeded)! {wait_time}초 동안 대기 후 재시도합니다... ({retry_count+1}/{max_retries})")
-                time.sleep(wait_time)
-                retry_count += 1
-            else:
-                print(f"   ❌ 치명적 오류 발생: {e}")
-                return False
-        except Exception as e:
-             print(f"   ❌ 알 수 없는 오류: {e}")
-             return False
-    
-    return False
+            link_writer(job["idx"] + 2, sheet_url)
+        except: pass
+
+        return sheet_url # 성공 (이어하기 기록에 링크를 남김)
+
+    except (APIError, HttpError) as e:
+        print(f"   ❌ {name} 치명적 오류 발생: {e}")
+        return False
+    except Exception as e:
+        print(f"   ❌ {name} 알 수 없는 오류: {e}")
+        return False
 
 def main():
     print("🚀 [전체 학생] 폴더 및 시트 생성 (학번 매칭 + 재시도 버전) 시작...")
 
     creds = get_credentials()
-    gc = gspread.authorize(creds)
-    drive_service = build('drive', 'v3', credentials=creds)
+    # 학생별 API 호출 수 측정 (gspread 요청 / 드라이브 API 요청)
+    api_counter = ApiCallCounter()
+    gc = api_counter.attach_gspread(gspread.authorize(creds))
+    drive_service = api_counter.attach_google_service(build('drive', 'v3', credentials=creds))
+    # 시트 읽기/쓰기/드라이브 요청 속도 조절 + 429 자동 재시도 (고정 sleep 대신)
+    governor = RateGovernor()
+    governor.attach_gspread(gc)
+    governor.attach_google_service(drive_service)
     print("✅ 인증 완료")
 
     print("📊 데이터 로드 중...", end=" ")
     try:
         master_doc = gc.open_by_url(SPREADSHEET_URL)
-        df_list = pd.DataFrame(master_doc.worksheet(SHEET_STUDENT_LIST).get_all_records())
-        df_paper = pd.DataFrame(master_doc.worksheet(SHEET_PAPER).get_all_records())
-        df_book = pd.DataFrame(master_doc.worksheet(SHEET_BOOK).get_all_records())
-        df_conf = pd.DataFrame(master_doc.worksheet(SHEET_CONF).get_all_records())
-        
-        for df in [df_list, df_paper, df_book, df_conf]:
-            df.columns = [c.strip() for c in df.columns]
+        # 명단 + 성과 탭을 values_batch_get 한 번으로 (헤더/학번 정규화, 변경 없으면 로컬 캐시)
+        frames, snapshot = load_snapshot(gc, SPREADSHEET_URL, (SHEET_STUDENT_LIST, SHEET_PAPER, SHEET_BOOK, SHEET_CONF))
+        df_list = frames[SHEET_STUDENT_LIST]
+        # 성과 탭은 학생별로 한 번에 나눠 둠
+        index = StudentIndex({tab: frames[tab] for tab in (SHEET_PAPER, SHEET_BOOK, SHEET_CONF)})
     except Exception as e:
         print(f"\n❌ 시트 로드 실패: {e}")
         return
-    
-    # 학번을 문자열로 통일 (매칭 정확도 향상)
-    for df in [df_list, df_paper, df_book, df_conf]:
-        if '학번' in df.columns: df['학번'] = df['학번'].astype(str).str.strip()
-        if 'Student_No' in df.columns: df['Student_No'] = df['Student_No'].astype(str).str.strip()
-        if '이름' in df.columns: df['이름'] = df['이름'].astype(str)
-    print("완료!")
+    print(f"완료! ({snapshot.describe()}, 성과 보유 학생 {len(index)}명)")
 
     # 폴더 준비
     root_id = find_folder_id(drive_service, TARGET_ROOT_FOLDER_NAME)
     target_folder_id = find_folder_id(drive_service, NEW_FOLDER_NAME, root_id)
     if not target_folder_id:
         target_folder_id = create_folder(drive_service, NEW_FOLDER_NAME, root_id)
-
-    created_count = 0
-    
+    # 학생 폴더 이름 -> ID 색인 (목록 조회는 여기서 한 번, 학생별 조회는 API 호출 없음)
+    folder_index = DriveFolderIndex(drive_service, target_folder_id)
+    print(f"📁 기존 학생 폴더 {len(folder_index)}개 확인")
+
+    # 템플릿 모드: 서식 작업은 여기서 한 번만
+    template_id = None
+    if PROVISION_MODE == "template":
+        print("🧩 템플릿 준비 중...", end=" ")
+        template_id = prepare_template(gc, drive_service, target_folder_id, index)
+        print(f"완료! ({ApiCallCounter.describe(api_counter.snapshot())} 누적)")
+
+    # 개별시트링크 쓰기: 열 위치는 한 번만 찾고, 셀 쓰기는 모아서 values_batch_update로
+    ws_list = master_doc.worksheet(SHEET_STUDENT_LIST)
+    link_buffer = SheetWriteBuffer(master_doc, flush_size=20, flush_interval=60)
+    link_col_idx = df_list.columns.get_loc('개별시트링크') + 1 if '개별시트링크' in df_list.columns else None
+
+    def write_link(row_num, url):
+        if link_col_idx:
+            link_buffer.update_cell(ws_list, row_num, link_col_idx, url)
+
+    # 학생별 작업 목록 (이미 링크가 있으면 패스)
+    jobs = []
     for idx, row in df_list.iterrows():
         name = str(row.get('Name_2', '')).strip()
         student_id = str(row.get('Student_No', '')).strip()
-
         if not name or not student_id:
             continue
-            
-        # 이미 링크가 있으면 패스
         if str(row.get('개별시트링크', '')).startswith('http'):
-             continue
-
-        print(f"🔨 작업 중: {name} ({student_id})...", end=" ")
-        
-        success = process_student_with_retry(
-            drive_service, gc, target_folder_id, master_doc, 
-            row, idx, df_paper, df_book, df_conf
-        )
-
-        if success:
-            print("완료! ✅")
-            created_count += 1
-            time.sleep(5)
-        else:
-            print("최종 실패 ❌")
-            time.sleep(5)
-
-    print(f"\n🎉 총 {created_count}명의 시트 생성/수정 완료!")
+            continue
+        jobs.append({"key": student_id, "name": name, "label": f"{name} ({student_id})",
+                     "idx": idx, "folder": f"{name}_{student_id}"})
+
+    # 이전 실행에서 만들었지만 링크 기록 전에 중단된 학생은 링크만 다시 기록
+    runner = StudentJobRunner(workers=WORKERS, resume_path=RESUME_FILE)
+    for job in jobs:
+        if job["key"] in runner.completed:
+            write_link(job["idx"] + 2, runner.completed[job["key"]])
+
+    # 드라이브 작업은 메인 스레드에서 배치로 (httplib2는 스레드 간 공유 불가), 시트 쓰기만 스레드로
+    calls_before = api_counter.snapshot()
+    todo = [job for job in jobs if job["key"] not in runner.completed]
+    print(f"📦 드라이브 배치 준비 중... ({len(todo)}명)", end=" ")
+    batch_calls = prepare_drive_batch(drive_service, governor.governors["drive"], folder_index, todo, template_id)
+    print(f"완료! (배치 요청 {batch_calls}회)")
+
+    def work(job):
+        if job.get("error"):
+            raise RuntimeError(f"드라이브 준비 실패: {job['error']}")
+        return process_student(gc, write_link, job, index)
+
+    print(f"👥 대상 {len(jobs)}명 / 동시 {WORKERS}명씩 처리")
+    summary = runner.run(jobs, work)
+    created_count = summary["succeeded"]
+    if created_count:
+        per_student = sum(api_counter.diff(calls_before).values()) / created_count
+        print_call_stats(record_call_stats(PROVISION_MODE, per_student, created_count), PROVISION_MODE)
+
+    link_buffer.flush()
+    print(f"\n🎉 총 {created_count}명의 시트 생성/수정 완료! (실패 {summary['failed']}명, {summary['elapsed']}초)")
+    print(f"📊 전체 API 호출: {ApiCallCounter.describe(api_counter.snapshot())}")
+    quota_errors = sum(g["quota_errors"] for g in governor.stats().values())
+    print(f"⏳ 사용량 한도 초과(429) 재시도: {quota_errors}회")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
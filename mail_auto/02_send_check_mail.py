@@ -1,8 +1,6 @@
 import os
 import sys
-import time
 import platform # OS 감지용
-import pandas as pd
 import gspread
 from dotenv import load_dotenv
 
@@ -10,9 +8,21 @@ from dotenv import load_dotenv
 # [기본 설정] 경로 및 모듈 임포트
 # -----------------------------------------------------------
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.dirname(CURRENT_DIR)
 sys.path.append(CURRENT_DIR)
+sys.path.append(PARENT_DIR)  # 공용 모듈(quota_governor_module 등)
 
 import send_mail_module as send_mail_module
+from mail_dispatch_module import MailDispatcher
+from mail_template_module import load_template
+from mail_outbox_module import MailOutbox, SheetReconciler
+from sheet_write_buffer_module import SheetWriteBuffer
+from student_index_module import StudentIndex
+from sheet_snapshot_module import load_snapshot, normalize_student_id
+from sheet_stream_module import WorksheetStream
+
+OUTBOX_PATH = os.path.join(CURRENT_DIR, 'mail_outbox.db')
+CAMPAIGN = "check"
 
 def main():
     # 1. 환경 변수 로드
@@ -84,8 +94,6 @@ def main():
         doc = gc.open_by_url(spreadsheet_url)
         
         ws_mail = doc.worksheet(SHEET_MAIL_LIST)
-        ws_check = doc.worksheet(SHEET_CHECK_LIST)
-        ws_paper = doc.worksheet(SHEET_PAPER)
         print(">> 구글 스프레드시트 접속 성공!")
         
     except Exception as e:
@@ -95,39 +103,35 @@ def main():
     # 3. 데이터 로딩
     print(">> 데이터 로딩 중...")
     try:
-        data_mail = ws_mail.get_all_records()
-        data_check = ws_check.get_all_records()
-        data_paper = ws_paper.get_all_records()
+        # 명단 두 탭은 values_batch_get 한 번으로 (헤더 공백/학번 정규화, 변경 없으면 로컬 캐시)
+        frames, snapshot = load_snapshot(gc, spreadsheet_url, (SHEET_MAIL_LIST, SHEET_CHECK_LIST))
+        # 논문 탭은 필요한 두 열만 행 단위로 나눠 읽음 (초록 등 긴 열은 받지 않음)
+        df_paper = WorksheetStream(gc, spreadsheet_url, SHEET_PAPER, columns=['학번', '연구성과유무']).read()
     except Exception as e:
         print(f"[오류] 데이터 로딩 실패: {e}")
         return
+    print(f">> {snapshot.describe()}")
     
-    df_mail = pd.DataFrame(data_mail)
-    df_check = pd.DataFrame(data_check)
-    df_paper = pd.DataFrame(data_paper)
-    
-    # 컬럼 공백 제거
-    df_mail.columns = [str(c).strip() for c in df_mail.columns]
-    df_check.columns = [str(c).strip() for c in df_check.columns]
-    df_paper.columns = [str(c).strip() for c in df_paper.columns]
+    df_mail = frames[SHEET_MAIL_LIST]
+    df_check = frames[SHEET_CHECK_LIST]
+    # 논문 탭은 학번을 정규화한 학생별 색인으로
+    index = StudentIndex({SHEET_PAPER: df_paper})
     
     # 4. '연구성과유무'가 'X'인 학생 추출
-    no_result_students = set()
-    if '연구성과유무' in df_paper.columns and '학번' in df_paper.columns:
-        target_rows = df_paper[df_paper['연구성과유무'] == 'X']
-        no_result_students = set(target_rows['학번'].astype(str).str.strip().tolist())
+    no_result_students = index.students_where(SHEET_PAPER, '연구성과유무', 'X')
+    if no_result_students:
         print(f"ℹ️  연구성과 '없음(X)' 제출자 수: {len(no_result_students)}명")
 
     # 5. 발송 기록 매핑
     mail_map = {}
     for idx, row in df_mail.iterrows():
-        s_id = str(row.get(COL_ID, row.get('학번', ''))).strip()
+        s_id = normalize_student_id(row.get(COL_ID, row.get('학번', '')))
         status = str(row.get(COL_SENT, '')).strip()
         if s_id:
             mail_map[s_id] = {'row_idx': idx + 2, 'status': status}
 
-    # '발송여부' 컬럼 인덱스 찾기
-    header_values = ws_mail.row_values(1)
+    # '발송여부' 컬럼 인덱스 찾기 (스냅샷 헤더는 시트 열 순서 그대로)
+    header_values = df_mail.columns.tolist()
     try:
         sent_col_idx = header_values.index(COL_SENT) + 1
     except ValueError:
@@ -143,15 +147,21 @@ def main():
     
     print(f"📋 총 {len(df_check)}명의 명단을 확인합니다.")
     
-    success_count = 0
     count_skip = 0
 
-    # 7. 발송 루프
-    for idx, row in df_check.iterrows():
+    # 7. 발송 대상/내용 작성 -> 로컬 발송함에 적재
+    outbox = MailOutbox(OUTBOX_PATH)
+    recovered = outbox.recover(CAMPAIGN)
+    if recovered:
+        print(f"♻️  지난 실행에서 끝나지 않은 {recovered}건 확인 (이번 명단에 다시 포함된 건만 이어서 보냅니다)")
+
+    tpl_no_result = load_template("check_no_result.html")
+    tpl_general = load_template("check_general.html")
+    for row in df_check.to_dict('records'):
         name = str(row.get('name_2', row.get('Name', ''))).strip()
         email = str(row.get('email', row.get('Email', ''))).strip()
         link = str(row.get('개별시트링크', '')).strip()
-        student_id = str(row.get('Student_No', row.get('학번', ''))).strip()
+        student_id = normalize_student_id(row.get('Student_No', row.get('학번', '')))
 
         if not name or not email: continue
         if student_id not in mail_map: continue
@@ -163,60 +173,57 @@ def main():
             
         if not link.startswith('http'): continue
 
-        # 메일 내용 작성
-        subject = ""
-        html_content = ""
-
+        # 메일 내용 작성 (템플릿은 한 번만 컴파일, 수신자별로 칸만 채움)
         # A. 성과 없음(X)
         if student_id in no_result_students:
-            print(f"📩 [성과없음] 발송: {name} ({email}) ...", end=" ")
+            kind = "성과없음"
             subject = f"[중요] {name} 학생에게, 2025학년도 BK21 참여학생 연구실적 입력 결과 확인 요청"
-            html_content = f"""
-            <div style="font-family: 'Malgun Gothic', 'Apple SD Gothic Neo', sans-serif; font-size: 11pt; line-height: 1.6; color: #333;">
-                <p><strong>{name}</strong> 학생에게,</p>
-                <br>
-                <p>안녕하세요. 국어국문학과 BK21 교육연구단 연구교수 유승진입니다.</p>
-                <div style="background-color: #fff3cd; padding: 15px; border-left: 5px solid #ffc107;">
-                    <p style="margin: 0;"><strong>📢 확인 사항</strong></p>
-                    <p style="margin-top: 5px;">현재 <strong>'연구성과 없음'</strong>으로 제출되었습니다. 본인이 제출한 내용이 맞는지 확인 부탁드립니다.</p>
-                </div>
-                <br>
-                <p><strong>🔗 내 성과 확인하기:</strong> <a href="{link}" target="_blank">{link}</a></p>
-                <br>
-                <p>BK21 교육연구단 유승진 드림</p>
-            </div>
-            """
+            html_content = tpl_no_result.render(이름=name, 링크=link)
         # B. 일반 (성과 있음)
         else:
-            print(f"📩 [일반] 발송: {name} ({email}) ...", end=" ")
+            kind = "일반"
             subject = f"[BK21] 2025학년도 연구실적 입력 결과 확인 요청 ({name} 학생)"
-            html_content = f"""
-            <div style="font-family: 'Malgun Gothic', 'Apple SD Gothic Neo', sans-serif; font-size: 11pt; line-height: 1.6; color: #333;">
-                <p><strong>{name}</strong> 학생에게,</p>
-                <br>
-                <p>안녕하세요. 국어국문학과 BK21 교육연구단 연구교수 유승진입니다.</p>
-                <p>제출해주신 2025학년도 연구실적 데이터를 공유합니다. 누락이나 오타가 없는지 확인 바랍니다.</p>
-                <br>
-                <div style="background-color: #f0f8ff; padding: 20px; border-left: 5px solid #007bff; margin: 10px 0;">
-                    <h3 style="margin-top: 0; color: #0056b3;">✅ 내 성과 확인하기</h3>
-                    <p><strong>확인 링크:</strong> <a href="{link}" target="_blank">{link}</a></p>
-                </div>
-                <br>
-                <p>BK21 교육연구단 유승진 드림</p>
-            </div>
-            """
-
-        # 전송 실행
-        if send_mail_module.send_email(smtp_user, smtp_password, email, subject, html_content):
-            print("성공! ✅")
-            try:
-                ws_mail.update_cell(mail_map[student_id]['row_idx'], sent_col_idx, 'Sent')
-                success_count += 1
-                time.sleep(1.5)
-            except Exception as e:
-                print(f" (기록 실패: {e})")
+            html_content = tpl_general.render(이름=name, 링크=link)
+
+        # 시트에는 아직 없어도 발송 장부에 있으면(지난 실행에서 보냄) 다시 보내지 않음
+        if not outbox.enqueue(CAMPAIGN, student_id, email, subject, html_content,
+                              meta={"label": f"[{kind}] {name} ({email})"}):
+            print(f"⏭️  [Skip] {name} - 발송 장부에 이미 발송 기록 있음 (다시 보내려면 00_reset_project.py --outbox)")
+            count_skip += 1
+
+    # 8. 동시 발송 (스레드별 SMTP 연결 + 분당 발송 상한)
+    #    발송 결과는 즉시 발송함에 기록하고, 시트 '발송여부'는 백그라운드에서 반영
+    sheet_buffer = SheetWriteBuffer(doc)
+
+    def write_sent(entries):
+        # 이번 주기에 보낸 건들의 'Sent'를 한 번의 batch 요청으로 기록
+        # 행 번호는 발송함에 저장하지 않고 이번 실행에서 읽은 명단에서 학번으로 다시 찾음
+        # (지난 실행에서 넘어온 건이 있어도 그사이 행이 추가/정렬되어 다른 학생에게 쓰이지 않도록)
+        for entry in entries:
+            target = mail_map.get(entry['student_id'])
+            if target is None:
+                print(f"⚠️ [outbox] 학번 {entry['student_id']}이 '{SHEET_MAIL_LIST}'에 없어 '발송여부'를 쓰지 않습니다.")
+                continue
+            sheet_buffer.update_cell(ws_mail, target['row_idx'], sent_col_idx, 'Sent')
+        sheet_buffer.flush()
+
+    def on_result(job, ok):
+        if ok:
+            print(f"📩 {job['label']} 성공! ✅")
         else:
-            print("실패 ❌")
+            outbox.mark_failed(job['outbox_id'], job.get('error'))
+            print(f"📩 {job['label']} 실패 ❌")
+
+    jobs = outbox.claim(CAMPAIGN)
+    print(f"📨 발송 대상 {len(jobs)}명")
+    reconciler = SheetReconciler(outbox, CAMPAIGN, write_sent).start()
+    dispatcher = MailDispatcher(lambda: send_mail_module.SmtpMailer(smtp_user, smtp_password))
+    summary = dispatcher.run(jobs, on_result, on_sent=lambda job: outbox.mark_sent(job['outbox_id']))
+    reconciler.stop()
+    success_count = summary['sent']
+    print(f"⏱️  발송 소요 {summary['elapsed']}초 (재시도 {summary['retried']}건, 실패 {summary['failed']}건)")
+    print(f"🗂️  시트 반영 {reconciler.synced_count}건, 발송함 상태: {outbox.counts(CAMPAIGN)}")
+    outbox.close()
 
     print(f"\n🎉 총 {success_count}명 발송 완료! (이미 발송됨: {count_skip}명)")
 
@@ -1,21 +1,28 @@
 import os
 import sys
 import json
-import markdown
 import gspread
 
 # --- [모듈 경로 설정] ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.dirname(BASE_DIR)
 sys.path.append(BASE_DIR)
+sys.path.append(PARENT_DIR)  # 공용 모듈(quota_governor_module 등)
 import send_mail_module
+from mail_dispatch_module import MailDispatcher
+from mail_template_module import DEFAULT_WRAPPER, load_template
+from mail_outbox_module import MailOutbox, SheetReconciler
+from sheet_write_buffer_module import SheetWriteBuffer
+from sheet_snapshot_module import load_snapshot
 
 # --- [설정 영역] ---
-PARENT_DIR = os.path.dirname(BASE_DIR)
 
 # 파일 경로
 SHEET_KEY_PATH = os.path.join(PARENT_DIR, 'service_account.json')
 NAVER_KEY_PATH = os.path.join(BASE_DIR, 'naver_credentials.json')
-MD_FILE_PATH = os.path.join(BASE_DIR, 'email_content.md')
+TEMPLATE_NAME = 'email_content.md'  # templates 폴더
+OUTBOX_PATH = os.path.join(BASE_DIR, 'mail_outbox.db')
+CAMPAIGN = "remind"
 
 # 구글 시트 설정
 SPREADSHEET_URL = "https://docs.google.com/spreadsheets/d/1nfE8lcFRsUfYkdV-tjpsZfFPWER0YeNR2TaxYLH32JY/edit?usp=sharing"
@@ -37,19 +44,11 @@ def main():
         print("⚠️ naver_credentials.json 파일이 없습니다.")
         return
 
-    # 2. 마크다운 파일 읽기
+    # 2. 템플릿 컴파일 (마크다운 -> HTML 변환은 여기서 한 번만)
     try:
-        with open(MD_FILE_PATH, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            
-        # [수정] 제목 중복 방지: 첫 줄이 '#'으로 시작하면 제목으로 간주하고 제거
-        if lines and lines[0].strip().startswith('#'):
-            md_text = "".join(lines[1:]) # 첫 줄 빼고 나머지 합치기
-        else:
-            md_text = "".join(lines)
-            
+        template = load_template(TEMPLATE_NAME, strip_title=True, extensions=('nl2br',), wrapper=DEFAULT_WRAPPER)
     except FileNotFoundError:
-        print("⚠️ email_content.md 파일이 없습니다.")
+        print(f"⚠️ templates/{TEMPLATE_NAME} 파일이 없습니다.")
         return
 
     # 3. 구글 시트 연결
@@ -57,17 +56,28 @@ def main():
     try:
         gc = gspread.service_account(filename=SHEET_KEY_PATH)
         doc = gc.open_by_url(SPREADSHEET_URL)
-        worksheet = doc.worksheet(SHEET_NAME)
-        records = worksheet.get_all_records()
+        worksheet = doc.worksheet(SHEET_NAME)  # '발송여부' 쓰기용
+        # values_batch_get 한 번 (헤더 공백/학번 정규화, 변경 없으면 로컬 캐시)
+        frames, snapshot = load_snapshot(gc, SPREADSHEET_URL, [SHEET_NAME])
+        records = frames[SHEET_NAME].to_dict('records')
     except Exception as e:
         print(f"⚠️ 시트 연결 오류: {e}")
         return
 
-    print(f"📋 총 {len(records)}명의 데이터를 가져왔습니다.")
+    print(f"📋 총 {len(records)}명의 데이터를 가져왔습니다. ({snapshot.describe()})")
 
-    # 4. 발송 루프 시작
-    success_count = 0
+    # 4. 발송 대상/내용 작성 -> 로컬 발송함에 적재
+    outbox = MailOutbox(OUTBOX_PATH)
+    recovered = outbox.recover(CAMPAIGN)
+    if recovered:
+        print(f"♻️  지난 실행에서 끝나지 않은 {recovered}건 확인 (이번 명단에 다시 포함된 건만 이어서 보냅니다)")
+
+    # 안전하게 컬럼 위치 찾기 (소문자/대소문자 이슈 방지 위해 다시 로드하지 않고 인덱스 계산)
+    # 스냅샷 헤더(시트 열 순서 그대로)에서 찾음
+    header_keys = frames[SHEET_NAME].columns.tolist()
+    sent_col_idx = header_keys.index('발송여부') + 1 if '발송여부' in header_keys else None
     
+    row_by_key = {}  # 발송 장부 키 -> 이번 실행에서 읽은 시트 행 번호 ('Sent' 기록용)
     for i, row in enumerate(records):
         row_num = i + 2 # 헤더가 1행이므로 데이터는 2행부터 시작
         
@@ -75,6 +85,10 @@ def main():
         name = str(row.get('name_2', '')).strip()
         email = str(row.get('email', '')).strip()
         status = str(row.get('발송여부', '')).strip()
+        # 발송 장부 키: 학번 (명단에 학번 열이 없으면 이메일)
+        student_key = str(row.get('학번', row.get('Student_No', ''))).strip() or email
+        if student_key:
+            row_by_key.setdefault(student_key, row_num)
 
         if not email or not name:
             continue
@@ -83,39 +97,50 @@ def main():
             print(f"⏭️  [Skip] {name} - 이미 발송 완료.")
             continue
 
-        print(f"📩 발송 시도: {name} ({email}) ...", end=" ")
-
-        # 1. 내용 치환 (이름 등)
-        personalized_md = md_text.replace("{{이름}}", name)
-        
-        # 2. HTML 변환
-        raw_html = markdown.markdown(personalized_md, extensions=['nl2br'])
-
-        # 3. 디자인 적용
-        styled_html = f"""
-        <div style="font-family: 'Apple SD Gothic Neo', 'Malgun Gothic', sans-serif; font-size: 11pt; line-height: 1.6; color: #333;">
-            {raw_html}
-        </div>
-        """
+        # 이름 칸만 채워서 본문 완성
+        styled_html = template.render(이름=name)
         
         # 메일 제목 설정
         subject = f"[긴급] {name} 학생, 2025학년도 BK21 참여학생 연구실적 유/무를 입력해주세요 (1/25 마감)" 
 
-        # 4. 전송
-        if send_mail_module.send_email(NAVER_ID, NAVER_PWD, email, subject, styled_html):
-            print("성공! ✅")
-            # 발송여부 기록
-            try:
-                # 안전하게 컬럼 위치 찾기 (소문자/대소문자 이슈 방지 위해 다시 로드하지 않고 인덱스 계산)
-                # get_all_records()의 키 리스트에서 찾음
-                header_keys = list(row.keys())
-                col_idx = header_keys.index('발송여부') + 1
-                worksheet.update_cell(row_num, col_idx, 'Sent')
-                success_count += 1
-            except:
-                pass 
+        if not outbox.enqueue(CAMPAIGN, student_key, email, subject, styled_html,
+                              meta={"label": f"{name} ({email})"}):
+            print(f"⏭️  [Skip] {name} - 발송 장부에 이미 발송 기록 있음 (다시 보내려면 00_reset_project.py --outbox).")
+
+    # 5. 동시 발송 (스레드별 SMTP 연결 + 분당 발송 상한)
+    #    발송 결과는 즉시 발송함에 기록하고, 시트 '발송여부'는 백그라운드에서 반영
+    sheet_buffer = SheetWriteBuffer(doc)
+
+    def write_sent(entries):
+        if sent_col_idx is None:
+            return
+        # 이번 주기에 보낸 건들의 'Sent'를 한 번의 batch 요청으로 기록
+        # 행 번호는 이번 실행에서 읽은 명단에서 학번(또는 이메일)으로 다시 찾음 (그사이 행이 바뀌어도 안전)
+        for entry in entries:
+            row_num = row_by_key.get(entry['student_id'])
+            if row_num is None:
+                print(f"⚠️ [outbox] {entry['student_id']}이(가) '{SHEET_NAME}'에 없어 '발송여부'를 쓰지 않습니다.")
+                continue
+            sheet_buffer.update_cell(worksheet, row_num, sent_col_idx, 'Sent')
+        sheet_buffer.flush()
+
+    def on_result(job, ok):
+        if ok:
+            print(f"📩 {job['label']} 성공! ✅")
         else:
-            print("실패 ❌")
+            outbox.mark_failed(job['outbox_id'], job.get('error'))
+            print(f"📩 {job['label']} 실패 ❌")
+
+    jobs = outbox.claim(CAMPAIGN)
+    print(f"📨 발송 대상 {len(jobs)}명")
+    reconciler = SheetReconciler(outbox, CAMPAIGN, write_sent).start()
+    dispatcher = MailDispatcher(lambda: send_mail_module.SmtpMailer(NAVER_ID, NAVER_PWD))
+    summary = dispatcher.run(jobs, on_result, on_sent=lambda job: outbox.mark_sent(job['outbox_id']))
+    reconciler.stop()
+    success_count = summary['sent']
+    print(f"⏱️  발송 소요 {summary['elapsed']}초 (재시도 {summary['retried']}건, 실패 {summary['failed']}건)")
+    print(f"🗂️  시트 반영 {reconciler.synced_count}건, 발송함 상태: {outbox.counts(CAMPAIGN)}")
+    outbox.close()
 
     print(f"\n🎉 [리마인드] 작업 완료! 총 {success_count}건 발송.")
 
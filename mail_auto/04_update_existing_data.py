@@ -1,15 +1,25 @@
+import hashlib
+import json
 import os
 import sys
+import threading
 import time
+from collections import Counter
 import pandas as pd
 import gspread
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from gspread.exceptions import APIError
 
 # --- [설정 영역] ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.dirname(BASE_DIR)
+sys.path.append(PARENT_DIR)  # 공용 모듈(quota_governor_module)
+from quota_governor_module import RateGovernor
+from student_job_module import StudentJobRunner
+from student_index_module import StudentIndex
+from sheet_snapshot_module import load_snapshot, normalize_student_id
+
 CLIENT_SECRET_FILE = os.path.join(BASE_DIR, 'client_secret.json')
 TOKEN_FILE = os.path.join(BASE_DIR, 'token.json')
 
@@ -20,6 +30,10 @@ SHEET_PAPER = "논문"
 SHEET_BOOK = "저서"
 SHEET_CONF = "학술대회"
 
+# 동시 처리 / 변경 기록
+WORKERS = 6
+MANIFEST_FILE = os.path.join(BASE_DIR, '04_update_existing_data.manifest.json')  # 학생/탭별 마지막으로 쓴 내용의 해시
+
 SCOPES = [
     'https://www.googleapis.com/auth/drive',
     'https://www.googleapis.com/auth/spreadsheets'
@@ -123,126 +137,186 @@ def smart_resize_columns(worksheet, df):
             print(f"      (서식 적용 중 경고: {e})")
 
 
-# --- [탭 업데이트 함수] ---
-def update_tab_safe(sheet_obj, title, df_data):
-    max_retries = 3
-    retry_delay = 30 
+# --- [변경 기록(manifest)] 학생/탭별 행 해시를 로컬 파일에 저장 ---
+class RefreshManifest:
+    """
+    마지막으로 개인 시트에 쓴 내용의 해시 기록입니다.
 
-    for attempt in range(max_retries):
-        try:
-            # 1. 시트 초기화 및 데이터 쓰기
-            try:
-                ws = sheet_obj.worksheet(title)
-                ws.clear() 
-            except gspread.WorksheetNotFound:
-                ws = sheet_obj.add_worksheet(title=title, rows=100, cols=20)
-            
-            if df_data.empty:
-                data = [df_data.columns.tolist()]
-            else:
-                data = [df_data.columns.tolist()] + df_data.values.tolist()
-            
-            # 데이터 입력
-            ws.update(range_name='A1', values=data)
-            
-            # 2. 스마트 너비 조절 적용
-            if not df_data.empty:
-                smart_resize_columns(ws, df_data)
-            
-            return True
-
-        except APIError as e:
-            if '429' in str(e):
-                print(f"\n      ⚠️ [API 과부하] {retry_delay}초 대기 후 재시도... ({attempt+1}/{max_retries})")
-                time.sleep(retry_delay)
-                retry_delay *= 2 
-            else:
-                raise e 
-        except Exception as e:
-            raise e 
+    {학번: {"link": 시트 링크, "intro": 안내 탭 이름, "tabs": {탭: {"cols": 열 수, "rows": [행 해시, ...]}}}}
+    학생 한 명이 끝날 때마다 임시 파일에 쓰고 교체하므로 중간에 멈춰도 파일이 깨지지 않습니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.entries = json.load(f)
 
-    raise Exception(f"API 한도 초과로 '{title}' 탭 업데이트 실패")
+    def get(self, student_id, link):
+        """기록이 있고 같은 시트(링크)일 때만 돌려줍니다."""
+        entry = self.entries.get(student_id)
+        return entry if entry and entry.get("link") == link else None
+
+    def save(self, student_id, entry):
+        with self._lock:
+            self.entries[student_id] = entry
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+def tab_rows(df_data):
+    """헤더 + 데이터 행 (빈 값은 ""로, JSON으로 보낼 수 있는 값만)"""
+    values = df_data.astype(object).where(pd.notna(df_data), "").values.tolist()
+    return [df_data.columns.tolist()] + values
+
+def row_hash(row):
+    return hashlib.sha1(json.dumps(row, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()
+
+def tab_state(rows):
+    return {"cols": max(len(r) for r in rows), "rows": [row_hash(r) for r in rows]}
+
+def diff_ranges(title, old, rows):
+    """
+    이전 기록과 달라진 행만 연속 구간으로 묶어 values_batch_update용 data를 만듭니다.
+    줄어든 행/열은 빈 문자열로 덮어써서 지웁니다. (ws.clear 없이)
+
+    Returns:
+        list: [{"range": "'탭'!A행", "values": [...]}, ...] (바뀐 게 없으면 빈 목록)
+    """
+    new_hashes = [row_hash(r) for r in rows]
+    width = max(old["cols"], max(len(r) for r in rows))
+    total = max(len(rows), len(old["rows"]))
+    changed = [i for i in range(total)
+               if i >= len(rows) or i >= len(old["rows"]) or old["rows"][i] != new_hashes[i]]
+    data, block = [], []
+    for i in changed + [None]:
+        if block and (i is None or i != block[-1] + 1):
+            values = [(rows[j] if j < len(rows) else []) + [""] * (width - (len(rows[j]) if j < len(rows) else 0))
+                      for j in block]
+            data.append({"range": f"'{title}'!A{block[0] + 1}", "values": values})
+            block = []
+        if i is not None:
+            block.append(i)
+    return data
 
 # --- [학생 1명 전체 처리] ---
-def process_student(gc, target_url, df_paper, df_book, df_conf, student_id):
-    try:
-        sh = gc.open_by_url(target_url)
-    except Exception as e:
-        print(f"      ❌ 시트 접속 불가: {e}")
-        return False
+# 429 대기/재시도는 RateGovernor가 요청 단위로 처리합니다. (한도를 다 쓰면 APIError가 그대로 올라감)
+def full_refresh(gc, target_url, tabs):
+    """
+    기록이 없는 학생: 세 탭 값을 한 번에 지우고(values_batch_clear) 한 번에 씁니다. 너비/서식도 다시 맞춥니다.
+
+    Returns:
+        dict: manifest에 저장할 기록
+    """
+    sh = gc.open_by_url(target_url)
+    worksheets = {ws.title: ws for ws in sh.worksheets()}
+    for title, df_data in tabs:
+        if title not in worksheets:
+            worksheets[title] = sh.add_worksheet(title=title, rows=100, cols=20)
+    intro = sh.sheet1.title
 
-    my_paper = df_paper[df_paper['학번'] == student_id]
-    my_book = df_book[df_book['학번'] == student_id]
-    my_conf = df_conf[df_conf['학번'] == student_id]
+    all_rows = {title: tab_rows(df_data) for title, df_data in tabs}
+    sh.values_batch_clear(body={"ranges": [f"'{title}'" for title in all_rows]})
+    data = [{"range": f"'{title}'!A1", "values": rows} for title, rows in all_rows.items()]
+    data.append({"range": f"'{intro}'!A6", "values": [[f"✅ 업데이트 완료: {time.strftime('%Y-%m-%d %H:%M:%S')}"]]})
+    sh.values_batch_update({"valueInputOption": "RAW", "data": data})
+
+    for title, df_data in tabs:
+        if not df_data.empty:
+            smart_resize_columns(worksheets[title], df_data)
+
+    return {"link": target_url, "intro": intro,
+            "tabs": {title: tab_state(rows) for title, rows in all_rows.items()}}
+
+def process_student(gc, target_url, index, student_id, manifest):
+    """
+    Returns:
+        str: "unchanged"(API 호출 없음) / "updated"(바뀐 행만 씀) / "rebuilt"(전체 다시 씀), 실패하면 False
+    """
+    tabs = index.tabs(student_id)
+    key = student_id or target_url
+    old = manifest.get(key, target_url)
 
     try:
-        update_tab_safe(sh, "논문", my_paper)
-        time.sleep(2)  # 탭 간 딜레이
-        update_tab_safe(sh, "저서", my_book)
-        time.sleep(2) 
-        update_tab_safe(sh, "학술대회", my_conf)
-        
-        try:
-            intro = sh.sheet1
-            now_str = time.strftime("%Y-%m-%d %H:%M:%S")
-            intro.update_cell(6, 1, f"✅ 업데이트 완료: {now_str}")
-        except: 
-            pass
-        
-        return True
+        if old is None or set(old["tabs"]) != {title for title, _ in tabs}:
+            manifest.save(key, full_refresh(gc, target_url, tabs))
+            return "rebuilt"
+
+        # 바뀐 탭/행만 골라서 values_batch_update 한 번
+        data, resize, states = [], [], {}
+        for title, df_data in tabs:
+            rows = tab_rows(df_data)
+            states[title] = tab_state(rows)
+            if states[title] == old["tabs"][title]:
+                continue
+            data.extend(diff_ranges(title, old["tabs"][title], rows))
+            if states[title]["rows"][0] != old["tabs"][title]["rows"][0] and not df_data.empty:
+                resize.append((title, df_data))  # 헤더가 바뀌면 너비도 다시
+
+        if not data:
+            return "unchanged"
+
+        data.append({"range": f"'{old['intro']}'!A6", "values": [[f"✅ 업데이트 완료: {time.strftime('%Y-%m-%d %H:%M:%S')}"]]})
+        sheet_id = gspread.utils.extract_id_from_url(target_url)
+        gc.http_client.values_batch_update(sheet_id, {"valueInputOption": "RAW", "data": data})
+        if resize:
+            sh = gc.open_by_key(sheet_id)
+            for title, df_data in resize:
+                smart_resize_columns(sh.worksheet(title), df_data)
+
+        manifest.save(key, {**old, "tabs": states})
+        return "updated"
     except Exception as e:
-        print(f"      ❌ 처리 중단: {e}")
+        print(f"      ❌ {student_id} 처리 중단: {e}")
         return False
 
 def main():
-    print("🚀 [스마트 너비 조절] 데이터 입력 + WRAP 모드 + 자동 너비 계산")
+    print("🚀 [변경분 갱신] 바뀐 행만 입력 + WRAP 모드 + 자동 너비 계산")
     
     creds = get_credentials()
     gc = gspread.authorize(creds)
+    # 시트 읽기/쓰기 속도 조절 + 429 자동 재시도 (고정 sleep 대신)
+    governor = RateGovernor()
+    governor.attach_gspread(gc)
     print("✅ 인증 완료")
 
     try:
-        master_doc = gc.open_by_url(SPREADSHEET_URL)
-        df_list = pd.DataFrame(master_doc.worksheet(SHEET_STUDENT_LIST).get_all_records())
-        df_paper = pd.DataFrame(master_doc.worksheet(SHEET_PAPER).get_all_records())
-        df_book = pd.DataFrame(master_doc.worksheet(SHEET_BOOK).get_all_records())
-        df_conf = pd.DataFrame(master_doc.worksheet(SHEET_CONF).get_all_records())
-        
-        for df in [df_list, df_paper, df_book, df_conf]:
-            df.columns = [c.strip() for c in df.columns]
-            if '학번' in df.columns: 
-                df['학번'] = df['학번'].astype(str).str.strip()
-            if 'Student_No' in df.columns: 
-                df['Student_No'] = df['Student_No'].astype(str).str.strip()
+        # 명단 + 성과 탭을 values_batch_get 한 번으로 (헤더/학번 정규화, 변경 없으면 로컬 캐시)
+        frames, snapshot = load_snapshot(gc, SPREADSHEET_URL, (SHEET_STUDENT_LIST, SHEET_PAPER, SHEET_BOOK, SHEET_CONF))
+        df_list = frames[SHEET_STUDENT_LIST]
+        # 성과 탭은 학생별로 한 번에 나눠 둠
+        index = StudentIndex({tab: frames[tab] for tab in (SHEET_PAPER, SHEET_BOOK, SHEET_CONF)})
+        print(f"📊 데이터 로드: {snapshot.describe()}")
             
     except Exception as e:
         print(f"❌ 데이터 로드 실패: {e}")
         return
 
-    total_target = sum(1 for _, r in df_list.iterrows() if str(r.get('개별시트링크', '')).startswith('http'))
-    update_count = 0
-    
-    print(f"📋 총 {total_target}명의 시트를 최신화합니다.\n")
-
-    for idx, row in df_list.iterrows():
+    jobs = []
+    for _, row in df_list.iterrows():
         name = str(row.get('Name_2', '')).strip()
-        student_id = str(row.get('Student_No', '')).strip()
+        student_id = normalize_student_id(row.get('Student_No', ''))
         link = str(row.get('개별시트링크', '')).strip()
+        if link.startswith('http'):
+            jobs.append({"key": student_id or link, "label": name, "student_id": student_id, "link": link})
 
-        if not link.startswith('http'):
-            continue
+    print(f"📋 총 {len(jobs)}명의 시트를 확인합니다. (바뀐 학생/행만 씀, 동시 {WORKERS}명씩)\n")
 
-        print(f"🔄 [{update_count + 1}/{total_target}] {name} ...", end=" ", flush=True)
-        
-        if process_student(gc, link, df_paper, df_book, df_conf, student_id):
-            print("성공 ✅")
-            update_count += 1
-            time.sleep(1.5) 
-        else:
-            print("실패 ❌")
-            time.sleep(5)
+    manifest = RefreshManifest(MANIFEST_FILE)
+
+    def work(job):
+        return process_student(gc, job["link"], index, job["student_id"], manifest)
+
+    # 중단 후 다시 실행하면 manifest 덕분에 끝난 학생은 API 호출 없이 넘어가므로 이어하기 파일은 쓰지 않음
+    runner = StudentJobRunner(workers=WORKERS)
+    summary = runner.run(jobs, work)
+    results = Counter(runner.completed.values())
 
-    print(f"\n🎉 모든 작업이 완료되었습니다. (성공: {update_count}/{total_target})")
+    print(f"\n🎉 모든 작업이 완료되었습니다. (성공: {summary['succeeded']}/{len(jobs)}, {summary['elapsed']}초)")
+    print(f"   변경 없음 {results['unchanged']}명 / 부분 갱신 {results['updated']}명 / 전체 작성 {results['rebuilt']}명 / 실패 {summary['failed']}명")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+import gspread
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+
+# --- [모듈 경로 설정] ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT_DIR = os.path.dirname(BASE_DIR)
+sys.path.append(PARENT_DIR)  # app.py와 같은 검사 모듈 사용
+from submission_journal_module import find_duplicate_rows
+from submission_validation_module import validate_tabs
+
+# --- [설정 영역] ---
+CLIENT_SECRET_FILE = os.path.join(BASE_DIR, 'client_secret.json')
+TOKEN_FILE = os.path.join(BASE_DIR, 'token.json')
+
+SPREADSHEET_URL = "https://docs.google.com/spreadsheets/d/1nfE8lcFRsUfYkdV-tjpsZfFPWER0YeNR2TaxYLH32JY/edit?usp=sharing"
+TAB_NAMES = ["논문", "저서", "학술대회"]
+
+SCOPES = [
+    'https://www.googleapis.com/auth/drive',
+    'https://www.googleapis.com/auth/spreadsheets'
+]
+
+# --- [인증 함수] ---
+def get_credentials():
+    creds = None
+    if os.path.exists(TOKEN_FILE):
+        creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
+    if not creds or not creds.valid:
+        if creds and creds.expired and creds.refresh_token:
+            creds.refresh(Request())
+        else:
+            flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRET_FILE, SCOPES)
+            creds = flow.run_local_server(port=0)
+        with open(TOKEN_FILE, 'w') as token:
+            token.write(creds.to_json())
+    return creds
+
+def main():
+    print("🔍 [마스터 시트 점검] 논문/저서/학술대회 전체 행 검사를 시작합니다...")
+
+    creds = get_credentials()
+    gc = gspread.authorize(creds)
+
+    try:
+        master_doc = gc.open_by_url(SPREADSHEET_URL)
+        rows_by_tab = {title: master_doc.worksheet(title).get_all_values()[1:] for title in TAB_NAMES}
+    except Exception as e:
+        print(f"❌ 데이터 로드 실패: {e}")
+        return
+
+    total_rows = sum(len(rows) for rows in rows_by_tab.values())
+
+    # 1. 값 검사 (ISSN 검사자리, DOI, 페이지, 날짜, 기여율, 필수값)
+    start = time.perf_counter()
+    results = validate_tabs(rows_by_tab)
+    duplicates = {title: find_duplicate_rows(rows) for title, rows in rows_by_tab.items()}
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    error_count = 0
+    for title, errors in results.items():
+        print(f"\n📄 [{title}] 오류 {len(errors)}행")
+        for row_idx in sorted(errors):
+            row = rows_by_tab[title][row_idx]
+            name = row[1] if len(row) > 1 else ""
+            student_id = row[2] if len(row) > 2 else ""
+            # 시트 행 번호 = 인덱스 + 2 (헤더가 1행)
+            print(f"   - {row_idx + 2}행 {name}({student_id}): {', '.join(errors[row_idx])}")
+        error_count += len(errors)
+
+    # 2. 중복 제출 검사 (제출 시각만 다르고 내용이 같은 행)
+    dup_count = 0
+    for title, groups in duplicates.items():
+        for row_nums in groups:
+            print(f"   ⚠️ [{title}] 중복 의심 행: {', '.join(map(str, row_nums))}")
+            dup_count += len(row_nums) - 1
+
+    print(f"\n🎉 점검 완료: 총 {total_rows}행 / 오류 {error_count}행 / 중복 {dup_count}행 ({elapsed_ms:.1f}ms)")
+
+if __name__ == "__main__":
+    main()
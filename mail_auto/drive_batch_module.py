@@ -0,0 +1,149 @@
+from googleapiclient.errors import HttpError
+from httplib2 import HttpLib2Error
+from quota_governor_module import DRIVE_REQUESTS_PER_MINUTE, QuotaGovernor, is_rate_limited_response
+
+# 배치 설정 (모듈 내부 상수)
+MAX_BATCH_SIZE = 100  # 드라이브 배치 요청 하나에 넣을 수 있는 최대 하위 요청 수
+MAX_ROUNDS = 5        # 실패한 하위 요청만 모아 다시 보내는 최대 횟수 (첫 전송 포함)
+
+
+def is_retryable_error(e):
+    """다시 보내면 성공할 수 있는 오류(사용량 한도 초과, 서버 오류, 네트워크 오류)인지 판별합니다."""
+    if isinstance(e, (HttpLib2Error, OSError)):
+        return True
+    if isinstance(e, HttpError) and e.resp is not None:
+        return e.resp.status >= 500 or is_rate_limited_response(e.resp, e.content)
+    return False
+
+
+def retry_after_header(errors):
+    """오류들의 Retry-After(초) 중 가장 긴 값 (없으면 None)"""
+    values = []
+    for e in errors:
+        resp = getattr(e, 'resp', None)
+        try:
+            values.append(float(resp.get('retry-after')))
+        except (AttributeError, TypeError, ValueError):
+            continue
+    return max(values) if values else None
+
+
+class DriveBatch:
+    """
+    드라이브 요청들을 배치 엔드포인트로 묶어 보내는 도구입니다.
+
+    add()로 실행하지 않은 요청(service.files().create(...) 등)을 키와 함께 모아 두었다가 execute()에서
+    최대 100개씩 HTTP 요청 한 번으로 보냅니다. 응답은 키로 다시 짝지어 돌려주고, 한도 초과/서버 오류로
+    실패한 하위 요청만 골라 governor의 백오프만큼 기다린 뒤 다시 보냅니다. 배치 요청 자체가 실패하면
+    (네트워크 오류 등) 그 배치의 하위 요청이 모두 같은 오류로 실패한 것으로 보고 같은 규칙을 따릅니다.
+
+    create/copy(POST)는 서버 오류 응답을 받았어도 실제로는 만들어졌을 수 있어 그대로 다시 보내면 중복이 생깁니다.
+    그래서 POST 요청은 add()에 준 lookup으로 이미 있는지 먼저 확인하고, 있으면 그 결과를 쓰고 없을 때만 다시 보냅니다.
+    (lookup이 없는 POST 요청은 다시 보내지 않고 오류로 남김)
+    드라이브는 하위 요청도 하나씩 사용량으로 세므로 보내기 전에 하위 요청 수만큼 governor 허가를 받습니다.
+    (RateGovernor.attach_google_service는 배치 엔드포인트 요청을 따로 세지 않음)
+
+    Args:
+        service: 드라이브 v3 서비스 (httplib2는 스레드 간 공유 불가 -> 메인 스레드에서 사용)
+        governor (QuotaGovernor): 드라이브 속도 조절기 (None이면 새로 만듦)
+        max_batch_size (int): 배치 하나의 최대 하위 요청 수
+        max_rounds (int): 최대 전송 횟수
+    """
+
+    def __init__(self, service, governor=None, max_batch_size=MAX_BATCH_SIZE, max_rounds=MAX_ROUNDS):
+        self.service = service
+        self.governor = governor or QuotaGovernor(DRIVE_REQUESTS_PER_MINUTE)
+        self.max_batch_size = max_batch_size
+        self.max_rounds = max_rounds
+        self._requests = {}
+        self.http_calls = 0
+
+    def add(self, key, request, lookup=None):
+        """
+        Args:
+            key (str): 응답을 짝지을 키 (예: 학번, 폴더 이름) - 배치 안에서 고유해야 함
+            request: execute()하지 않은 googleapiclient 요청 객체
+            lookup (callable): 재시도 전에 호출해 이미 만들어진 결과(dict)를 찾는 함수 (없으면 None 반환)
+        """
+        self._requests[key] = (request, lookup)
+
+    def __len__(self):
+        return len(self._requests)
+
+    def _send(self, keys, results, errors):
+        """하위 요청 최대 max_batch_size개를 HTTP 요청 한 번으로 보냅니다."""
+        def callback(request_id, response, exception):
+            key = keys[int(request_id)]
+            if exception is None:
+                results[key] = response
+                errors.pop(key, None)
+            else:
+                errors[key] = exception
+
+        batch = self.service.new_batch_http_request(callback=callback)
+        for i, key in enumerate(keys):
+            self.governor.acquire()
+            batch.add(self._requests[key][0], request_id=str(i))
+        try:
+            batch.execute()
+        except (HttpError, HttpLib2Error, OSError) as e:
+            # 배치 요청 자체가 실패 -> 응답을 받지 못한 하위 요청은 모두 이 오류로 (재시도 여부는 execute()에서)
+            for key in keys:
+                if key not in results:
+                    errors[key] = e
+        self.http_calls += 1
+
+    def _recover(self, keys, results, errors):
+        """
+        다시 보낼 요청을 고릅니다. POST 요청은 lookup으로 이미 만들어졌는지 확인해 있으면 결과로 넣습니다.
+
+        Returns:
+            list: 다시 보낼 키
+        """
+        resend = []
+        for key in keys:
+            request, lookup = self._requests[key]
+            if request.method != "POST":
+                resend.append(key)
+                continue
+            if lookup is None:
+                continue
+            try:
+                existing = lookup()
+            except (HttpError, HttpLib2Error, OSError):
+                continue  # 확인하지 못하면 중복을 피하려고 다시 보내지 않음
+            if existing:
+                results[key] = existing
+                errors.pop(key, None)
+            else:
+                resend.append(key)
+        return resend
+
+    def execute(self):
+        """
+        모아 둔 요청을 모두 보냅니다.
+
+        Returns:
+            tuple: ({키: 응답 dict}, {키: 마지막 오류}) - 모든 시도 후에도 실패한 요청만 오류에 남음
+        """
+        results, errors = {}, {}
+        pending = list(self._requests)
+        for attempt in range(1, self.max_rounds + 1):
+            for start in range(0, len(pending), self.max_batch_size):
+                self._send(pending[start:start + self.max_batch_size], results, errors)
+
+            failed = [key for key in pending if key in errors and is_retryable_error(errors[key])]
+            if not failed:
+                self.governor.report_success()
+                break
+            if attempt == self.max_rounds:
+                break
+            # 다음 전송(과 lookup)의 governor.acquire()가 이 시간만큼 기다림
+            delay = self.governor.report_quota_error(retry_after=retry_after_header(errors[key] for key in failed))
+            pending = self._recover(failed, results, errors)
+            if not pending:
+                break
+            print(f"   ⏳ 드라이브 배치 하위 요청 {len(pending)}건 재시도 ({delay:.1f}초 후, {attempt}/{self.max_rounds})")
+
+        self._requests = {}
+        return results, errors
@@ -0,0 +1,103 @@
+import threading
+from googleapiclient.errors import HttpError
+
+FOLDER_MIME = 'application/vnd.google-apps.folder'
+PAGE_SIZE = 1000                    # files().list 한 페이지 최대 크기
+ANYONE_PERMISSION_ID = 'anyoneWithLink'  # '링크가 있는 모든 사용자' 권한의 고정 ID
+
+
+def find_folder_id(service, folder_name, parent_id=None):
+    """이름으로 폴더 하나를 찾습니다. (실행 초기에 상위 폴더를 찾을 때만 사용)"""
+    query = f"mimeType='{FOLDER_MIME}' and name='{folder_name}' and trashed=false"
+    if parent_id:
+        query += f" and '{parent_id}' in parents"
+    results = service.files().list(q=query, fields="files(id, name)").execute()
+    files = results.get('files', [])
+    return files[0]['id'] if files else None
+
+
+def find_file_id(service, file_name, parent_id):
+    """폴더 안에서 이름으로 파일 하나를 찾습니다. (배치 재시도 전에 이미 만들어졌는지 확인할 때 사용)"""
+    query = f"name='{file_name}' and '{parent_id}' in parents and trashed=false"
+    results = service.files().list(q=query, fields="files(id)").execute()
+    files = results.get('files', [])
+    return files[0]['id'] if files else None
+
+
+def find_public_permission(service, file_id):
+    """'링크가 있는 모든 사용자' 권한이 있으면 그 권한(dict)을, 없으면 None을 돌려줍니다."""
+    try:
+        return service.permissions().get(fileId=file_id, permissionId=ANYONE_PERMISSION_ID, fields='id').execute()
+    except HttpError as e:
+        if e.resp.status == 404:
+            return None
+        raise
+
+
+def list_child_folders(service, parent_id):
+    """
+    parent_id 바로 아래의 폴더를 페이지를 넘겨 가며 모두 돌려줍니다. (오래된 것부터)
+
+    Yields:
+        dict: {"id", "name", "permissionIds"}
+    """
+    query = f"mimeType='{FOLDER_MIME}' and '{parent_id}' in parents and trashed=false"
+    page_token = None
+    while True:
+        results = service.files().list(
+            q=query, pageSize=PAGE_SIZE, pageToken=page_token, orderBy='createdTime',
+            fields="nextPageToken, files(id, name, permissionIds)",
+        ).execute()
+        yield from results.get('files', [])
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            return
+
+
+class DriveFolderIndex:
+    """
+    한 폴더 아래 하위 폴더들의 이름 -> ID 색인입니다.
+
+    만들 때 하위 폴더 목록을 페이지 단위로 한 번 읽어 두고, 이후 학생별 조회는 API 호출 없이 dict에서 찾습니다.
+    폴더 생성/공개 설정은 DriveBatch가 하고, 그 결과를 add/mark_public으로 바로 색인에 반영합니다.
+    (같은 이름이 여럿이면 가장 먼저 만든 폴더를 씀)
+
+    Args:
+        service: 드라이브 v3 서비스 (목록 조회용)
+        parent_id (str): 색인할 상위 폴더 ID
+    """
+
+    def __init__(self, service, parent_id):
+        self.parent_id = parent_id
+        self._lock = threading.Lock()
+        self._folders = {}
+        for folder in list_child_folders(service, parent_id):
+            self._folders.setdefault(folder['name'], {
+                "id": folder['id'],
+                "public": ANYONE_PERMISSION_ID in folder.get('permissionIds', []),
+            })
+
+    def __len__(self):
+        return len(self._folders)
+
+    def __contains__(self, name):
+        return name in self._folders
+
+    def get(self, name):
+        """폴더 ID (없으면 None)"""
+        folder = self._folders.get(name)
+        return folder["id"] if folder else None
+
+    def is_public(self, name):
+        folder = self._folders.get(name)
+        return bool(folder and folder["public"])
+
+    def mark_public(self, name):
+        with self._lock:
+            if name in self._folders:
+                self._folders[name]["public"] = True
+
+    def add(self, name, folder_id):
+        """다른 경로(배치 요청 등)로 만든 폴더를 색인에 넣습니다."""
+        with self._lock:
+            self._folders.setdefault(name, {"id": folder_id, "public": False})
@@ -0,0 +1,125 @@
+import os
+import random
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from quota_governor_module import TokenBucket
+
+# 발송 설정 (모듈 내부 상수)
+DEFAULT_WORKERS = 4          # 동시에 열어 두는 SMTP 연결 수
+# 전체 발송 속도 상한 (분당 통수). 환경 변수 MAIL_MESSAGES_PER_MINUTE로 바꿀 수 있습니다.
+# 네이버 SMTP는 분당 발송 한도를 따로 공개하지 않습니다. (고객센터 안내는 하루 발송 수/수신자 수 제한뿐)
+# 그래서 기본값은 연결 4개가 쉬지 않고 보낼 수 있는 정도(연결당 분당 약 30통 = 예전 순차 발송 속도)로 두고,
+# 대량 발송 차단(421/550 응답)이 보이면 환경 변수로 낮춥니다.
+MESSAGES_PER_MINUTE = int(os.getenv("MAIL_MESSAGES_PER_MINUTE", "120"))
+MAX_ATTEMPTS = 3             # 메일 한 통당 최대 시도 횟수
+RETRY_BASE_DELAY = 2.0       # 첫 재시도 대기(초), 시도마다 2배
+
+
+def is_permanent_error(e):
+    """다시 보내도 소용없는 오류(수신자 거부, 로그인 실패)인지 판별합니다."""
+    return isinstance(e, (smtplib.SMTPRecipientsRefused, smtplib.SMTPAuthenticationError))
+
+
+class MailDispatcher:
+    """
+    정해진 수의 작업 스레드로 메일을 동시에 보내는 발송기입니다.
+
+    스레드마다 자기 SmtpMailer(로그인된 연결)를 하나씩 쓰고, 모든 스레드가 하나의 토큰 버킷을
+    함께 써서 전체 발송 속도가 분당 per_minute통을 넘지 않습니다. 일시적인 실패는 지수 백오프로
+    다시 시도하고, 결과 콜백은 메인 스레드에서 호출되므로 시트 기록 등은 그 안에서 하면 됩니다.
+
+    Args:
+        mailer_factory (callable): 인자 없이 호출하면 새 SmtpMailer를 돌려주는 함수
+        workers (int): 동시 발송 스레드 수
+        per_minute (int): 분당 최대 발송 수 (기본: MAIL_MESSAGES_PER_MINUTE 환경 변수 또는 120)
+        max_attempts (int): 메일 한 통당 최대 시도 횟수
+        base_delay (float): 첫 재시도 대기(초)
+    """
+
+    def __init__(self, mailer_factory, workers=DEFAULT_WORKERS, per_minute=MESSAGES_PER_MINUTE,
+                 max_attempts=MAX_ATTEMPTS, base_delay=RETRY_BASE_DELAY):
+        self._mailer_factory = mailer_factory
+        self.workers = workers
+        self.per_minute = per_minute
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        # 처음부터 한꺼번에 몰리지 않도록 버킷 크기는 스레드 수만큼만
+        self._bucket = TokenBucket(per_minute, capacity=workers)
+        self._local = threading.local()
+        self._mailers = []
+        self._lock = threading.Lock()
+
+    def _mailer(self):
+        mailer = getattr(self._local, "mailer", None)
+        if mailer is None:
+            mailer = self._mailer_factory()
+            self._local.mailer = mailer
+            with self._lock:
+                self._mailers.append(mailer)
+        return mailer
+
+    def _wait_for_slot(self):
+        while True:
+            wait = self._bucket.try_acquire()
+            if wait == 0:
+                return
+            time.sleep(wait)
+
+    def _send(self, job, on_sent):
+        mailer = self._mailer()
+        for attempt in range(1, self.max_attempts + 1):
+            self._wait_for_slot()
+            if mailer.send(job["to"], job["subject"], job["html"]):
+                if on_sent:
+                    on_sent(job)
+                return True, attempt
+            job["error"] = mailer.last_error
+            if is_permanent_error(mailer.last_error) or attempt == self.max_attempts:
+                return False, attempt
+            time.sleep(self.base_delay * 2 ** (attempt - 1) + random.uniform(0, self.base_delay))
+
+    def run(self, jobs, on_result=None, on_sent=None):
+        """
+        메일들을 보냅니다.
+
+        Args:
+            jobs (list): [{"to": 주소, "subject": 제목, "html": 본문, "label": 표시 이름, ...}, ...]
+                         (그 밖의 키는 그대로 on_result에 전달됨)
+            on_result (callable): on_result(job, ok) 형태, 한 통이 끝날 때마다 메인 스레드에서 호출
+                                  (실패한 job에는 마지막 오류가 job["error"]로 들어 있음)
+            on_sent (callable): on_sent(job) 형태, 전송 성공 직후 작업 스레드에서 호출
+                                (발송함 기록처럼 늦으면 안 되는 가벼운 처리용)
+
+        Returns:
+            dict: {"sent": 성공 수, "failed": 실패 수, "retried": 재시도한 메일 수, "elapsed": 걸린 시간(초)}
+        """
+        summary = {"sent": 0, "failed": 0, "retried": 0, "elapsed": 0.0}
+        if not jobs:
+            return summary
+
+        print(f"   📨 동시 연결 {self.workers}개 · 분당 최대 {self.per_minute}통으로 발송")
+        start = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                futures = {pool.submit(self._send, job, on_sent): job for job in jobs}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    job = futures[future]
+                    ok, attempts = future.result()
+                    summary["sent" if ok else "failed"] += 1
+                    if attempts > 1:
+                        summary["retried"] += 1
+
+                    if on_result:
+                        on_result(job, ok)
+                    elapsed = time.monotonic() - start
+                    rate = done / elapsed * 60 if elapsed > 0 else 0.0
+                    print(f"   📈 {done}/{len(jobs)} 처리 · 분당 {rate:.1f}통 · 실패 {summary['failed']}건")
+        finally:
+            for mailer in self._mailers:
+                mailer.close()
+            self._mailers = []
+
+        summary["elapsed"] = round(time.monotonic() - start, 1)
+        return summary
@@ -0,0 +1,315 @@
+import datetime
+import json
+import sqlite3
+import threading
+
+# 아웃박스 설정 (모듈 내부 상수)
+RECONCILE_INTERVAL = 2.0  # 초 단위, 이 주기마다 발송 완료 건을 시트에 반영
+
+
+def _now_str():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class MailOutbox:
+    """
+    보낼 메일을 로컬 디스크에 먼저 쌓아 두는 발송함입니다. (SQLite WAL 모드)
+
+    메일마다 queued -> sending -> sent / failed 상태를 기록하고, 보낸 메일은
+    sent_ledger(캠페인, 학번)에 같은 트랜잭션으로 남깁니다. 시트의 '발송여부'는
+    나중에(비동기로) 맞춰 주므로, 발송과 시트 기록 사이에 프로그램이 죽어도
+    다시 실행했을 때 같은 학생에게 두 번 보내지 않고 멈춘 곳부터 이어서 보냅니다.
+
+    발송 여부의 기준은 시트가 아니라 이 발송 장부입니다. 시트의 '발송여부'를 지워도 장부에 기록이
+    있으면 보내지 않으므로, 일부러 다시 보내려면 reset()으로 장부를 비워야 합니다.
+    (00_reset_project.py가 모든 캠페인을, `--outbox 캠페인`으로 실행하면 그 캠페인만 비움)
+
+    Args:
+        path (str): SQLite 파일 경로
+    """
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._enqueued = {}  # {캠페인: 이번 실행에서 enqueue()한 학번 집합} -> claim() 대상
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                campaign TEXT NOT NULL,
+                student_id TEXT NOT NULL,
+                to_email TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                html TEXT NOT NULL,
+                meta_json TEXT NOT NULL DEFAULT '{}',
+                state TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                sheet_synced INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                UNIQUE (campaign, student_id)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_state ON outbox (campaign, state, id)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sent_ledger (
+                campaign TEXT NOT NULL,
+                student_id TEXT NOT NULL,
+                to_email TEXT NOT NULL,
+                sent_at TEXT NOT NULL,
+                PRIMARY KEY (campaign, student_id)
+            )
+        """)
+
+    # --- [초기화] ---
+    def reset(self, campaign=None, student_ids=None):
+        """
+        발송함과 발송 장부의 기록을 지웁니다. 지운 학생은 다음 실행에서 다시 발송 대상이 됩니다.
+
+        Args:
+            campaign (str): 지울 캠페인 (None이면 모든 캠페인)
+            student_ids (list): 지울 학번 목록 (None이면 캠페인 전체)
+
+        Returns:
+            int: 지운 발송 장부 건수
+        """
+        where, params = [], []
+        if campaign is not None:
+            where.append("campaign = ?")
+            params.append(campaign)
+        if student_ids is not None:
+            student_ids = list(student_ids)
+            if not student_ids:
+                return 0
+            where.append(f"student_id IN ({','.join('?' * len(student_ids))})")
+            params.extend(student_ids)
+        clause = " WHERE " + " AND ".join(where) if where else ""
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                cur.execute("DELETE FROM outbox" + clause, params)
+                removed = cur.execute("DELETE FROM sent_ledger" + clause, params).rowcount
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+        return removed
+
+    # --- [적재 / 복구] ---
+    def enqueue(self, campaign, student_id, to_email, subject, html, meta=None):
+        """
+        메일 한 통을 발송함에 넣습니다. 이미 보낸 학생이면 넣지 않습니다.
+        아직 보내지 않은 건은 최신 제목/본문으로 바꿔 두고, 이번 실행의 발송 대상으로 기록합니다.
+
+        Args:
+            campaign (str): 캠페인 이름 (예: "check", "remind")
+            student_id (str): 학번 (학번이 없는 명단은 이메일 주소)
+            to_email (str): 받는 사람 이메일 주소
+            subject (str): 메일 제목
+            html (str): 렌더링이 끝난 HTML 본문
+            meta (dict): 시트 반영에 필요한 값 (예: {"row_idx": 5, "label": "홍길동"})
+
+        Returns:
+            bool: 발송 대상으로 넣었으면 True, 이미 보낸 학생이면 False
+        """
+        now_str = _now_str()
+        with self._lock:
+            sent = self._conn.execute(
+                "SELECT 1 FROM sent_ledger WHERE campaign = ? AND student_id = ?", (campaign, student_id)
+            ).fetchone()
+            if sent:
+                return False
+            self._conn.execute(
+                """
+                INSERT INTO outbox (campaign, student_id, to_email, subject, html, meta_json, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (campaign, student_id) DO UPDATE SET
+                    to_email = excluded.to_email, subject = excluded.subject, html = excluded.html,
+                    meta_json = excluded.meta_json, updated_at = excluded.updated_at
+                WHERE outbox.state != 'sent'
+                """,
+                (campaign, student_id, to_email, subject, html,
+                 json.dumps(meta or {}, ensure_ascii=False), now_str, now_str),
+            )
+            self._enqueued.setdefault(campaign, set()).add(student_id)
+            return True
+
+    def recover(self, campaign):
+        """
+        지난 실행에서 'sending'(보내는 도중 중단)과 'failed'로 남은 건을 다시 queued로 돌립니다.
+        이 중 이번 실행에서 다시 enqueue()되지 않은 건(명단에서 빠졌거나 시트에 'Sent'로 표시됨)은 claim()에서 버립니다.
+
+        Returns:
+            int: 다시 대기열에 넣은 건수
+        """
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE outbox SET state = 'queued', updated_at = ? "
+                "WHERE campaign = ? AND state IN ('sending', 'failed')",
+                (_now_str(), campaign),
+            )
+            return cur.rowcount
+
+    # --- [발송 상태] ---
+    def claim(self, campaign):
+        """
+        이번 실행에서 enqueue()한 queued 건을 sending으로 바꾸고 발송 작업 목록으로 돌려줍니다.
+        지난 실행에서 남은 queued 건 중 이번에 다시 enqueue()되지 않은 건은 발송함에서 지웁니다.
+        (이번 명단/시트 기준으로 다시 확인되지 않은 옛 제목/본문을 보내지 않도록)
+
+        Returns:
+            list: [{"outbox_id", "student_id", "to", "subject", "html", **meta}, ...]
+        """
+        now_str = _now_str()
+        with self._lock:
+            student_ids = sorted(self._enqueued.pop(campaign, set()))
+            placeholders = ",".join("?" * len(student_ids))
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                dropped = cur.execute(
+                    f"DELETE FROM outbox WHERE campaign = ? AND state = 'queued' "
+                    f"AND student_id NOT IN ({placeholders})",
+                    [campaign, *student_ids],
+                ).rowcount
+                rows = cur.execute(
+                    "SELECT id, student_id, to_email, subject, html, meta_json FROM outbox "
+                    "WHERE campaign = ? AND state = 'queued' ORDER BY id",
+                    (campaign,),
+                ).fetchall()
+                cur.execute(
+                    "UPDATE outbox SET state = 'sending', attempts = attempts + 1, updated_at = ? "
+                    "WHERE campaign = ? AND state = 'queued'",
+                    (now_str, campaign),
+                )
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+        if dropped:
+            print(f"🧹 [outbox] 이번 명단에서 다시 확인되지 않은 지난 대기 건 {dropped}건은 보내지 않습니다.")
+        return [{**json.loads(meta_json), "outbox_id": outbox_id, "student_id": student_id,
+                 "to": to_email, "subject": subject, "html": html}
+                for outbox_id, student_id, to_email, subject, html, meta_json in rows]
+
+    def mark_sent(self, outbox_id):
+        """SMTP 전송 직후 호출: sent 표시와 발송 장부 기록을 한 트랜잭션으로 남깁니다."""
+        now_str = _now_str()
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                cur.execute(
+                    "UPDATE outbox SET state = 'sent', last_error = NULL, updated_at = ? WHERE id = ?",
+                    (now_str, outbox_id),
+                )
+                cur.execute(
+                    "INSERT OR IGNORE INTO sent_ledger (campaign, student_id, to_email, sent_at) "
+                    "SELECT campaign, student_id, to_email, ? FROM outbox WHERE id = ?",
+                    (now_str, outbox_id),
+                )
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+
+    def mark_failed(self, outbox_id, error=None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET state = 'failed', last_error = ?, updated_at = ? WHERE id = ?",
+                (str(error) if error else None, _now_str(), outbox_id),
+            )
+
+    # --- [시트 반영] ---
+    def unsynced(self, campaign):
+        """
+        보냈지만 아직 시트에 'Sent'를 쓰지 못한 건을 돌려줍니다.
+
+        Returns:
+            list: [{"outbox_id", "student_id", **meta}, ...]
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, student_id, meta_json FROM outbox "
+                "WHERE campaign = ? AND state = 'sent' AND sheet_synced = 0 ORDER BY id",
+                (campaign,),
+            ).fetchall()
+        return [{**json.loads(meta_json), "outbox_id": outbox_id, "student_id": student_id}
+                for outbox_id, student_id, meta_json in rows]
+
+    def mark_synced(self, outbox_ids):
+        if not outbox_ids:
+            return
+        with self._lock:
+            placeholders = ",".join("?" * len(outbox_ids))
+            self._conn.execute(
+                f"UPDATE outbox SET sheet_synced = 1 WHERE id IN ({placeholders})", list(outbox_ids)
+            )
+
+    def counts(self, campaign):
+        """상태별 건수를 돌려줍니다. 예: {"queued": 0, "sent": 120, "failed": 2}"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM outbox WHERE campaign = ? GROUP BY state", (campaign,)
+            ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SheetReconciler:
+    """
+    발송함의 sent 건을 백그라운드에서 시트에 반영하는 스레드입니다.
+    시트 기록이 느려도 발송은 멈추지 않고, 실패한 건은 다음 주기(또는 다음 실행)에 다시 씁니다.
+
+    Args:
+        outbox (MailOutbox): 발송함
+        campaign (str): 캠페인 이름
+        write_func (callable): write_func(entries) 형태, entries의 '발송여부'를 시트에 기록
+        interval (float): 반영 주기(초)
+    """
+
+    def __init__(self, outbox, campaign, write_func, interval=RECONCILE_INTERVAL):
+        self._outbox = outbox
+        self._campaign = campaign
+        self._write_func = write_func
+        self._interval = interval
+        self._stop = threading.Event()
+        self._run_lock = threading.Lock()
+        self.synced_count = 0
+        self._thread = threading.Thread(target=self._run, name="sheet-reconciler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def reconcile(self):
+        """밀린 건을 한 번 반영합니다. 반영에 실패하면 다음 호출에서 다시 시도합니다."""
+        with self._run_lock:
+            entries = self._outbox.unsynced(self._campaign)
+            if not entries:
+                return 0
+            try:
+                self._write_func(entries)
+            except Exception as e:
+                print(f"⚠️ [outbox] 시트 반영 실패, 다음에 재시도 ({len(entries)}건): {e}")
+                return 0
+            self._outbox.mark_synced([entry["outbox_id"] for entry in entries])
+            self.synced_count += len(entries)
+            return len(entries)
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            self.reconcile()
+
+    def stop(self):
+        """스레드를 멈추고 남은 건을 마지막으로 한 번 반영합니다."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.reconcile()
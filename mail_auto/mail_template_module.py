@@ -0,0 +1,98 @@
+import hashlib
+import html
+import os
+import re
+import threading
+import markdown
+
+# 템플릿 설정 (모듈 내부 상수)
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+SLOT_PATTERN = re.compile(r"\{\{\s*([^{}\s]+)\s*\}\}")  # {{이름}}, {{링크}} ...
+
+# 3번 스크립트가 마크다운 본문을 감싸던 기본 서식
+DEFAULT_WRAPPER = """
+<div style="font-family: 'Apple SD Gothic Neo', 'Malgun Gothic', sans-serif; font-size: 11pt; line-height: 1.6; color: #333;">
+    {{본문}}
+</div>
+"""
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class CompiledTemplate:
+    """
+    HTML 변환까지 끝난 템플릿입니다. 고정 문장과 치환 칸({{이름}} 등)을 나눠 두었다가
+    render()에서 칸만 채워 이어 붙이므로, 수신자마다 마크다운 변환을 하지 않습니다.
+
+    Args:
+        html_text (str): 치환 칸이 남아 있는 완성 HTML
+        digest (str): 원본 파일 sha256 (캐시 키)
+    """
+
+    def __init__(self, html_text, digest):
+        self.digest = digest
+        # split 결과: [고정, 칸 이름, 고정, 칸 이름, ..., 고정]
+        self._parts = SLOT_PATTERN.split(html_text)
+        self.slots = sorted(set(self._parts[1::2]))
+
+    def render(self, **values):
+        """
+        치환 칸을 채운 HTML을 돌려줍니다. 값은 HTML 이스케이프됩니다.
+
+        Args:
+            **values: 칸 이름 -> 값 (예: 이름="홍길동", 링크="https://...")
+
+        Returns:
+            str: 완성된 메일 본문 HTML
+        """
+        missing = [slot for slot in self.slots if slot not in values]
+        if missing:
+            raise KeyError(f"템플릿 치환 값이 없습니다: {', '.join(missing)}")
+        escaped = {slot: html.escape(str(values[slot])) for slot in self.slots}
+        parts = self._parts[:]
+        parts[1::2] = [escaped[slot] for slot in parts[1::2]]
+        return "".join(parts)
+
+
+def _compile(text, is_markdown, strip_title, extensions, wrapper):
+    if is_markdown:
+        lines = text.splitlines(keepends=True)
+        # 제목 중복 방지: 첫 줄이 '#'으로 시작하면 제목으로 간주하고 제거
+        if strip_title and lines and lines[0].strip().startswith('#'):
+            text = "".join(lines[1:])
+        text = markdown.markdown(text, extensions=list(extensions))
+    if wrapper:
+        text = wrapper.replace("{{본문}}", text)
+    return text
+
+
+def load_template(name, strip_title=False, extensions=(), wrapper=None, template_dir=TEMPLATE_DIR):
+    """
+    templates 폴더의 템플릿을 컴파일해서 돌려줍니다. (.md는 HTML로 변환, .html은 그대로)
+    같은 내용(sha256)과 옵션이면 이미 컴파일한 결과를 재사용합니다.
+
+    Args:
+        name (str): 템플릿 파일 이름 (예: "email_content.md", "check_general.html")
+        strip_title (bool): 마크다운 첫 줄의 '# 제목'을 뺄지 여부
+        extensions (tuple): markdown 확장 (예: ("nl2br",))
+        wrapper (str): 변환 결과를 감쌀 HTML, 본문 자리는 {{본문}}
+        template_dir (str): 템플릿 폴더
+
+    Returns:
+        CompiledTemplate: render(**values)로 수신자별 본문을 만드는 템플릿
+    """
+    path = os.path.join(template_dir, name)
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    key = (digest, name.lower().endswith(".md"), strip_title, tuple(extensions), wrapper)
+
+    with _cache_lock:
+        template = _cache.get(key)
+    if template is None:
+        html_text = _compile(raw.decode('utf-8'), *key[1:])
+        template = CompiledTemplate(html_text, digest)
+        with _cache_lock:
+            _cache[key] = template
+    return template
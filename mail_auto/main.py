@@ -1,6 +1,6 @@
 import os
-import markdown
 import base64
+import sys
 import gspread  # 구글 시트 제어 라이브러리
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -13,12 +13,19 @@ from googleapiclient.discovery import build
 # 1. 파일 경로 설정 (상대 경로 활용)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # mail_auto 폴더
 PARENT_DIR = os.path.dirname(BASE_DIR)                 # app 폴더
+sys.path.append(BASE_DIR)
+sys.path.append(PARENT_DIR)  # 공용 모듈(sheet_write_buffer_module 등)
+from mail_template_module import load_template
+from mail_outbox_module import MailOutbox, SheetReconciler
+from sheet_write_buffer_module import SheetWriteBuffer
 
 # 인증 키 경로
 SHEET_KEY_PATH = os.path.join(PARENT_DIR, 'service_account.json') # 상위 폴더
 GMAIL_KEY_PATH = os.path.join(BASE_DIR, 'credentials.json')       # 현재 폴더
 GMAIL_TOKEN_PATH = os.path.join(BASE_DIR, 'token.json')           # 자동 생성됨
-MD_FILE_PATH = os.path.join(BASE_DIR, 'email_content.md')         # 메일 본문
+TEMPLATE_NAME = 'email_content.md'                                # 메일 본문 (templates 폴더)
+OUTBOX_PATH = os.path.join(BASE_DIR, 'mail_outbox.db')            # 발송함 (자동 생성됨)
+CAMPAIGN = "main"
 
 # 2. 구글 시트 설정
 SPREADSHEET_URL = "https://docs.google.com/spreadsheets/d/1nfE8lcFRsUfYkdV-tjpsZfFPWER0YeNR2TaxYLH32JY/edit?usp=sharing"  # <--- 수정 필요
@@ -70,12 +77,11 @@ def send_email(service, to_email, subject, html_content):
 def main():
     print("🚀 메일 자동화 프로그램을 시작합니다...")
 
-    # 1. 마크다운 파일 읽기
+    # 1. 템플릿 컴파일 (마크다운 -> HTML 변환은 여기서 한 번만)
     try:
-        with open(MD_FILE_PATH, 'r', encoding='utf-8') as f:
-            md_text = f.read()
+        template = load_template(TEMPLATE_NAME)
     except FileNotFoundError:
-        print("⚠️ email_content.md 파일이 없습니다.")
+        print(f"⚠️ templates/{TEMPLATE_NAME} 파일이 없습니다.")
         return
 
     # 2. 구글 시트 연결
@@ -96,11 +102,15 @@ def main():
     print("📧 Gmail API 인증 중...")
     gmail_service = get_gmail_service()
 
-    # 4. 발송 루프 시작
-    success_count = 0
+    # 4. 발송 대상 적재 (로컬 발송함, 중단 후 재실행하면 남은 건부터 이어서 발송)
+    outbox = MailOutbox(OUTBOX_PATH)
+    outbox.recover(CAMPAIGN)
     
     # 헤더 위치 찾기 (행 번호 계산을 위해 필요, 1행은 헤더이므로 데이터는 2행부터 시작)
     # gspread는 1-based index 사용
+    header_keys = list(records[0].keys()) if records else []
+    sent_col = header_keys.index('발송여부') + 1 if '발송여부' in header_keys else None
+    row_by_key = {}  # 발송 장부 키 -> 이번 실행에서 읽은 시트 행 번호 ('Sent' 기록용)
     
     for i, row in enumerate(records):
         row_num = i + 2  # 실제 시트상의 행 번호 (헤더가 1행이므로)
@@ -108,6 +118,9 @@ def main():
         name = row.get('Name_2')  # 시트의 '이름' 컬럼
         email = row.get('E-mail') # 시트의 '이메일' 컬럼
         status = row.get('발송여부') # 시트의 '발송여부' 컬럼
+        # 발송 장부 키: 학번 열이 없으면 이메일
+        student_key = str(row.get('학번', '')).strip() or str(email)
+        row_by_key.setdefault(student_key, row_num)
 
         # 필수 정보 체크
         if not email or not name:
@@ -118,24 +131,47 @@ def main():
             print(f"⏭️  [Skip] {name}님은 이미 발송 완료.")
             continue
 
-        print(f"📩 발송 시도: {name} ({email}) ...", end=" ")
-
-        # 마크다운 -> HTML 변환 (치환 기능 포함)
-        # {{이름}}을 실제 이름으로 변경
-        personalized_md = md_text.replace("{{이름}}", str(name))
-        html_content = markdown.markdown(personalized_md)
+        # {{이름}} 칸만 실제 이름으로 채움
+        html_content = template.render(이름=name)
 
         # 메일 제목 설정
         subject = f"[안내] {name}님, 요청하신 자료입니다."
 
+        if not outbox.enqueue(CAMPAIGN, student_key, email, subject, html_content,
+                              meta={"name": name}):
+            print(f"⏭️  [Skip] {name}님은 발송 장부에 이미 발송 기록이 있습니다. (다시 보내려면 00_reset_project.py --outbox)")
+
+    # 5. 발송 (시트 'Sent' 기록은 백그라운드에서)
+    sheet_buffer = SheetWriteBuffer(doc)
+
+    def write_sent(entries):
+        if sent_col is None:
+            return
+        # 이번 주기에 보낸 건들의 'Sent'를 한 번의 batch 요청으로 기록
+        # 행 번호는 이번 실행에서 읽은 시트에서 학번(또는 이메일)으로 다시 찾음 (그사이 행이 바뀌어도 안전)
+        for entry in entries:
+            row_num = row_by_key.get(entry['student_id'])
+            if row_num is None:
+                print(f"⚠️ [outbox] {entry['student_id']}이(가) '{SHEET_NAME}'에 없어 '발송여부'를 쓰지 않습니다.")
+                continue
+            sheet_buffer.update_cell(worksheet, row_num, sent_col, 'Sent')
+        sheet_buffer.flush()
+
+    reconciler = SheetReconciler(outbox, CAMPAIGN, write_sent).start()
+    success_count = 0
+    for job in outbox.claim(CAMPAIGN):
+        print(f"📩 발송 시도: {job['name']} ({job['to']}) ...", end=" ")
+
         # 전송
-        if send_email(gmail_service, email, subject, html_content):
+        if send_email(gmail_service, job['to'], job['subject'], job['html']):
+            outbox.mark_sent(job['outbox_id'])
             print("성공! ✅")
-            # 시트에 'Sent' 기록
-            worksheet.update_cell(row_num, list(row.keys()).index('발송여부') + 1, 'Sent')
             success_count += 1
         else:
+            outbox.mark_failed(job['outbox_id'])
             print("실패 ❌")
+    reconciler.stop()
+    outbox.close()
 
     print(f"\n🎉 작업 완료! 총 {success_count}건의 메일을 새로 발송했습니다.")
 
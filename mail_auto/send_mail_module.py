@@ -1,49 +1,161 @@
 import smtplib
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 # 네이버 SMTP 설정 (모듈 내부 상수)
 SMTP_SERVER = "smtp.naver.com"
 SMTP_PORT = 465
+MAX_MESSAGES_PER_CONNECTION = 50  # 이 수만큼 보내면 연결을 새로 맺음 (서버의 세션당 제한 대비)
+MAX_IDLE_SECONDS = 60             # 이보다 오래 쉬었으면 끊긴 것으로 보고 새로 연결
+
+
+def build_message(user_id, to_email, subject, html_content):
+    """보낼 메일 객체(MIMEMultipart)를 만듭니다."""
+    msg = MIMEMultipart()
+    msg['From'] = f"{user_id}@naver.com"
+    msg['To'] = to_email
+    msg['Subject'] = subject
+    msg.attach(MIMEText(html_content, 'html'))
+    return msg
+
+
+def is_stale_connection_error(e):
+    """연결이 끊겨서 다시 연결하면 해결되는 오류인지 판별합니다."""
+    if isinstance(e, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(e, smtplib.SMTPResponseException) and e.smtp_code == 421:
+        return True  # 서버가 세션을 닫는 중
+    if isinstance(e, smtplib.SMTPAuthenticationError):
+        return False
+    return isinstance(e, (ConnectionError, TimeoutError))
+
+
+class SmtpMailer:
+    """
+    로그인된 SMTP 연결을 여러 메일에 걸쳐 재사용하는 메일 발송기입니다.
+
+    메일마다 SSL 핸드셰이크 + 로그인을 반복하지 않고 한 연결로 계속 보냅니다.
+    연결이 끊겼다는 오류가 나면 새로 연결해서 한 번 더 보내고, max_messages통을 보낸
+    연결은 닫고 새로 맺습니다. with 문으로 쓰면 끝날 때 연결을 닫습니다.
+
+    Args:
+        user_id (str): 네이버 아이디 (앞부분만)
+        user_pwd (str): 애플리케이션 비밀번호
+        max_messages (int): 연결 하나로 보낼 최대 메일 수
+        max_idle (float): 이 시간(초) 이상 쉬었던 연결은 새로 맺음
+    """
+
+    def __init__(self, user_id, user_pwd, max_messages=MAX_MESSAGES_PER_CONNECTION, max_idle=MAX_IDLE_SECONDS):
+        self.user_id = user_id
+        self.user_pwd = user_pwd
+        self.max_messages = max_messages
+        self.max_idle = max_idle
+
+        self._server = None
+        self._sent_on_connection = 0
+        self._last_used = 0.0
+
+        self.last_error = None  # 마지막 전송 실패 원인 (재시도 여부 판단용)
+
+        # 통계
+        self.sent_count = 0
+        self.connect_count = 0
+        self.reconnect_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _connect(self):
+        self.close()
+        # SMTP 서버 연결 (SSL 보안 연결)
+        server = smtplib.SMTP_SSL(SMTP_SERVER, SMTP_PORT)
+        server.login(self.user_id, self.user_pwd)
+        self._server = server
+        self._sent_on_connection = 0
+        self.connect_count += 1
+
+    def _ensure_connection(self):
+        idle = time.monotonic() - self._last_used
+        if (self._server is None or self._sent_on_connection >= self.max_messages
+                or idle > self.max_idle):
+            self._connect()
+
+    def close(self):
+        """연결을 닫습니다. (이미 끊긴 연결이면 조용히 정리)"""
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            pass
+        self._server = None
+
+    def _send_once(self, msg):
+        self._ensure_connection()
+        self._server.send_message(msg)
+        self._sent_on_connection += 1
+        self._last_used = time.monotonic()
+
+    def send(self, to_email, subject, html_content):
+        """
+        메일 한 통을 보냅니다. 연결이 끊겨 있으면 다시 연결해서 한 번 더 시도합니다.
+
+        Args:
+            to_email (str): 받는 사람 이메일 주소
+            subject (str): 메일 제목
+            html_content (str): HTML 형식의 메일 본문
+
+        Returns:
+            bool: 전송 성공 시 True, 실패 시 False
+        """
+        msg = build_message(self.user_id, to_email, subject, html_content)
+        self.last_error = None
+        try:
+            try:
+                self._send_once(msg)
+            except Exception as e:
+                if not is_stale_connection_error(e):
+                    raise
+                self._server = None
+                self.reconnect_count += 1
+                self._send_once(msg)
+            self.sent_count += 1
+            return True
+
+        except Exception as e:
+            print(f"❌ [mailer.py] 전송 오류 ({to_email}): {e}")
+            self.last_error = e
+            # 수신자 거부는 연결과 무관하므로 유지, 그 밖에는 상태를 알 수 없는 연결이라 버림
+            if not isinstance(e, smtplib.SMTPRecipientsRefused):
+                self.close()
+            return False
+
+    def stats(self):
+        return {"sent": self.sent_count, "connections": self.connect_count, "reconnects": self.reconnect_count}
+
 
 def send_email(user_id, user_pwd, to_email, subject, html_content):
     """
-    네이버 SMTP를 통해 이메일을 전송하는 함수입니다.
-    
+    네이버 SMTP를 통해 이메일 한 통을 전송하는 함수입니다.
+    여러 통을 보낼 때는 연결을 재사용하는 SmtpMailer를 쓰세요.
+
     Args:
         user_id (str): 네이버 아이디 (앞부분만)
         user_pwd (str): 애플리케이션 비밀번호
         to_email (str): 받는 사람 이메일 주소
         subject (str): 메일 제목
         html_content (str): HTML 형식의 메일 본문
-        
+
     Returns:
         bool: 전송 성공 시 True, 실패 시 False
     """
-    
-    # 메일 객체 생성
-    msg = MIMEMultipart()
-    msg['From'] = f"{user_id}@naver.com"
-    msg['To'] = to_email
-    msg['Subject'] = subject
-
-    # 본문 추가
-    msg.attach(MIMEText(html_content, 'html'))
-
-    try:
-        # SMTP 서버 연결 (SSL 보안 연결)
-        server = smtplib.SMTP_SSL(SMTP_SERVER, SMTP_PORT)
-        server.login(user_id, user_pwd)
-        
-        # 메일 전송
-        server.send_message(msg)
-        server.quit()
-        return True
-        
-    except Exception as e:
-        print(f"❌ [mailer.py] 전송 오류 ({to_email}): {e}")
-        return False
+    with SmtpMailer(user_id, user_pwd, max_messages=1) as mailer:
+        return mailer.send(to_email, subject, html_content)
 
 # 테스트용 코드 (이 파일을 직접 실행했을 때만 작동)
 if __name__ == "__main__":
-    print("이 파일은 모듈입니다. 다른 코드에서 import해서 사용하세요.")
\ No newline at end of file
+    print("이 파일은 모듈입니다. 다른 코드에서 import해서 사용하세요.")
@@ -0,0 +1,64 @@
+from sheet_snapshot_module import normalize_student_id
+
+ID_COLUMN = "학번"
+
+
+class StudentIndex:
+    """
+    성과 탭들을 학번별로 미리 나눠 둔 색인입니다.
+
+    학번은 만들 때 한 번만 정규화하고, 탭마다 groupby 한 번으로 학생별 DataFrame을 만들어 둡니다.
+    학생마다 df[df['학번'] == 학번]으로 탭 전체를 훑던 방식(학생 수 × 행 수)과 달리 조회는 dict 접근입니다.
+    실행마다 한 번 만들어 시트 생성/갱신/메일 스크립트가 같이 씁니다.
+
+    Args:
+        frames (dict): {탭 이름: 탭 전체 DataFrame}
+    """
+
+    def __init__(self, frames):
+        self.frames = {}
+        self._groups = {}
+        self._empty = {}
+        for tab, df in frames.items():
+            df = df.copy()
+            df.columns = [str(c).strip() for c in df.columns]
+            if ID_COLUMN in df.columns:
+                df[ID_COLUMN] = df[ID_COLUMN].map(normalize_student_id)
+                groups = {sid: group for sid, group in df.groupby(ID_COLUMN, sort=False) if sid}
+            else:
+                groups = {}
+            self.frames[tab] = df
+            self._groups[tab] = groups
+            self._empty[tab] = df.iloc[0:0]
+
+    # --- [조회] ---
+    def get(self, student_id, tab):
+        """학생 한 명의 탭 DataFrame (성과가 없으면 열 구성만 같은 빈 DataFrame)"""
+        return self._groups[tab].get(normalize_student_id(student_id), self._empty[tab])
+
+    def tabs(self, student_id):
+        """[(탭 이름, 학생 DataFrame), ...] (frames에 넣은 탭 순서, 개인 시트에 쓰는 모양)"""
+        return [(tab, self.get(student_id, tab)) for tab in self.frames]
+
+    def __contains__(self, student_id):
+        sid = normalize_student_id(student_id)
+        return any(sid in groups for groups in self._groups.values())
+
+    def __len__(self):
+        return len(self.student_ids())
+
+    def student_ids(self):
+        """성과 탭 어디에든 한 번이라도 나온 학번 집합"""
+        return set().union(*(groups.keys() for groups in self._groups.values()))
+
+    def max_rows(self, tab):
+        """한 학생이 해당 탭에 가진 가장 많은 행 수"""
+        return max((len(group) for group in self._groups[tab].values()), default=0)
+
+    def students_where(self, tab, column, value):
+        """탭에서 column 값이 value인 행이 있는 학번 집합 (예: 연구성과유무 'X')"""
+        df = self.frames[tab]
+        if column not in df.columns or ID_COLUMN not in df.columns:
+            return set()
+        matched = df.loc[df[column].astype(str).str.strip() == value, ID_COLUMN]
+        return {sid for sid in matched if sid}
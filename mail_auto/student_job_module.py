@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# 실행 설정 (모듈 내부 상수)
+DEFAULT_WORKERS = 6  # 동시에 처리하는 학생 수 (API 속도는 RateGovernor가 따로 조절)
+
+
+def format_duration(seconds):
+    """초 -> '3분 20초' / '45초'"""
+    seconds = int(round(seconds))
+    minutes, seconds = divmod(seconds, 60)
+    return f"{minutes}분 {seconds}초" if minutes else f"{seconds}초"
+
+
+class StudentJobRunner:
+    """
+    학생별 작업을 정해진 수의 스레드로 동시에 처리하는 실행기입니다.
+
+    학생 한 명의 실패(예외 포함)는 그 학생만 실패로 기록하고 나머지는 계속 진행합니다.
+    진행률/남은 시간은 메인 스레드에서 출력하고, resume_path를 주면 성공한 학생을 한 줄씩
+    기록해 두었다가 다음 실행에서 건너뜁니다. (모든 학생이 성공하면 기록 파일은 지움)
+
+    googleapiclient 서비스(httplib2)는 스레드 간에 공유할 수 없으므로 thread_local()로
+    스레드마다 하나씩 만들어 쓰고, API 한도는 모든 스레드가 같은 RateGovernor를 공유해서 지킵니다.
+
+    Args:
+        workers (int): 동시 처리 스레드 수
+        resume_path (str): 완료 기록 파일 경로 (None이면 이어하기 없음)
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, resume_path=None):
+        self.workers = workers
+        self.resume_path = resume_path
+        self._lock = threading.Lock()
+        self.completed = self._load_completed()
+
+    # --- [이어하기 기록] ---
+    def _load_completed(self):
+        """{학생 키: 작업 결과} (이전 실행에서 성공한 학생)"""
+        completed = {}
+        if not self.resume_path or not os.path.exists(self.resume_path):
+            return completed
+        with open(self.resume_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # 강제 종료로 잘린 마지막 줄
+                completed[record["key"]] = record.get("result")
+        return completed
+
+    def _record_completed(self, key, result):
+        if not self.resume_path:
+            return
+        with open(self.resume_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"key": key, "result": result}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    # --- [스레드별 자원] ---
+    def thread_local(self, factory):
+        """
+        스레드마다 factory()로 한 번만 만들어 재사용하는 자원의 getter를 돌려줍니다.
+
+        Args:
+            factory (callable): 인자 없이 호출하면 새 자원(예: 드라이브 서비스)을 돌려주는 함수
+
+        Returns:
+            callable: 호출한 스레드의 자원을 돌려주는 함수
+        """
+        # getter마다 따로 둠 (id(factory) 같은 키는 factory가 사라진 뒤 재사용될 수 있음)
+        local = threading.local()
+
+        def get():
+            resource = getattr(local, "resource", None)
+            if resource is None:
+                resource = factory()
+                local.resource = resource
+            return resource
+
+        return get
+
+    # --- [실행] ---
+    def _work(self, work, job):
+        try:
+            result = work(job)
+        except Exception as e:
+            job["error"] = e
+            return None
+        if result:
+            with self._lock:
+                self._record_completed(job["key"], result)
+        return result
+
+    def run(self, jobs, work):
+        """
+        학생별 작업을 실행합니다.
+
+        Args:
+            jobs (list): [{"key": 학번 등 고유 키, "label": 표시 이름, ...}, ...]
+            work (callable): work(job) 형태, 작업 스레드에서 호출. 성공하면 참인 값(JSON으로 저장 가능한 값)을,
+                             실패하면 False/None을 돌려줌 (예외는 실패로 처리하고 job["error"]에 담음)
+
+        Returns:
+            dict: {"succeeded": 성공 수, "failed": 실패 수, "skipped": 이어하기로 건너뛴 수,
+                   "failed_jobs": 실패한 job 목록, "elapsed": 걸린 시간(초)}
+        """
+        pending = [job for job in jobs if job["key"] not in self.completed]
+        summary = {"succeeded": 0, "failed": 0, "skipped": len(jobs) - len(pending),
+                   "failed_jobs": [], "elapsed": 0.0}
+        if summary["skipped"]:
+            print(f"⏭️ 이전 실행에서 완료된 {summary['skipped']}명은 건너뜁니다.")
+        if not pending:
+            return summary
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._work, work, job): job for job in pending}
+            for done, future in enumerate(as_completed(futures), start=1):
+                job = futures[future]
+                result = future.result()
+                if result:
+                    summary["succeeded"] += 1
+                    self.completed[job["key"]] = result
+                    mark = "✅"
+                else:
+                    summary["failed"] += 1
+                    summary["failed_jobs"].append(job)
+                    mark = f"❌ {job['error']}" if job.get("error") else "❌"
+
+                elapsed = time.monotonic() - start
+                eta = elapsed / done * (len(pending) - done)
+                print(f"   📈 [{done}/{len(pending)}] {job.get('label', job['key'])} {mark} "
+                      f"· 경과 {format_duration(elapsed)} · 남은 시간 약 {format_duration(eta)}")
+
+        summary["elapsed"] = round(time.monotonic() - start, 1)
+        if not summary["failed"] and self.resume_path and os.path.exists(self.resume_path):
+            os.remove(self.resume_path)  # 전부 끝났으면 다음 실행은 처음부터
+        return summary
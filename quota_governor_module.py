@@ -0,0 +1,258 @@
+import random
+import threading
+import time
+from gspread.exceptions import APIError
+
+# 구글 API 기본 한도 (사용자당 분당 요청 수)
+SHEETS_WRITES_PER_MINUTE = 60
+SHEETS_READS_PER_MINUTE = 60
+DRIVE_REQUESTS_PER_MINUTE = 600  # 실제 한도(분당 12,000)보다 훨씬 낮게
+MAX_ATTEMPTS = 8                 # 429를 받았을 때 같은 요청의 최대 시도 횟수
+BACKOFF_BASE = 1.0   # 첫 재시도 대기(초), 연속 실패마다 2배
+BACKOFF_MAX = 64.0   # 재시도 대기 상한(초)
+BATCH_PATH = "/batch/"  # googleapiclient 배치 엔드포인트 경로 (예: /batch/drive/v3)
+
+
+def is_quota_error(e):
+    """사용량 한도 초과(429)인지 판별합니다."""
+    return isinstance(e, APIError) and getattr(e.response, "status_code", None) == 429
+
+
+def _seconds(value):
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after_seconds(e):
+    """429 응답의 Retry-After 헤더(초)를 돌려줍니다. 없거나 읽을 수 없으면 None."""
+    response = getattr(e, "response", None)
+    return _seconds(response.headers.get("Retry-After") if response is not None else None)
+
+
+def is_rate_limited_response(resp, content):
+    """googleapiclient(httplib2) 응답이 사용량 한도 초과인지 판별합니다. (드라이브는 403 + rateLimitExceeded도 씀)"""
+    if resp.status == 429:
+        return True
+    if resp.status == 403:
+        text = content.decode("utf-8", "ignore") if isinstance(content, bytes) else str(content)
+        return "rateLimitExceeded" in text or "userRateLimitExceeded" in text
+    return False
+
+
+class TokenBucket:
+    """
+    분당 한도에 맞춘 토큰 버킷입니다. 토큰은 일정한 속도로 다시 채워지고
+    capacity까지만 쌓이므로, 순간적으로 몰려도 한도를 넘는 요청은 기다리게 됩니다.
+
+    Args:
+        per_minute (int): 분당 허용 요청 수
+        capacity (int): 한 번에 몰아 쓸 수 있는 최대 토큰 수 (기본: per_minute)
+    """
+
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        """
+        토큰을 하나 가져갑니다.
+
+        Returns:
+            float: 성공하면 0, 아니면 다음 토큰까지 남은 시간(초)
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+
+class QuotaGovernor:
+    """
+    한 프로세스의 시트 쓰기를 함께 조절하는 할당량 관리자입니다.
+
+    모든 쓰기는 acquire()로 토큰을 받은 뒤에만 나가고, 429를 받으면 report_quota_error()가
+    Retry-After(없으면 지수 백오프 + 지터)만큼 전체 쓰기를 멈춥니다. 그래서 한도가 찼을 때
+    여러 곳에서 동시에 재시도해 한도를 더 깎아 먹는 일이 생기지 않습니다.
+
+    Args:
+        per_minute (int): 분당 허용 쓰기 수
+        base_delay (float): 첫 재시도 대기(초)
+        max_delay (float): 재시도 대기 상한(초)
+    """
+
+    def __init__(self, per_minute=SHEETS_WRITES_PER_MINUTE, base_delay=BACKOFF_BASE, max_delay=BACKOFF_MAX):
+        self._bucket = TokenBucket(per_minute)
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+        self._failures = 0
+
+        # 통계
+        self.acquired_count = 0
+        self.quota_errors = 0
+        self.waited_seconds = 0.0
+
+    def wait_time(self):
+        """백오프로 멈춰 있는 남은 시간(초)을 돌려줍니다."""
+        with self._lock:
+            return max(0.0, self._blocked_until - time.monotonic())
+
+    def acquire(self, timeout=None):
+        """
+        쓰기 1회분 허가를 받을 때까지 기다립니다.
+
+        Args:
+            timeout (float): 최대 대기 시간(초), None이면 무기한
+
+        Returns:
+            bool: 허가를 받았으면 True, timeout 안에 못 받았으면 False
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.wait_time() or self._bucket.try_acquire()
+            if wait == 0:
+                with self._lock:
+                    self.acquired_count += 1
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
+            with self._lock:
+                self.waited_seconds += wait
+
+    def report_success(self):
+        with self._lock:
+            self._failures = 0
+
+    def report_quota_error(self, e=None, retry_after=None):
+        """
+        429를 기록하고 전체 쓰기를 잠시 멈춥니다.
+
+        Args:
+            e (Exception): gspread APIError (Retry-After 헤더를 읽음)
+            retry_after (float): 응답에서 직접 읽은 Retry-After(초), e보다 우선
+
+        Returns:
+            float: 다음 시도까지 대기 시간(초)
+        """
+        with self._lock:
+            self._failures += 1
+            self.quota_errors += 1
+            delay = retry_after if retry_after is not None else (retry_after_seconds(e) if e is not None else None)
+            if delay is None:
+                backoff = min(self._max_delay, self._base_delay * 2 ** (self._failures - 1))
+                delay = backoff / 2 + random.uniform(0, backoff / 2)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            return delay
+
+    def stats(self):
+        with self._lock:
+            return {
+                "acquired": self.acquired_count,
+                "quota_errors": self.quota_errors,
+                "waited_seconds": round(self.waited_seconds, 2),
+                "blocked_for": round(max(0.0, self._blocked_until - time.monotonic()), 2),
+            }
+
+
+class RateGovernor:
+    """
+    배치 스크립트용 구글 API 속도 관리자입니다. 시트 읽기 / 시트 쓰기 / 드라이브 요청을
+    각각의 QuotaGovernor(토큰 버킷 + 백오프)로 따로 조절합니다.
+
+    attach_gspread() / attach_google_service()로 클라이언트의 HTTP 요청 함수를 감싸면,
+    모든 요청이 자기 종류의 허가를 받은 뒤에 나가고 429(드라이브는 403 rateLimitExceeded 포함)를
+    받으면 Retry-After 또는 지터가 섞인 지수 백오프만큼 기다렸다가 같은 요청을 다시 보냅니다.
+    그래서 스크립트에는 고정 sleep이나 429 처리 코드가 필요 없습니다.
+
+    Args:
+        sheets_read (int): 분당 시트 읽기 수
+        sheets_write (int): 분당 시트 쓰기 수
+        drive (int): 분당 드라이브 요청 수
+        max_attempts (int): 요청 하나의 최대 시도 횟수
+    """
+
+    def __init__(self, sheets_read=SHEETS_READS_PER_MINUTE, sheets_write=SHEETS_WRITES_PER_MINUTE,
+                 drive=DRIVE_REQUESTS_PER_MINUTE, max_attempts=MAX_ATTEMPTS):
+        self.governors = {
+            "sheets_read": QuotaGovernor(sheets_read),
+            "sheets_write": QuotaGovernor(sheets_write),
+            "drive": QuotaGovernor(drive),
+        }
+        self.max_attempts = max_attempts
+
+    @staticmethod
+    def classify_gspread(method, endpoint):
+        """gspread 요청의 종류: 드라이브 API / 시트 읽기(GET) / 시트 쓰기"""
+        if "googleapis.com/drive" in endpoint:
+            return "drive"
+        return "sheets_read" if method.lower() == "get" else "sheets_write"
+
+    def _wait_notice(self, kind, delay, attempt):
+        print(f"\n   ⏳ [{kind}] 사용량 한도 초과, {delay:.1f}초 후 재시도 ({attempt}/{self.max_attempts})")
+
+    def attach_gspread(self, gc):
+        """gspread Client의 모든 요청을 종류별 버킷으로 조절하고 429면 자동 재시도합니다."""
+        http_client = gc.http_client
+        original = http_client.request
+
+        def governed(method, endpoint, *args, **kwargs):
+            kind = self.classify_gspread(method, endpoint)
+            governor = self.governors[kind]
+            for attempt in range(1, self.max_attempts + 1):
+                governor.acquire()
+                try:
+                    response = original(method, endpoint, *args, **kwargs)
+                except APIError as e:
+                    if not is_quota_error(e) or attempt == self.max_attempts:
+                        raise
+                    self._wait_notice(kind, governor.report_quota_error(e), attempt)
+                    continue
+                governor.report_success()
+                return response
+
+        http_client.request = governed
+        return gc
+
+    def attach_google_service(self, service, kind="drive"):
+        """
+        googleapiclient 서비스의 모든 요청을 한 버킷으로 조절하고 한도 초과면 자동 재시도합니다.
+        배치 엔드포인트 요청은 그대로 보냅니다. (DriveBatch가 하위 요청 수만큼 허가를 받고 재시도도 직접 함)
+        """
+        http = service._http
+        original = http.request
+        governor = self.governors[kind]
+
+        def governed(uri, *args, **kwargs):
+            if BATCH_PATH in uri:
+                return original(uri, *args, **kwargs)
+            for attempt in range(1, self.max_attempts + 1):
+                governor.acquire()
+                resp, content = original(uri, *args, **kwargs)
+                if not is_rate_limited_response(resp, content) or attempt == self.max_attempts:
+                    if resp.status < 400:
+                        governor.report_success()
+                    return resp, content
+                delay = governor.report_quota_error(retry_after=_seconds(resp.get("retry-after")))
+                self._wait_notice(kind, delay, attempt)
+
+        http.request = governed
+        return service
+
+    def stats(self):
+        return {kind: governor.stats() for kind, governor in self.governors.items()}
@@ -0,0 +1,411 @@
+import csv
+import datetime
+import io
+import re
+import pandas as pd
+import streamlit as st
+from item_editor_module import (PAPER_TYPE_CODES, ROLE_OPTIONS, SCI_OPTIONS, TYPE_OPTIONS,
+                                get_journal_index, is_blank_item, new_item)
+from journal_index_module import normalize_title, to_form_values
+
+# --- [형식별 성과 구분 매핑] ---
+BIBTEX_TYPES = {"article": "논문", "book": "저서", "inbook": "저서", "incollection": "저서",
+                "inproceedings": "학술대회 발표", "conference": "학술대회 발표"}
+RIS_TYPES = {"JOUR": "논문", "EJOUR": "논문", "BOOK": "저서", "CHAP": "저서", "EBOOK": "저서",
+             "CONF": "학술대회 발표", "CPAPER": "학술대회 발표"}
+
+# CSV 헤더 -> 공통 필드명 (한글 양식 라벨 / 영문 내보내기 헤더 모두 허용)
+CSV_ALIASES = {
+    "성과구분": "type", "구분": "type", "type": "type",
+    "학술지명": "journal", "출판사": "journal", "학술대회명": "journal", "journal": "journal", "publisher": "journal",
+    "논문명": "title", "저서명": "title", "발표 제목": "title", "제목": "title", "title": "title",
+    "issn": "issn", "isbn": "isbn", "doi": "doi",
+    "주저자명": "first_author", "주저자명(제1저자)": "first_author", "저자": "authors", "author": "authors", "authors": "authors",
+    "공동저자명": "co_authors",
+    "볼륨번호": "volume", "볼륨번호, 권(호)": "volume", "권(호)": "volume", "volume": "volume", "호": "issue", "issue": "issue",
+    "시작 페이지": "page_start", "시작페이지": "page_start", "끝 페이지": "page_end", "끝페이지": "page_end", "pages": "pages",
+    "임팩트팩터": "impact", "임팩트팩터(if)": "impact",
+    "학술지 출판일자": "date", "출판일자": "date", "일자": "date", "date": "date", "year": "year",
+    "개최 장소": "address", "address": "address",
+    "논문구분": "type_code", "sci구분": "sci", "sci(e)구분": "sci",
+    "기여율": "contrib", "기여율(%)": "contrib", "참여역할": "role", "참여 역할": "role",
+    "비고": "note",
+}
+
+# 일괄 입력 표의 열 (표 열 이름 -> 항목 필드)
+TABLE_COLUMNS = ["구분", "제목", "학술지/출판사/학술대회명", "ISSN/ISBN", "DOI", "주저자", "공동저자",
+                 "권(호)", "시작페이지", "끝페이지", "일자", "논문구분", "SCI구분", "기여율(%)", "IF",
+                 "참여역할", "비고"]
+
+
+# --- [파서] ---
+def _split_authors(value):
+    if not value:
+        return []
+    parts = re.split(r"\s+and\s+|;", value)
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _parse_date(year="", month="", day="", text=""):
+    # "2025-05-01", "2025/05", "20250501", "2025" 등 부분 날짜도 허용
+    if text:
+        digits = re.findall(r"\d+", text)
+        if len(digits) == 1 and len(digits[0]) == 8:
+            year, month, day = digits[0][:4], digits[0][4:6], digits[0][6:]
+        elif digits:
+            year = digits[0]
+            month = digits[1] if len(digits) > 1 else ""
+            day = digits[2] if len(digits) > 2 else ""
+    try:
+        return datetime.date(int(year), int(month or 1), int(day or 1))
+    except (TypeError, ValueError):
+        return None
+
+
+MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1)}
+
+
+def parse_bibtex(text):
+    """
+    BibTeX 문자열을 공통 레코드(dict) 목록으로 바꿉니다.
+
+    Returns:
+        list: [{"type": "논문", "title": ..., "journal": ..., ...}, ...]
+    """
+    records = []
+    for match in re.finditer(r"@(\w+)\s*\{", text):
+        entry_type = match.group(1).lower()
+        if entry_type not in BIBTEX_TYPES:
+            continue
+
+        # 괄호 짝을 맞춰 항목 본문 추출
+        depth, pos = 1, match.end()
+        while pos < len(text) and depth:
+            if text[pos] == "{": depth += 1
+            elif text[pos] == "}": depth -= 1
+            pos += 1
+        body = text[match.end():pos - 1]
+
+        fields = {}
+        for field in re.finditer(r"(\w+)\s*=\s*(\{(?:[^{}]|\{[^{}]*\})*\}|\"[^\"]*\"|\w+)", body):
+            value = field.group(2).strip()
+            if value[0] in "{\"":
+                value = value[1:-1]
+            fields[field.group(1).lower()] = re.sub(r"[{}]", "", value).strip()
+
+        month = fields.get("month", "").lower()[:3]
+        month = str(MONTHS.get(month, month)) if month else ""
+        records.append({
+            "type": BIBTEX_TYPES[entry_type],
+            "title": fields.get("title", ""),
+            "journal": fields.get("journal") or fields.get("booktitle") or fields.get("publisher", ""),
+            "issn": fields.get("issn", ""),
+            "isbn": fields.get("isbn", ""),
+            "doi": fields.get("doi", ""),
+            "authors": _split_authors(fields.get("author", "")),
+            "volume": fields.get("volume", ""),
+            "issue": fields.get("number", ""),
+            "pages": fields.get("pages", ""),
+            "date": _parse_date(fields.get("year"), month, fields.get("day", ""), fields.get("date", "")),
+            "address": fields.get("address", ""),
+        })
+    return records
+
+
+def parse_ris(text):
+    """RIS 문자열을 공통 레코드(dict) 목록으로 바꿉니다."""
+    records = []
+    current = None
+    for line in text.splitlines():
+        match = re.match(r"^([A-Z][A-Z0-9])\s{2}-\s?(.*)$", line)
+        if not match:
+            continue
+        tag, value = match.group(1), match.group(2).strip()
+        if tag == "TY":
+            current = {"type": RIS_TYPES.get(value, "논문"), "authors": [], "title": "", "journal": "",
+                       "issn": "", "isbn": "", "doi": "", "volume": "", "issue": "", "pages": "",
+                       "page_start": "", "page_end": "", "date": None, "address": ""}
+        elif current is None:
+            continue
+        elif tag == "ER":
+            records.append(current)
+            current = None
+        elif tag in ("AU", "A1"):
+            current["authors"].append(value)
+        elif tag in ("TI", "T1") and not current["title"]:
+            current["title"] = value
+        elif tag in ("JO", "JF", "T2", "PB") and not current["journal"]:
+            current["journal"] = value
+        elif tag == "SN":
+            # RIS의 SN은 ISSN/ISBN 공용
+            current["isbn" if current["type"] == "저서" else "issn"] = value
+        elif tag == "DO":
+            current["doi"] = value
+        elif tag == "VL":
+            current["volume"] = value
+        elif tag == "IS":
+            current["issue"] = value
+        elif tag == "SP":
+            current["page_start"] = value
+        elif tag == "EP":
+            current["page_end"] = value
+        elif tag in ("PY", "DA", "Y1") and current["date"] is None:
+            current["date"] = _parse_date(text=value)
+        elif tag == "CY":
+            current["address"] = value
+    return records
+
+
+def parse_csv(text):
+    """CSV 문자열(첫 줄 헤더)을 공통 레코드(dict) 목록으로 바꿉니다."""
+    records = []
+    reader = csv.DictReader(io.StringIO(text))
+    for row in reader:
+        record = {"type": "논문", "authors": []}
+        for header, value in row.items():
+            key = CSV_ALIASES.get(str(header).strip().lower()) or CSV_ALIASES.get(str(header).strip())
+            if key and value is not None:
+                record[key] = value.strip()
+        if record.get("authors"):
+            record["authors"] = _split_authors(record["authors"])
+        if record.get("type") not in ("논문", "저서", "학술대회 발표"):
+            record["type"] = "학술대회 발표" if "학술대회" in record.get("type", "") else (
+                "저서" if "저서" in record.get("type", "") else "논문")
+        record["date"] = _parse_date(year=record.get("year", ""), text=record.get("date", ""))
+        records.append(record)
+    return records
+
+
+def parse_upload(filename, data, journal_index=None):
+    """
+    업로드된 파일을 확장자/내용에 맞는 파서로 읽습니다.
+
+    Args:
+        filename (str): 업로드 파일명
+        data (bytes): 파일 내용
+        journal_index (JournalIndex): 있으면 논문의 논문구분/SCI구분/IF를 학술지 정보로 채움
+
+    Returns:
+        list: 성과 항목(dict) 목록 (new_item() 형식)
+    """
+    text = data.decode("utf-8-sig", errors="replace")
+    name = filename.lower()
+    if name.endswith(".bib") or text.lstrip().startswith("@"):
+        records = parse_bibtex(text)
+    elif name.endswith(".ris") or text.lstrip().startswith("TY  -"):
+        records = parse_ris(text)
+    else:
+        records = parse_csv(text)
+    items = [record_to_item(record) for record in records]
+    if journal_index is not None:
+        for item in items:
+            fill_from_journal(item, journal_index)
+    return items
+
+
+def fill_from_journal(item, journal_index):
+    """ISSN(없으면 학술지명 정확 일치)으로 학술지를 찾아 논문구분/SCI구분/IF를 채웁니다."""
+    if item["type"] != "논문":
+        return
+    record = journal_index.lookup_issn(item["p_issn"]) if item["p_issn"] else None
+    if record is None and item["p_journal"]:
+        key = normalize_title(item["p_journal"])
+        record = next((r for r in journal_index.search_prefix(item["p_journal"])
+                       if key in (normalize_title(r["title_ko"]), normalize_title(r["title_en"]))), None)
+    if record is None:
+        return
+    values = to_form_values(record)
+    item["p_sci"] = values["p_sci"]
+    item["p_type_code"] = values.get("p_type_code", item["p_type_code"])
+    if not item["p_impact"]:
+        item["p_impact"] = values["p_impact"]
+
+
+# --- [공통 레코드 -> 성과 항목] ---
+def _option(value, options):
+    """선택지 값이면 그대로, 아니면 "" ("01"처럼 코드만 적힌 값은 해당 선택지로)"""
+    value = str(value or "").strip()
+    if value in options:
+        return value
+    return next((option for option in options if value and f"({value})" in option), "")
+
+
+def record_to_item(record):
+    item = new_item()
+    item["type"] = record.get("type", "논문")
+
+    authors = list(record.get("authors") or [])
+    first_author = record.get("first_author") or (authors[0] if authors else "")
+    co_authors = record.get("co_authors") or "; ".join(a for a in authors if a != first_author)
+
+    volume = record.get("volume", "")
+    if record.get("issue"):
+        volume = f"{volume}({record['issue']})"
+
+    page_start, page_end = record.get("page_start", ""), record.get("page_end", "")
+    if record.get("pages") and not page_start:
+        pages = re.split(r"\s*[-–]+\s*", record["pages"])
+        page_start = pages[0]
+        page_end = pages[1] if len(pages) > 1 else ""
+
+    date = record.get("date") or datetime.date.today()
+
+    if item["type"] == "논문":
+        try:
+            impact = float(record.get("impact") or 0.0)
+        except ValueError:
+            impact = 0.0
+        try:
+            contrib = int(float(record.get("contrib") or 0))
+        except ValueError:
+            contrib = 0
+        item.update({
+            # 파일에 없는 구분 값은 기본값 대신 빈칸으로 두어 제출 전에 직접 고르게 함
+            "p_type_code": _option(record.get("type_code"), PAPER_TYPE_CODES),
+            "p_sci": _option(record.get("sci"), SCI_OPTIONS),
+            "p_journal": record.get("journal", ""), "p_title": record.get("title", ""),
+            "p_issn": record.get("issn", ""), "p_doi": record.get("doi", ""),
+            "p_first_auth": first_author, "p_co_auth": co_authors,
+            "p_vol": volume, "p_page_start": page_start, "p_page_end": page_end,
+            "p_contrib": contrib, "p_impact": impact, "p_date": date,
+        })
+    else:
+        all_authors = authors or [a for a in [first_author] + co_authors.split(";") if a.strip()]
+        item.update({
+            "o_role": _option(record.get("role"), ROLE_OPTIONS.get(item["type"], [])),
+            "o_title": record.get("title", ""), "o_journal": record.get("journal", ""),
+            "o_details": record.get("isbn", "") if item["type"] == "저서" else record.get("address", ""),
+            "o_authors_all": ", ".join(a.strip() for a in all_authors),
+            "o_author_count": max(len(all_authors), 1), "o_date": date,
+        })
+    item["note"] = record.get("note", "")
+    return item
+
+
+# --- [성과 항목 <-> 일괄 입력 표] ---
+def _table_number(value, kind):
+    """표의 숫자 칸 값 (비었거나 NaN이면 0)"""
+    if value is None or pd.isna(value):
+        return kind(0)
+    return kind(value)
+
+
+def items_to_table(items):
+    """성과 항목 목록을 일괄 입력 표(행 dict 목록)로 바꿉니다."""
+    rows = []
+    for item in items:
+        if item["type"] == "논문":
+            rows.append({
+                "구분": item["type"], "제목": item["p_title"], "학술지/출판사/학술대회명": item["p_journal"],
+                "ISSN/ISBN": item["p_issn"], "DOI": item["p_doi"], "주저자": item["p_first_auth"],
+                "공동저자": item["p_co_auth"], "권(호)": item["p_vol"], "시작페이지": item["p_page_start"],
+                "끝페이지": item["p_page_end"], "일자": item["p_date"],
+                "논문구분": item["p_type_code"] or None, "SCI구분": item["p_sci"] or None,
+                "기여율(%)": item["p_contrib"], "IF": item["p_impact"], "참여역할": None, "비고": item["note"],
+            })
+        else:
+            authors = [a.strip() for a in item["o_authors_all"].split(",") if a.strip()]
+            rows.append({
+                "구분": item["type"], "제목": item["o_title"], "학술지/출판사/학술대회명": item["o_journal"],
+                "ISSN/ISBN": item["o_details"], "DOI": "", "주저자": authors[0] if authors else "",
+                "공동저자": "; ".join(authors[1:]), "권(호)": "", "시작페이지": "",
+                "끝페이지": "", "일자": item["o_date"], "논문구분": None, "SCI구분": None,
+                "기여율(%)": None, "IF": None, "참여역할": item["o_role"] or None, "비고": item["note"],
+            })
+    return rows
+
+
+def table_to_items(rows, base_items):
+    """
+    편집된 표를 다시 성과 항목 목록으로 바꿉니다. 표에 없는 필드(연계 교과 등)는 base_items 값을 유지합니다.
+    성과 구분에 맞지 않는 참여역할은 빈칸으로 바꿔 제출 검사에서 걸리게 합니다.
+
+    Args:
+        rows (dict): {표 행 인덱스: 행 dict} (DataFrame.to_dict("index") 결과, 추가된 행 포함)
+        base_items (list): 표를 만들 때 사용한 원래 항목 목록 (인덱스 = 목록 순서)
+    """
+    items = []
+    for i, row in rows.items():
+        # data_editor 인덱스는 numpy 정수일 수 있음 (int가 아니어도 원래 항목과 짝지음)
+        item = base_items[i] if pd.api.types.is_integer(i) and 0 <= i < len(base_items) else new_item()
+        record = {
+            "type": row.get("구분") or "논문",
+            "title": row.get("제목") or "", "journal": row.get("학술지/출판사/학술대회명") or "",
+            "doi": row.get("DOI") or "",
+            "first_author": row.get("주저자") or "", "co_authors": row.get("공동저자") or "",
+            "volume": row.get("권(호)") or "",
+            "page_start": str(row.get("시작페이지") or ""), "page_end": str(row.get("끝페이지") or ""),
+            "type_code": row.get("논문구분") or "", "sci": row.get("SCI구분") or "",
+            "contrib": _table_number(row.get("기여율(%)"), int), "impact": _table_number(row.get("IF"), float),
+            "role": row.get("참여역할") or "",
+            "note": row.get("비고") or "",
+        }
+        record["isbn" if record["type"] == "저서" else "issn"] = row.get("ISSN/ISBN") or ""
+        if record["type"] == "학술대회 발표":
+            record["address"] = row.get("ISSN/ISBN") or ""
+
+        date = row.get("일자")
+        if date is None or pd.isna(date):
+            date = None
+        elif isinstance(date, datetime.datetime):  # pandas Timestamp 포함
+            date = date.date()
+        record["date"] = date if isinstance(date, datetime.date) else _parse_date(text=str(date or ""))
+
+        converted = record_to_item(record)
+        # 표에서 편집하지 않는 값(연계 교과 등)은 원래 항목 값 유지
+        for key in ("class_name", "prof_name"):
+            converted[key] = item.get(key, converted[key])
+        items.append(converted)
+    return items
+
+
+# --- [화면: 일괄 가져오기 + 편집 표] ---
+@st.fragment
+def render_bulk_import():
+    """
+    BibTeX/RIS/CSV 업로드를 받아 st.session_state.imported_items를 채우고,
+    가져온 항목을 항목별 입력창 대신 하나의 편집 표로 보여줍니다.
+    """
+    if "imported_base" not in st.session_state:
+        st.session_state.imported_base = []
+        st.session_state.imported_items = []
+
+    uploaded = st.file_uploader("📥 성과 일괄 가져오기 (BibTeX / RIS / CSV)", type=["bib", "ris", "csv"],
+                                key="bulk_upload")
+    if uploaded is not None and st.session_state.get("bulk_upload_id") != uploaded.file_id:
+        st.session_state.bulk_upload_id = uploaded.file_id
+        st.session_state.imported_base = parse_upload(uploaded.name, uploaded.getvalue(),
+                                                       get_journal_index())
+        st.session_state.imported_items = list(st.session_state.imported_base)
+        st.session_state.pop("bulk_table", None)
+        # 처음 자동으로 만들어진 빈 입력창은 치우고 화면 전체를 다시 그림
+        items = st.session_state.research_items
+        if len(items) == 1 and is_blank_item(items[0]):
+            items.clear()
+        st.rerun()
+
+    base_items = st.session_state.imported_base
+    if not base_items:
+        return
+
+    st.markdown(f"##### 📥 가져온 성과 {len(base_items)}건 (표에서 바로 수정/삭제할 수 있습니다)")
+    st.caption("💡 논문은 논문구분/SCI구분/기여율/IF, 저서·학술대회는 참여역할을 확인해주세요. 빈칸이면 제출되지 않습니다.")
+    table = pd.DataFrame(items_to_table(base_items), columns=TABLE_COLUMNS)
+    edited = st.data_editor(
+        table,
+        key="bulk_table",
+        num_rows="dynamic",
+        width="stretch",
+        column_config={
+            "구분": st.column_config.SelectboxColumn(options=TYPE_OPTIONS, required=True),
+            "일자": st.column_config.DateColumn(format="YYYY-MM-DD"),
+            "논문구분": st.column_config.SelectboxColumn(options=PAPER_TYPE_CODES, help="논문만 입력"),
+            "SCI구분": st.column_config.SelectboxColumn(options=SCI_OPTIONS, help="논문만 입력"),
+            "기여율(%)": st.column_config.NumberColumn(min_value=0, max_value=100, step=1, help="논문만 입력"),
+            "IF": st.column_config.NumberColumn(min_value=0.0, step=0.01, format="%.5f", help="논문만 입력"),
+            "참여역할": st.column_config.SelectboxColumn(
+                options=list(dict.fromkeys(sum(ROLE_OPTIONS.values(), []))), help="저서/학술대회만 입력"),
+        },
+    )
+    st.session_state.imported_items = table_to_items(edited.to_dict("index"), base_items)
@@ -0,0 +1,119 @@
+import datetime
+import threading
+import gspread
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import Request
+from gspread.exceptions import APIError
+
+# 구글 시트 설정 (모듈 내부 상수)
+TAB_NAMES = ("논문", "저서", "학술대회")
+TOKEN_REFRESH_MARGIN = datetime.timedelta(minutes=5)  # 만료 5분 전에 미리 갱신
+
+
+class SheetConnectionError(Exception):
+    """인증 정보를 불러오지 못해 연결을 만들 수 없을 때 냅니다. (화면 표시는 호출한 쪽에서)"""
+
+
+def is_auth_error(e):
+    """인증 만료/거부로 연결을 다시 만들어야 하는 오류인지 판별합니다."""
+    if isinstance(e, RefreshError):
+        return True
+    if isinstance(e, APIError):
+        return e.response.status_code in (401, 403)
+    return False
+
+
+class SheetConnection:
+    """
+    모든 Streamlit 세션이 함께 쓰는 구글 시트 연결(클라이언트 + 탭 핸들) 캐시입니다.
+
+    제출할 때마다 인증/문서 열기/탭 조회를 반복하지 않도록 한 번 만든 핸들을 재사용하고,
+    토큰은 만료 직전에 미리 갱신합니다. 핸들은 WorksheetNotFound 또는 인증 오류가
+    났을 때만 다시 만듭니다.
+
+    연결은 백그라운드 플러셔 스레드에서 만들어질 수도 있으므로 Streamlit 함수(st.error 등)를 부르지 않습니다.
+    인증 정보를 못 읽으면 SheetConnectionError를 내고 last_error에 남기며, 화면 표시는 스크립트 쪽에서 합니다.
+
+    Args:
+        creds_loader (callable): 인자 없이 호출하면 Credentials 객체를 돌려주는 함수
+        sheet_url (str): 제출 데이터를 기록할 스프레드시트 URL
+        tab_names (tuple): 미리 열어둘 탭 이름 목록
+    """
+
+    def __init__(self, creds_loader, sheet_url, tab_names=TAB_NAMES):
+        self._creds_loader = creds_loader
+        self._sheet_url = sheet_url
+        self._tab_names = tab_names
+        self._lock = threading.Lock()
+
+        self._creds = None
+        self._worksheets = None
+
+        # 연결 통계
+        self.reused_count = 0
+        self.rebuilt_count = 0
+        self.last_error = None  # 마지막 연결 실패 메시지 (성공하면 None)
+
+    def _token_expiring(self):
+        if not self._creds.token or self._creds.expiry is None:
+            return True
+        # google-auth의 expiry는 UTC 기준 naive datetime 입니다.
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        return self._creds.expiry - now < TOKEN_REFRESH_MARGIN
+
+    def _rebuild(self):
+        try:
+            creds = self._creds_loader()
+        except Exception as e:
+            self.last_error = f"인증 정보를 불러올 수 없습니다: {e}"
+            raise SheetConnectionError(self.last_error) from e
+        client = gspread.authorize(creds)
+        doc = client.open_by_url(self._sheet_url)
+        worksheets = {title: doc.worksheet(title) for title in self._tab_names}
+
+        self._creds = creds
+        self._worksheets = worksheets
+        self.rebuilt_count += 1
+        self.last_error = None
+        print(f"🔌 [sheet_connection] 시트 연결 생성 (재생성 {self.rebuilt_count}회 / 재사용 {self.reused_count}회)")
+
+    def worksheets(self):
+        """
+        탭 이름 -> Worksheet 핸들 딕셔너리를 돌려줍니다.
+
+        Returns:
+            dict: {"논문": Worksheet, "저서": Worksheet, "학술대회": Worksheet}
+        """
+        with self._lock:
+            if self._worksheets is None:
+                self._rebuild()
+            else:
+                if self._token_expiring():
+                    # gspread 세션이 같은 Credentials 객체를 쓰므로 제자리 갱신으로 충분합니다.
+                    self._creds.refresh(Request())
+                self.reused_count += 1
+            return self._worksheets
+
+    def invalidate(self):
+        """캐시된 핸들을 버립니다. 다음 호출에서 새로 연결합니다."""
+        with self._lock:
+            self._creds = None
+            self._worksheets = None
+
+    def run(self, func):
+        """
+        func(worksheets)를 실행합니다. 탭을 못 찾거나 인증 오류가 나면
+        핸들을 다시 만들어 한 번만 재시도합니다.
+        """
+        try:
+            return func(self.worksheets())
+        except Exception as e:
+            if not (isinstance(e, gspread.WorksheetNotFound) or is_auth_error(e)):
+                raise
+            self.invalidate()
+            return func(self.worksheets())
+
+    def stats(self):
+        """재사용/재생성 횟수와 마지막 연결 실패 메시지를 돌려줍니다."""
+        with self._lock:
+            return {"reused": self.reused_count, "rebuilt": self.rebuilt_count, "last_error": self.last_error}
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import os
+import re
+import pandas as pd
+from gspread.utils import extract_id_from_url, numericise_all
+
+# 스냅샷 캐시 폴더 (스프레드시트마다 하위 폴더 하나: meta.json + 탭별 .parquet)
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sheet_snapshots")
+ID_COLUMNS = ("학번", "Student_No")
+
+
+def normalize_header(value):
+    return str(value).strip()
+
+
+def normalize_student_id(value):
+    """
+    학번 표기를 하나로 맞춥니다. (앞뒤/중간 공백 제거, 숫자로 읽혀 붙은 '.0' 제거)
+
+    Args:
+        value: 시트에서 읽은 학번 (str / int / float)
+
+    Returns:
+        str: 정규화된 학번 (값이 없으면 "")
+    """
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    text = re.sub(r"\s+", "", str(value))
+    return text[:-2] if text.endswith(".0") and text[:-2].isdigit() else text
+
+
+def records_frame(values):
+    """
+    values_batch_get으로 받은 탭 값(첫 행 = 헤더)을 get_all_records()와 같은 모양의 DataFrame으로 바꿉니다.
+    숫자로 읽히는 값은 숫자로, 헤더는 앞뒤 공백 제거, 학번 열은 정규화된 문자열로 맞춥니다.
+    """
+    if not values:
+        return pd.DataFrame()
+    header = [normalize_header(h) for h in values[0]]
+    width = len(header)
+    rows = [numericise_all((row + [""] * width)[:width], default_blank="") for row in values[1:]]
+    df = pd.DataFrame(rows, columns=header)
+    for column in ID_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].map(normalize_student_id)
+    return df
+
+
+class SheetSnapshot:
+    """
+    스프레드시트 여러 탭을 values_batch_get 한 번으로 읽어 DataFrame으로 돌려주는 로더입니다.
+
+    읽은 원본 값은 탭별 parquet(열 단위 저장)로 캐시하고 드라이브의 modifiedTime을 함께 기록합니다.
+    다음 실행에서 modifiedTime이 같으면 드라이브 메타데이터 조회 한 번만으로 캐시를 씁니다.
+    (수식 재계산처럼 파일 수정 시각이 바뀌지 않는 변화는 감지하지 못하므로 그럴 때는 refresh=True)
+
+    Args:
+        gc: gspread Client
+        spreadsheet (str): 스프레드시트 URL 또는 ID
+        cache_dir (str): 캐시 폴더 (None이면 캐시 사용 안 함)
+    """
+
+    def __init__(self, gc, spreadsheet, cache_dir=SNAPSHOT_DIR):
+        self.gc = gc
+        self.spreadsheet_id = extract_id_from_url(spreadsheet) if spreadsheet.startswith("http") else spreadsheet
+        self.cache_path = os.path.join(cache_dir, self.spreadsheet_id) if cache_dir else None
+        self.from_cache = []   # 마지막 load()에서 캐시로 읽은 탭
+        self.downloaded = []   # 마지막 load()에서 새로 받은 탭
+
+    # --- [캐시] ---
+    def _read_meta(self):
+        path = os.path.join(self.cache_path, "meta.json")
+        if not os.path.exists(path):
+            return {"modifiedTime": None, "tabs": {}}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _tab_file(self, meta_tab):
+        return os.path.join(self.cache_path, meta_tab["file"])
+
+    def _read_cached(self, meta_tab):
+        table = pd.read_parquet(self._tab_file(meta_tab))
+        return [meta_tab["header"]] + table.values.tolist()
+
+    def _write_cache(self, modified_time, fetched, meta):
+        """받은 탭을 parquet로 쓰고 meta.json을 마지막에 교체합니다. (중간에 멈춰도 이전 캐시는 그대로)"""
+        os.makedirs(self.cache_path, exist_ok=True)
+        tabs = meta["tabs"] if meta["modifiedTime"] == modified_time else {}
+        for tab, values in fetched.items():
+            header = values[0] if values else []
+            width = max((len(row) for row in values), default=0)
+            table = pd.DataFrame([(row + [""] * width)[:width] for row in values[1:]],
+                                 columns=[f"c{i}" for i in range(width)], dtype=str)
+            file_name = hashlib.sha1(tab.encode("utf-8")).hexdigest()[:16] + ".parquet"
+            table.to_parquet(os.path.join(self.cache_path, file_name), index=False)
+            tabs[tab] = {"file": file_name, "header": [str(h) for h in header]}
+        tmp_path = os.path.join(self.cache_path, "meta.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"modifiedTime": modified_time, "tabs": tabs}, f, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(self.cache_path, "meta.json"))
+
+    # --- [읽기] ---
+    def modified_time(self):
+        """드라이브 API의 파일 수정 시각 (요청 한 번)"""
+        return self.gc.http_client.get_file_drive_metadata(self.spreadsheet_id)["modifiedTime"]
+
+    def fetch(self, tabs):
+        """탭들의 값을 values_batch_get 한 번으로 받습니다. -> {탭: [[헤더...], [행...], ...]}"""
+        response = self.gc.http_client.values_batch_get(
+            self.spreadsheet_id, [f"'{tab}'" for tab in tabs], params={"majorDimension": "ROWS"})
+        return {tab: value_range.get("values", []) for tab, value_range in zip(tabs, response["valueRanges"])}
+
+    def load(self, tabs, refresh=False):
+        """
+        탭들을 DataFrame으로 읽습니다. 바뀌지 않았으면 캐시에서, 바뀌었거나 없는 탭만 한 번에 받아옵니다.
+
+        Args:
+            tabs (list): 탭 이름 목록
+            refresh (bool): True면 캐시를 무시하고 새로 받음
+
+        Returns:
+            dict: {탭 이름: DataFrame}
+        """
+        tabs = list(tabs)
+        if not self.cache_path:
+            fetched = self.fetch(tabs)
+            self.from_cache, self.downloaded = [], tabs
+            return {tab: records_frame(fetched[tab]) for tab in tabs}
+
+        modified_time = self.modified_time()
+        meta = self._read_meta()
+        fresh = not refresh and meta["modifiedTime"] == modified_time
+        cached = [tab for tab in tabs if fresh and tab in meta["tabs"] and os.path.exists(self._tab_file(meta["tabs"][tab]))]
+        missing = [tab for tab in tabs if tab not in cached]
+
+        values = {tab: self._read_cached(meta["tabs"][tab]) for tab in cached}
+        if missing:
+            fetched = self.fetch(missing)
+            self._write_cache(modified_time, fetched, meta)
+            values.update(fetched)
+
+        self.from_cache, self.downloaded = cached, missing
+        return {tab: records_frame(values[tab]) for tab in tabs}
+
+    def describe(self):
+        """마지막 load() 결과 요약 (스크립트 출력용)"""
+        if not self.downloaded:
+            return f"변경 없음, 캐시 사용 ({len(self.from_cache)}개 탭)"
+        return f"{len(self.downloaded)}개 탭 새로 받음 / {len(self.from_cache)}개 탭 캐시 사용"
+
+
+def load_snapshot(gc, spreadsheet, tabs, refresh=False, cache_dir=SNAPSHOT_DIR):
+    """SheetSnapshot(gc, spreadsheet, cache_dir).load(tabs, refresh)의 줄임 (로더도 함께 돌려줌)"""
+    snapshot = SheetSnapshot(gc, spreadsheet, cache_dir)
+    return snapshot.load(tabs, refresh), snapshot
@@ -0,0 +1,124 @@
+import collections
+import json
+import os
+import random
+import threading
+import time
+import requests
+from gspread.exceptions import APIError
+from sheet_connection_module import TAB_NAMES
+
+
+def make_quota_error(retry_after=None):
+    """구글 API가 돌려주는 것과 같은 모양의 429 APIError를 만듭니다."""
+    response = requests.models.Response()
+    response.status_code = 429
+    response._content = json.dumps({"error": {
+        "code": 429, "status": "RESOURCE_EXHAUSTED",
+        "message": "Quota exceeded for quota metric 'Write requests' (in-memory stand-in)",
+    }}).encode("utf-8")
+    if retry_after is not None:
+        response.headers["Retry-After"] = str(retry_after)
+    return APIError(response)
+
+
+class InMemoryWorksheet:
+    """append_rows만 흉내 내는 메모리 워크시트입니다. 지연/429는 소속 연결이 결정합니다."""
+
+    def __init__(self, connection, title):
+        self._connection = connection
+        self.title = title
+        self.rows = []
+
+    def append_rows(self, rows, **kwargs):
+        self._connection._before_write()
+        with self._connection._lock:
+            self.rows.extend(rows)
+
+
+class InMemorySheetConnection:
+    """
+    부하 테스트용 SheetConnection 대역입니다. 네트워크 대신 메모리에 행을 쌓습니다.
+
+    Args:
+        latency_ms (float): 쓰기 1회 기본 지연(ms)
+        jitter_ms (float): 기본 지연에 더해지는 무작위 지연의 최댓값(ms)
+        error_rate (float): 쓰기마다 무작위로 429를 낼 확률 (0~1)
+        quota_per_minute (int): 분당 쓰기 한도, 넘으면 429 (0이면 제한 없음)
+        seed (int): 지연/오류 난수 시드 (같은 시드 = 같은 결과)
+    """
+
+    def __init__(self, latency_ms=200, jitter_ms=100, error_rate=0.0, quota_per_minute=60, seed=0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.quota_per_minute = quota_per_minute
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._write_times = collections.deque()
+        self._worksheets = {title: InMemoryWorksheet(self, title) for title in TAB_NAMES}
+
+        # 통계
+        self.write_calls = 0
+        self.quota_errors = 0
+        self.reused_count = 0
+        self.rebuilt_count = 1
+
+    def _before_write(self):
+        with self._lock:
+            self.write_calls += 1
+            delay = (self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000
+            inject = self._random.random() < self.error_rate
+
+            now = time.monotonic()
+            while self._write_times and now - self._write_times[0] > 60:
+                self._write_times.popleft()
+            retry_after = None
+            if self.quota_per_minute and len(self._write_times) >= self.quota_per_minute:
+                retry_after = max(1, int(60 - (now - self._write_times[0])))
+            else:
+                self._write_times.append(now)
+            if inject or retry_after:
+                self.quota_errors += 1
+
+        time.sleep(delay)
+        if inject or retry_after:
+            raise make_quota_error(retry_after)
+
+    # --- [SheetConnection과 같은 인터페이스] ---
+    def worksheets(self):
+        with self._lock:
+            self.reused_count += 1
+        return self._worksheets
+
+    def invalidate(self):
+        pass
+
+    def run(self, func):
+        return func(self.worksheets())
+
+    def stats(self):
+        with self._lock:
+            return {"reused": self.reused_count, "rebuilt": self.rebuilt_count,
+                    "write_calls": self.write_calls, "quota_errors": self.quota_errors}
+
+    def row_count(self):
+        with self._lock:
+            return {title: len(ws.rows) for title, ws in self._worksheets.items()}
+
+
+# 가장 최근에 from_env()로 만든 대역 (부하 테스트 스크립트가 통계를 읽을 때 사용)
+ACTIVE = None
+
+
+def from_env():
+    """SHEETS_STANDIN_* 환경 변수로 대역 연결을 만듭니다. (app.py의 SHEETS_BACKEND=memory 모드)"""
+    global ACTIVE
+    ACTIVE = InMemorySheetConnection(
+        latency_ms=float(os.getenv("SHEETS_STANDIN_LATENCY_MS", "200")),
+        jitter_ms=float(os.getenv("SHEETS_STANDIN_JITTER_MS", "100")),
+        error_rate=float(os.getenv("SHEETS_STANDIN_ERROR_RATE", "0")),
+        quota_per_minute=int(os.getenv("SHEETS_STANDIN_QUOTA_PER_MINUTE", "60")),
+        seed=int(os.getenv("SHEETS_STANDIN_SEED", "0")),
+    )
+    return ACTIVE
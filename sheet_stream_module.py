@@ -0,0 +1,104 @@
+import pandas as pd
+from gspread.utils import extract_id_from_url, rowcol_to_a1
+from sheet_snapshot_module import ID_COLUMNS, normalize_header, normalize_student_id
+
+CHUNK_ROWS = 500       # 한 번에 읽는 행 수
+ROW_COLUMN = "_row"    # 배치마다 붙는 시트 행 번호 열 (값을 다시 쓸 때 사용)
+
+
+def column_letter(col):
+    """1 -> 'A', 28 -> 'AB'"""
+    return rowcol_to_a1(1, col)[:-1]
+
+
+def typed(series, dtype):
+    """열 값을 지정한 형식으로 바꿉니다. ("number"는 숫자가 아닌 값을 NaN으로)"""
+    if dtype == "number":
+        return pd.to_numeric(series, errors="coerce")
+    return series.astype(dtype)
+
+
+class WorksheetStream:
+    """
+    큰 워크시트를 일정한 행 단위로 나눠 읽는 리더입니다.
+
+    헤더를 한 번 읽어 요청한 열의 위치를 찾고, 이후에는 그 열들만 CHUNK_ROWS행씩
+    values_batch_get 한 번으로 받아 DataFrame 배치로 내보냅니다. 초록처럼 긴 열을 요청하지 않으면
+    그 열은 내려받지도 않습니다. 값은 pandas string 형식(학번 열은 정규화)이고 dtypes로 열별 형식을 바꿀 수 있습니다.
+    요청한 열들이 모두 비어 있는 구간을 만나면 끝으로 봅니다.
+
+    Args:
+        gc: gspread Client
+        spreadsheet (str): 스프레드시트 URL 또는 ID
+        tab (str): 탭 이름
+        columns (list): 읽을 열 이름 (None이면 전체 열, 시트에 없는 열은 건너뛰고 missing에 기록)
+        chunk_rows (int): 배치 하나의 행 수
+        dtypes (dict): {열 이름: "string" / "category" / "number" 등}
+    """
+
+    def __init__(self, gc, spreadsheet, tab, columns=None, chunk_rows=CHUNK_ROWS, dtypes=None):
+        self.gc = gc
+        self.spreadsheet_id = extract_id_from_url(spreadsheet) if spreadsheet.startswith("http") else spreadsheet
+        self.tab = tab
+        self.chunk_rows = chunk_rows
+        self.dtypes = dtypes or {}
+        self.requests = 0
+
+        header = self._get_header()
+        positions = {}
+        for col, name in enumerate(header, start=1):
+            positions.setdefault(name, col)  # 같은 헤더가 여럿이면 첫 열
+        wanted = [name for name in header if name] if columns is None else list(columns)
+        self.columns = [name for name in wanted if name in positions]
+        self.missing = [name for name in wanted if name not in positions]
+        self._positions = {name: positions[name] for name in self.columns}
+
+    def _get_header(self):
+        response = self.gc.http_client.values_get(self.spreadsheet_id, f"'{self.tab}'!1:1")
+        self.requests += 1
+        values = response.get("values", [[]])
+        return [normalize_header(h) for h in values[0]] if values else []
+
+    def _fetch(self, start, end):
+        """start~end행의 요청 열들을 한 번에 받습니다. -> {열 이름: [값, ...]}"""
+        ranges = [f"'{self.tab}'!{column_letter(col)}{start}:{column_letter(col)}{end}"
+                  for col in self._positions.values()]
+        response = self.gc.http_client.values_batch_get(
+            self.spreadsheet_id, ranges, params={"majorDimension": "COLUMNS"})
+        self.requests += 1
+        result = {}
+        for name, value_range in zip(self.columns, response["valueRanges"]):
+            values = value_range.get("values", [])
+            result[name] = values[0] if values else []
+        return result
+
+    def _frame(self, start, chunk):
+        length = max((len(values) for values in chunk.values()), default=0)
+        data = {ROW_COLUMN: range(start, start + length)}
+        for name, values in chunk.items():
+            series = pd.Series(values + [""] * (length - len(values)), dtype=object)
+            if name in ID_COLUMNS:
+                series = series.map(normalize_student_id)
+            data[name] = typed(series, self.dtypes.get(name, "string"))
+        return pd.DataFrame(data)
+
+    def __iter__(self):
+        """DataFrame 배치를 차례로 내보냅니다. (열: ROW_COLUMN + 요청 열)"""
+        if not self.columns:
+            return
+        start = 2
+        while True:
+            end = start + self.chunk_rows - 1
+            chunk = self._fetch(start, end)
+            if not any(chunk.values()):
+                return
+            yield self._frame(start, chunk)
+            start = end + 1
+
+    def read(self):
+        """모든 배치를 하나의 DataFrame으로 합칩니다. (필요한 열만 요청했을 때 사용)"""
+        batches = list(self)
+        if not batches:
+            empty = {name: typed(pd.Series([], dtype=object), self.dtypes.get(name, "string")) for name in self.columns}
+            return pd.DataFrame({ROW_COLUMN: pd.Series(dtype="int64"), **empty})
+        return pd.concat(batches, ignore_index=True)
@@ -0,0 +1,147 @@
+import atexit
+import signal
+import threading
+import time
+from gspread.utils import absolute_range_name, rowcol_to_a1
+from quota_governor_module import is_quota_error
+
+# 기본 설정 (모듈 내부 상수)
+FLUSH_SIZE = 200        # 모인 쓰기(셀/범위)가 이만큼이면 바로 전송
+FLUSH_INTERVAL = 10.0   # 초 단위, 마지막 전송 후 이 시간이 지나면 다음 쓰기 때 전송
+MAX_QUOTA_RETRIES = 5   # 429를 받았을 때 같은 묶음을 다시 보내는 최대 횟수
+
+
+class SheetWriteBuffer:
+    """
+    update_cell / 범위 update를 모았다가 values_batch_update 한 번으로 보내는 쓰기 버퍼입니다.
+
+    셀마다 HTTP 요청을 보내는 대신 쓰기를 범위 이름 기준으로 모아 두고(같은 칸을 다시 쓰면
+    마지막 값만 남김), 개수(flush_size)나 시간(flush_interval) 기준을 넘으면 전송합니다.
+    with 문이 끝날 때와 프로그램 종료(atexit) 때도 남은 쓰기를 보내며, 전송 도중에 Ctrl-C가
+    들어오면 그 묶음을 끝까지 보낸 뒤에 중단합니다.
+
+    Args:
+        spreadsheet (gspread.Spreadsheet): 쓰기 대상 문서 (여러 탭을 한 번에 보낼 수 있음)
+        flush_size (int): 즉시 전송 기준 쓰기 수
+        flush_interval (float): 시간 기준(초)
+        value_input_option (str): "USER_ENTERED"(update_cell과 같음) 또는 "RAW"
+        governor (QuotaGovernor): 있으면 전송 전에 허가를 받고, 429면 백오프 후 재전송
+    """
+
+    def __init__(self, spreadsheet, flush_size=FLUSH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 value_input_option="USER_ENTERED", governor=None):
+        self._spreadsheet = spreadsheet
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.value_input_option = value_input_option
+        self._governor = governor
+        self._lock = threading.RLock()
+        self._pending = {}  # 범위 이름 -> 값 2차원 리스트 (쓰기 순서 유지)
+        self._last_flush = time.monotonic()
+
+        # 통계
+        self.buffered_count = 0
+        self.api_calls = 0
+
+        atexit.register(self._flush_at_exit)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+    # --- [쓰기 모으기] ---
+    def update_cell(self, worksheet, row, col, value):
+        """worksheet.update_cell(row, col, value)과 같은 쓰기를 버퍼에 넣습니다."""
+        self._add(absolute_range_name(worksheet.title, rowcol_to_a1(row, col)), [[value]])
+
+    def update_range(self, worksheet, range_name, values):
+        """
+        worksheet.update(range_name=..., values=...)과 같은 쓰기를 버퍼에 넣습니다.
+
+        Args:
+            worksheet (gspread.Worksheet): 대상 탭
+            range_name (str): 시작 칸 또는 범위 (예: "A1", "B2:D5")
+            values (list): 2차원 값 리스트
+        """
+        self._add(absolute_range_name(worksheet.title, range_name), values)
+
+    def _add(self, range_name, values):
+        with self._lock:
+            # 같은 범위를 다시 쓰면 이전 값을 버리고 순서상 맨 뒤로 (나중 쓰기가 이김)
+            self._pending.pop(range_name, None)
+            self._pending[range_name] = values
+            self.buffered_count += 1
+            due = (len(self._pending) >= self.flush_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    # --- [전송] ---
+    def _send(self, data):
+        body = {"valueInputOption": self.value_input_option, "data": data}
+        for attempt in range(MAX_QUOTA_RETRIES + 1):
+            if self._governor:
+                self._governor.acquire()
+            try:
+                self._spreadsheet.values_batch_update(body)
+                if self._governor:
+                    self._governor.report_success()
+                return
+            except Exception as e:
+                if not (self._governor and is_quota_error(e)) or attempt == MAX_QUOTA_RETRIES:
+                    raise
+                delay = self._governor.report_quota_error(e)
+                print(f"⏳ [write_buffer] 사용량 한도 초과, {delay:.1f}초 후 {len(data)}건 재전송")
+
+    def flush(self):
+        """
+        모인 쓰기를 values_batch_update 한 번으로 보냅니다.
+        실패하면 보내지 못한 쓰기를 버퍼에 되돌리고 예외를 다시 던집니다.
+
+        Returns:
+            int: 보낸 범위 수
+        """
+        with self._lock:
+            if not self._pending:
+                self._last_flush = time.monotonic()
+                return 0
+            pending, self._pending = self._pending, {}
+            data = [{"range": name, "values": values} for name, values in pending.items()]
+
+            interrupted = []
+            restore = None
+            if threading.current_thread() is threading.main_thread():
+                # 전송 중 Ctrl-C는 묶음을 다 보낸 뒤에 처리 (반쯤 보낸 상태로 끊기지 않도록)
+                restore = signal.signal(signal.SIGINT, lambda signum, frame: interrupted.append(signum))
+            try:
+                self._send(data)
+            except Exception:
+                # 그 사이 새로 들어온 같은 범위 쓰기가 있으면 그쪽이 최신
+                pending.update(self._pending)
+                self._pending = pending
+                raise
+            finally:
+                if restore is not None:
+                    signal.signal(signal.SIGINT, restore)
+            self.api_calls += 1
+            self._last_flush = time.monotonic()
+
+        if interrupted:
+            raise KeyboardInterrupt
+        return len(data)
+
+    def _flush_at_exit(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"❌ [write_buffer] 종료 전 전송 실패, 보내지 못한 쓰기 {self.pending_count()}건: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {"buffered": self.buffered_count, "api_calls": self.api_calls, "pending": len(self._pending)}
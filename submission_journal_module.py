@@ -0,0 +1,263 @@
+import datetime
+import hashlib
+import json
+import sqlite3
+import threading
+
+# 같은 내용의 제출을 중복으로 보는 기간 (더블 클릭/새로고침 재시도만 흡수)
+# 이 기간이 지나고 이전 제출이 시트에 반영까지 끝났다면 같은 내용이어도 새 제출로 받습니다.
+# (관리자가 시트에서 행을 지우고 다시 제출을 요청한 경우)
+DEDUPE_WINDOW = datetime.timedelta(minutes=10)
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _row_key(row):
+    # 0번 열(제출 시각)은 제출할 때마다 달라지므로 내용 비교에서 제외합니다.
+    return [str(value).strip() for value in row[1:]]
+
+
+def make_submission_id(rows_by_tab):
+    """
+    제출 내용으로부터 제출 ID를 만듭니다. 같은 내용이면 탭/세션이 달라도 같은 ID가 나옵니다.
+
+    Args:
+        rows_by_tab (dict): {"논문": [row, ...], "저서": [...], "학술대회": [...]}
+
+    Returns:
+        str: sha256 16진수 문자열
+    """
+    content = {tab: [_row_key(row) for row in rows] for tab, rows in rows_by_tab.items() if rows}
+    payload = json.dumps(content, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def find_duplicate_rows(rows):
+    """
+    시트에 이미 올라간 행들 중 제출 시각만 다르고 내용이 같은 행을 한 번에 찾습니다.
+
+    Args:
+        rows (list): 헤더를 제외한 시트 행 목록 (get_all_values()[1:])
+
+    Returns:
+        list: 중복 묶음 목록. 각 묶음은 시트 행 번호(헤더=1행 기준) 리스트
+    """
+    groups = {}
+    for i, row in enumerate(rows):
+        key = "\x1f".join(_row_key(row))
+        groups.setdefault(key, []).append(i + 2)
+    return [row_nums for row_nums in groups.values() if len(row_nums) > 1]
+
+
+class SubmissionJournal:
+    """
+    제출 행을 시트에 쓰기 전에 먼저 기록해 두는 로컬 추가 전용 저널입니다. (SQLite WAL 모드)
+
+    각 행은 'pending' 상태로 저장되고, 시트 기록이 끝나면 'confirmed'로 바뀝니다.
+    프로세스가 죽었다가 다시 떠도 pending 행이 남아 있으므로 이어서 재전송할 수 있습니다.
+    다시 보내도 소용없는 오류(없는 탭, 잘못된 요청)로 여러 번 실패한 행은 'failed'가 되어 재전송을 멈춥니다.
+    제출 ID는 submissions 테이블(기본키 인덱스)로 관리하여 같은 제출이 두 번 기록되지 않습니다.
+    중복으로 보는 것은 dedupe_window 안의 재제출과 아직 시트에 반영되지 않은 제출뿐입니다.
+
+    Args:
+        path (str): SQLite 파일 경로
+        dedupe_window (timedelta): 같은 내용을 중복으로 보는 기간
+    """
+
+    def __init__(self, path, dedupe_window=DEDUPE_WINDOW):
+        self._dedupe_window = dedupe_window
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: 커밋마다 fsync는 하지 않지만 앱이 죽어도 커밋된 행은 남습니다.
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS journal (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                tab TEXT NOT NULL,
+                row_json TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                created_at TEXT NOT NULL,
+                confirmed_at TEXT
+            )
+        """)
+        # 실패 기록 열 (이전 버전에서 만든 저널 파일에는 없으므로 추가)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(journal)")}
+        if "attempts" not in columns:
+            self._conn.execute("ALTER TABLE journal ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        if "last_error" not in columns:
+            self._conn.execute("ALTER TABLE journal ADD COLUMN last_error TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_journal_status ON journal (status, id)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS submissions (
+                submission_id TEXT PRIMARY KEY,
+                ticket INTEGER,
+                created_at TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_submissions_ticket ON submissions (ticket)")
+
+    def append(self, rows_by_tab, submission_id):
+        """
+        제출 한 건(여러 탭의 행)을 한 트랜잭션으로 저널에 기록합니다.
+        같은 submission_id가 dedupe_window 안에 기록되었거나 아직 반영 대기 중이면
+        아무것도 쓰지 않고 기존 접수 번호를 돌려줍니다. 그보다 오래된 기록은 보관용 ID로 바꾸고 새로 받습니다.
+
+        Args:
+            rows_by_tab (dict): {"논문": [row, ...], "저서": [...], "학술대회": [...]}
+            submission_id (str): make_submission_id()로 만든 제출 ID
+
+        Returns:
+            tuple: (접수 번호, 새로 기록되었으면 True / 중복이면 False)
+        """
+        now = datetime.datetime.now()
+        now_str = now.strftime(TIME_FORMAT)
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                previous = cur.execute(
+                    "SELECT ticket, created_at FROM submissions WHERE submission_id = ?", (submission_id,)
+                ).fetchone()
+                if previous:
+                    ticket, created_at = previous
+                    recent = now - datetime.datetime.strptime(created_at, TIME_FORMAT) < self._dedupe_window
+                    if recent or self._has_pending(ticket):
+                        cur.execute("ROLLBACK")
+                        return ticket, False
+                    # 오래된 같은 내용 제출: 접수 번호(대기 순번 계산용)는 남기고 ID만 보관용으로 바꿈
+                    cur.execute(
+                        "UPDATE submissions SET submission_id = ? WHERE submission_id = ?",
+                        (f"{submission_id}@{ticket}", submission_id),
+                    )
+                cur.execute(
+                    "INSERT INTO submissions (submission_id, created_at) VALUES (?, ?)",
+                    (submission_id, now_str),
+                )
+
+                last_id = None
+                for tab, rows in rows_by_tab.items():
+                    for row in rows:
+                        cur.execute(
+                            "INSERT INTO journal (tab, row_json, created_at) VALUES (?, ?, ?)",
+                            (tab, json.dumps(row, ensure_ascii=False), now_str),
+                        )
+                        last_id = cur.lastrowid
+                cur.execute(
+                    "UPDATE submissions SET ticket = ? WHERE submission_id = ?", (last_id, submission_id)
+                )
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+            return last_id, True
+
+    def pending(self, limit=1000):
+        """
+        아직 시트에 반영되지 않은 행을 저널 순서대로 돌려줍니다.
+
+        Returns:
+            list: [(id, tab, row), ...]
+        """
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT id, tab, row_json FROM journal WHERE status = 'pending' ORDER BY id LIMIT ?",
+                (limit,),
+            )
+            return [(entry_id, tab, json.loads(row_json)) for entry_id, tab, row_json in cur.fetchall()]
+
+    def confirm(self, entry_ids):
+        """시트 기록이 끝난 행들을 confirmed로 표시합니다."""
+        if not entry_ids:
+            return
+        now_str = datetime.datetime.now().strftime(TIME_FORMAT)
+        with self._lock:
+            placeholders = ",".join("?" * len(entry_ids))
+            self._conn.execute(
+                f"UPDATE journal SET status = 'confirmed', confirmed_at = ? WHERE id IN ({placeholders})",
+                [now_str, *entry_ids],
+            )
+
+    def record_failure(self, entry_ids, error, max_attempts):
+        """
+        기록에 실패한 행들의 실패 횟수를 늘리고, max_attempts에 닿은 행은 failed로 바꿉니다.
+
+        Returns:
+            int: 이번에 failed가 된 행 수
+        """
+        if not entry_ids:
+            return 0
+        with self._lock:
+            placeholders = ",".join("?" * len(entry_ids))
+            self._conn.execute(
+                f"UPDATE journal SET attempts = attempts + 1, last_error = ?, "
+                f"status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE status END "
+                f"WHERE id IN ({placeholders}) AND status = 'pending'",
+                [str(error)[:500], max_attempts, *entry_ids],
+            )
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM journal WHERE id IN ({placeholders}) AND status = 'failed'", list(entry_ids)
+            ).fetchone()[0]
+
+    def ticket_status(self, ticket):
+        """
+        접수 번호의 반영 상태를 돌려줍니다.
+
+        Returns:
+            str: "pending"(반영 대기) / "failed"(반영 실패 행 있음) / "confirmed"(모두 반영)
+        """
+        with self._lock:
+            statuses = {status for (status,) in self._conn.execute(
+                """
+                SELECT DISTINCT status FROM journal WHERE id <= :ticket
+                AND id > COALESCE((SELECT MAX(ticket) FROM submissions WHERE ticket < :ticket), 0)
+                """,
+                {"ticket": ticket},
+            )}
+        if "pending" in statuses:
+            return "pending"
+        return "failed" if "failed" in statuses else "confirmed"
+
+    def _has_pending(self, ticket):
+        """접수 번호의 행 중 아직 pending인 행이 있는지 (호출하는 쪽에서 잠금)"""
+        return bool(self._conn.execute(
+            """
+            SELECT EXISTS (
+                SELECT 1 FROM journal WHERE status = 'pending' AND id <= :ticket
+                AND id > COALESCE((SELECT MAX(ticket) FROM submissions WHERE ticket < :ticket), 0)
+            )
+            """,
+            {"ticket": ticket},
+        ).fetchone()[0])
+
+    def position(self, ticket):
+        """
+        접수 번호 앞에 시트 반영을 기다리는 제출이 몇 건인지(자기 자신 포함) 셉니다.
+
+        한 제출의 행은 한 트랜잭션으로 연속된 id를 받고 접수 번호는 그 마지막 id이므로,
+        pending 행이 속한 제출은 'id 이상인 가장 작은 접수 번호'로 찾을 수 있습니다.
+
+        Returns:
+            int: 대기 순번 (0이면 이미 모두 반영됨)
+        """
+        with self._lock:
+            if not self._has_pending(ticket):
+                return 0
+            return self._conn.execute(
+                """
+                SELECT COUNT(DISTINCT (SELECT MIN(ticket) FROM submissions WHERE ticket >= j.id))
+                FROM journal j WHERE j.status = 'pending' AND j.id <= ?
+                """,
+                (ticket,),
+            ).fetchone()[0]
+
+    def pending_count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM journal WHERE status = 'pending'").fetchone()[0]
+
+    def failed_count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM journal WHERE status = 'failed'").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
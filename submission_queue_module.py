@@ -0,0 +1,157 @@
+import atexit
+import threading
+import time
+from gspread.exceptions import APIError, WorksheetNotFound
+from quota_governor_module import QuotaGovernor, is_quota_error
+
+# 기본 설정 (모듈 내부 상수)
+FLUSH_INTERVAL = 1.0  # 초 단위, 이 주기마다 탭별로 모아서 한 번씩 append_rows
+REPLAY_BATCH = 1000   # 한 번의 플러시에서 저널에서 꺼내는 최대 행 수
+MAX_ATTEMPTS = 5      # 다시 보내도 소용없는 오류로 이만큼 실패한 행은 failed로 (재전송 중단)
+RETRY_BASE_DELAY = 1.0   # 한도 초과가 아닌 실패 후 그 탭의 첫 재시도 대기(초), 연속 실패마다 2배
+RETRY_MAX_DELAY = 60.0   # 재시도 대기 상한(초)
+
+
+def is_permanent_error(e):
+    """다시 보내도 같은 결과가 나올 오류(없는 탭, 잘못된 범위/요청)인지 판별합니다. (인증/한도/서버 오류 제외)"""
+    if isinstance(e, WorksheetNotFound):
+        return True
+    if isinstance(e, APIError):
+        status = getattr(e.response, "status_code", None) or 0
+        return 400 <= status < 500 and status not in (401, 403, 408, 429)
+    return False
+
+
+class SubmissionQueue:
+    """
+    로컬 저널에 먼저 기록된 제출 행을 백그라운드에서 시트로 재전송하는 큐입니다.
+
+    submit()은 저널에 쓰는 즉시(로컬 디스크 속도로) 돌아오고, 플러셔 스레드가
+    FLUSH_INTERVAL마다 pending 행을 저널 순서대로 꺼내 탭별 append_rows 한 번으로 보낸 뒤
+    confirmed로 표시합니다. 시트 오류가 나면 행은 pending으로 남아 다음 주기에 다시 시도되고,
+    프로세스가 재시작되어도 남은 행부터 이어서 보냅니다.
+
+    모든 append_rows는 QuotaGovernor의 허가를 받은 뒤에만 나갑니다. 429를 받으면 그 주기의
+    나머지 탭도 보내지 않고, Retry-After/백오프가 끝난 뒤 저널 순서 그대로 다시 보냅니다.
+    그 밖의 실패는 그 탭만 지수 백오프로 미루고(매 주기 연결을 다시 만들지 않도록), 없는 탭/잘못된 요청처럼
+    다시 보내도 소용없는 오류로 MAX_ATTEMPTS번 실패한 행은 저널에서 failed로 바꿔 재전송을 멈춥니다.
+
+    Args:
+        connection (SheetConnection): 공유 시트 연결
+        journal (SubmissionJournal): 로컬 제출 저널
+        flush_interval (float): 플러시 주기(초)
+        governor (QuotaGovernor): 프로세스 공용 할당량 관리자 (없으면 새로 만듦)
+    """
+
+    def __init__(self, connection, journal, flush_interval=FLUSH_INTERVAL, governor=None):
+        self._connection = connection
+        self._journal = journal
+        self._governor = governor or QuotaGovernor()
+        self._flush_interval = flush_interval
+        self._flush_lock = threading.Lock()
+        self._tab_failures = {}  # {탭: 연속 실패 횟수}
+        self._tab_retry_at = {}  # {탭: 다시 보낼 수 있는 시각(time.monotonic)}
+
+        # 통계
+        self.submitted_count = 0
+        self.flushed_rows = 0
+        self.api_calls = 0
+
+        self._thread = threading.Thread(target=self._run, name="submission-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def submit(self, rows_by_tab, submission_id):
+        """
+        제출 행을 저널에 기록하고 바로 돌아옵니다. 같은 submission_id의 재시도는 무시됩니다.
+
+        Args:
+            rows_by_tab (dict): {"논문": [row, ...], "저서": [...], "학술대회": [...]}
+            submission_id (str): 제출 내용으로 만든 제출 ID
+
+        Returns:
+            tuple: (접수 번호, 새 제출이면 True / 중복이면 False)
+        """
+        ticket, is_new = self._journal.append(rows_by_tab, submission_id)
+        if is_new:
+            self.submitted_count += 1
+        return ticket, is_new
+
+    def pending_count(self):
+        return self._journal.pending_count()
+
+    def position(self, ticket):
+        """
+        접수 번호의 대기 순번을 돌려줍니다. (1 = 다음 전송 대상, 0 = 시트 반영 완료)
+        """
+        return self._journal.position(ticket)
+
+    def status(self, ticket):
+        """접수 번호의 반영 상태: "pending" / "failed" / "confirmed" """
+        return self._journal.ticket_status(ticket)
+
+    def retry_wait(self):
+        """사용량 한도로 전송이 멈춰 있는 남은 시간(초)을 돌려줍니다."""
+        return self._governor.wait_time()
+
+    def flush(self):
+        """저널의 pending 행을 탭별 append_rows 한 번씩으로 기록하고 confirmed로 표시합니다."""
+        # 플러셔 스레드와 atexit 플러시가 같은 행을 두 번 보내지 않도록 직렬화
+        with self._flush_lock:
+            batch = {}
+            for entry_id, tab, row in self._journal.pending(limit=REPLAY_BATCH):
+                ids, rows = batch.setdefault(tab, ([], []))
+                ids.append(entry_id)
+                rows.append(row)
+
+            for tab, (ids, rows) in batch.items():
+                if time.monotonic() < self._tab_retry_at.get(tab, 0.0):
+                    continue  # 이 탭은 직전 실패로 백오프 중
+                # 한도가 찼으면 다음 주기로 (atexit 플러시가 무한정 멈추지 않도록 제한 시간 사용)
+                if not self._governor.acquire(timeout=self._flush_interval):
+                    break
+                try:
+                    self._connection.run(lambda worksheets: worksheets[tab].append_rows(rows))
+                except Exception as e:
+                    if is_quota_error(e):
+                        delay = self._governor.report_quota_error(e)
+                        print(f"⏳ [submission_queue] 사용량 한도 초과, {delay:.1f}초 후 재시도 ({len(rows)}행 대기)")
+                        break
+                    self._record_failure(tab, ids, e)
+                    continue
+                self._tab_failures.pop(tab, None)
+                self._tab_retry_at.pop(tab, None)
+                self._governor.report_success()
+                self._journal.confirm(ids)
+                self.api_calls += 1
+                self.flushed_rows += len(rows)
+
+    def _record_failure(self, tab, ids, e):
+        """한도 초과가 아닌 실패: 그 탭을 백오프로 미루고, 다시 보내도 소용없는 오류면 실패 횟수를 저널에 남깁니다."""
+        failures = self._tab_failures.get(tab, 0) + 1
+        self._tab_failures[tab] = failures
+        delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (failures - 1))
+        self._tab_retry_at[tab] = time.monotonic() + delay
+        if not is_permanent_error(e):
+            print(f"❌ [submission_queue] '{tab}' 기록 실패, {delay:.0f}초 후 재시도 ({len(ids)}행): {e}")
+            return
+        failed = self._journal.record_failure(ids, e, MAX_ATTEMPTS)
+        if failed:
+            print(f"🛑 [submission_queue] '{tab}' {failed}행 반영 실패 처리 ({MAX_ATTEMPTS}회 실패, 재전송 중단): {e}")
+        else:
+            print(f"❌ [submission_queue] '{tab}' 기록 실패({failures}회), {delay:.0f}초 후 재시도 ({len(ids)}행): {e}")
+
+    def _run(self):
+        while True:
+            time.sleep(self._flush_interval)
+            self.flush()
+
+    def stats(self):
+        return {
+            "submitted": self.submitted_count,
+            "flushed_rows": self.flushed_rows,
+            "api_calls": self.api_calls,
+            "pending_rows": self._journal.pending_count(),
+            "failed_rows": self._journal.failed_count(),
+            "quota": self._governor.stats(),
+        }
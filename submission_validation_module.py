@@ -0,0 +1,164 @@
+import datetime
+import re
+
+# 실적 인정 기간
+PERIOD_START = datetime.date(2025, 4, 1)
+PERIOD_END = datetime.date(2026, 2, 28)
+
+# --- [시트 열 위치] app.py가 append_rows로 쓰는 순서와 동일 ---
+COL_RESULT = 5  # 연구성과유무 (O/X)
+
+PAPER_COLUMNS = {
+    "type_code": 6, "journal": 7, "title": 8, "issn": 9, "doi": 10, "contrib": 11, "first_author": 12,
+    "volume": 14, "sci": 15, "page_start": 16, "page_end": 17, "date": 19,
+}
+PAPER_REQUIRED = [("type_code", "논문구분"), ("sci", "SCI구분"), ("journal", "학술지명"), ("title", "논문명"),
+                  ("issn", "ISSN"), ("doi", "DOI"), ("first_author", "주저자명"), ("volume", "볼륨번호"),
+                  ("page_start", "시작페이지")]
+
+OTHER_COLUMNS = {"role": 7, "authors": 8, "author_count": 9, "title": 10, "journal": 11, "date": 13}
+OTHER_REQUIRED = [("role", "참여역할"), ("title", "제목"), ("journal", "출판사/학술대회명"), ("authors", "명단")]
+
+DOI_PATTERN = re.compile(r"^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)?10\.\d{4,9}/\S+$", re.IGNORECASE)
+
+
+# --- [개별 값 검사] ---
+def issn_is_valid(value):
+    """ISSN 형식(NNNN-NNNC)과 검사자리(mod 11)를 확인합니다."""
+    digits = re.sub(r"[\s-]", "", str(value)).upper()
+    if not re.fullmatch(r"\d{7}[\dX]", digits):
+        return False
+    total = sum(int(d) * w for d, w in zip(digits[:7], range(8, 1, -1)))
+    check = (11 - total % 11) % 11
+    return digits[7] == ("X" if check == 10 else str(check))
+
+
+def doi_is_valid(value):
+    return bool(DOI_PATTERN.match(str(value).strip()))
+
+
+def parse_date(value):
+    """'YYYYMMDD' / 'YYYY-MM-DD' / 'YYYY.MM.DD' 형식을 date로 바꿉니다. 실패하면 None."""
+    digits = re.sub(r"\D", "", str(value))
+    if len(digits) != 8:
+        return None
+    try:
+        return datetime.date(int(digits[:4]), int(digits[4:6]), int(digits[6:]))
+    except ValueError:
+        return None
+
+
+def _to_number(value):
+    try:
+        return float(str(value).strip())
+    except ValueError:
+        return None
+
+
+# --- [열 단위 일괄 검사] ---
+def _column(rows, index):
+    return [row[index] if index < len(row) else "" for row in rows]
+
+
+def _check_required(rows, columns, required, add):
+    for field, label in required:
+        for r, value in enumerate(_column(rows, columns[field])):
+            if str(value).strip() == "":
+                add(r, f"{label} 누락")
+
+
+def _check_dates(rows, index, add):
+    for r, value in enumerate(_column(rows, index)):
+        if str(value).strip() == "":
+            continue
+        date = parse_date(value)
+        if date is None:
+            add(r, f"날짜 형식 오류({value})")
+        elif not PERIOD_START <= date <= PERIOD_END:
+            add(r, f"실적 인정 기간({PERIOD_START:%Y.%m.%d}~{PERIOD_END:%Y.%m.%d}) 밖의 날짜({date:%Y-%m-%d})")
+
+
+def validate_paper_rows(rows):
+    """
+    논문 탭 행들을 열 단위로 한 번에 검사합니다. (성과유무 'X' 행은 건너뜀)
+
+    Args:
+        rows (list): 헤더를 제외한 논문 탭 행 목록
+
+    Returns:
+        dict: {행 인덱스(0부터): [오류 메시지, ...]}
+    """
+    targets = [r for r, value in enumerate(_column(rows, COL_RESULT)) if str(value).strip() != "X"]
+    subset = [rows[r] for r in targets]
+    errors = {}
+
+    def add(r, message):
+        errors.setdefault(targets[r], []).append(message)
+
+    cols = PAPER_COLUMNS
+    _check_required(subset, cols, PAPER_REQUIRED, add)
+
+    for r, value in enumerate(_column(subset, cols["issn"])):
+        if str(value).strip() and not issn_is_valid(value):
+            add(r, f"ISSN 오류({value})")
+
+    for r, value in enumerate(_column(subset, cols["doi"])):
+        if str(value).strip() and not doi_is_valid(value):
+            add(r, f"DOI 형식 오류({value})")
+
+    starts = _column(subset, cols["page_start"])
+    ends = _column(subset, cols["page_end"])
+    # e0123456, S12 같은 논문 번호도 허용 -> 둘 다 숫자일 때만 크기 비교
+    for r, (start, end) in enumerate(zip(starts, ends)):
+        start_num, end_num = _to_number(start), _to_number(end)
+        if start_num is not None and end_num is not None and start_num > end_num:
+            add(r, f"시작페이지({start})가 끝페이지({end})보다 큽니다")
+
+    for r, value in enumerate(_column(subset, cols["contrib"])):
+        if str(value).strip() == "":
+            continue
+        number = _to_number(value)
+        if number is None or not 0 <= number <= 100:
+            add(r, f"기여율은 0~100 사이여야 합니다({value})")
+
+    _check_dates(subset, cols["date"], add)
+    return errors
+
+
+def validate_other_rows(rows):
+    """저서/학술대회 탭 행들을 열 단위로 한 번에 검사합니다. 반환 형식은 validate_paper_rows와 같습니다."""
+    errors = {}
+
+    def add(r, message):
+        errors.setdefault(r, []).append(message)
+
+    cols = OTHER_COLUMNS
+    _check_required(rows, cols, OTHER_REQUIRED, add)
+
+    for r, value in enumerate(_column(rows, cols["author_count"])):
+        number = _to_number(value)
+        if str(value).strip() and (number is None or number < 1):
+            add(r, f"전체 인원 수는 1 이상이어야 합니다({value})")
+
+    _check_dates(rows, cols["date"], add)
+    return errors
+
+
+def validate_tabs(rows_by_tab):
+    """
+    세 탭의 행을 한 번에 검사합니다.
+
+    Args:
+        rows_by_tab (dict): {"논문": [row, ...], "저서": [...], "학술대회": [...]}
+
+    Returns:
+        dict: {탭 이름: {행 인덱스: [오류 메시지, ...]}} (오류가 없는 탭은 빠짐)
+    """
+    results = {}
+    for tab, rows in rows_by_tab.items():
+        if not rows:
+            continue
+        errors = validate_paper_rows(rows) if tab == "논문" else validate_other_rows(rows)
+        if errors:
+            results[tab] = errors
+    return results